@@ -3,19 +3,53 @@ API Client for C# Code Reviewer
 
 This module provides a unified client for interacting with OpenAI (GPT) and Anthropic (Claude) APIs.
 It supports streaming responses, error handling, and retry logic.
+Async variants (analyze_code_async) allow many requests to be multiplexed on one event loop.
+An optional LLMCache short-circuits repeated deterministic (temperature=0) prompts.
+A separate system prompt is sent as a stable, provider-cacheable prefix.
 """
 
 import os
 import time
-from typing import Generator, Optional, Dict, Any, Literal
+import random
+import json
+import hashlib
+import asyncio
+import functools
+from types import MappingProxyType
+from typing import AsyncGenerator, Generator, Optional, Dict, Any, Literal, Mapping, NamedTuple, Tuple
 import logging
 from dotenv import load_dotenv
 
+from app.core.llm_cache import LLMCache, SemanticCache
+
+# Provider SDKs are optional ("choose one or both"); import once at module load
+try:
+    import openai
+    from openai import OpenAI as _OpenAI, AsyncOpenAI as _AsyncOpenAI
+except ImportError:
+    openai = None
+    _OpenAI = _AsyncOpenAI = None
+
+try:
+    import anthropic
+    from anthropic import Anthropic as _Anthropic, AsyncAnthropic as _AsyncAnthropic
+except ImportError:
+    anthropic = None
+    _Anthropic = _AsyncAnthropic = None
+
+# tiktoken is optional; used to reject oversized prompts before sending them
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Review prompts end with the code under review in this fence (see PromptBuilder)
+_CODE_FENCE = '```csharp\n'
+
 # Load environment variables (override system env vars)
 load_dotenv(override=True)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application (see app/main.py)
 logger = logging.getLogger(__name__)
 
 
@@ -44,6 +78,136 @@ class PromptTooLongError(APIClientError):
     pass
 
 
+class ModelSpec(NamedTuple):
+    """Static limits of a model"""
+    max_tokens: int
+    context_window: int
+
+
+# Model configurations
+_RAW_MODELS = {
+    'openai': {
+        # GPT-5 Series (Latest)
+        'gpt-5.1': {'max_tokens': 16384, 'context_window': 128000},
+        'gpt-5': {'max_tokens': 16384, 'context_window': 128000},
+        'gpt-5-mini': {'max_tokens': 16384, 'context_window': 128000},
+        'gpt-5-nano': {'max_tokens': 16384, 'context_window': 128000},
+        'gpt-5.1-chat-latest': {'max_tokens': 16384, 'context_window': 128000},
+        'gpt-5-chat-latest': {'max_tokens': 16384, 'context_window': 128000},
+        'gpt-5.1-codex': {'max_tokens': 16384, 'context_window': 128000},
+        'gpt-5-codex': {'max_tokens': 16384, 'context_window': 128000},
+        'gpt-5-pro': {'max_tokens': 16384, 'context_window': 128000},
+        # GPT-4.1 Series
+        'gpt-4.1': {'max_tokens': 16384, 'context_window': 128000},
+        'gpt-4.1-mini': {'max_tokens': 16384, 'context_window': 128000},
+        'gpt-4.1-nano': {'max_tokens': 16384, 'context_window': 128000},
+        # GPT-4 Series
+        'gpt-4': {'max_tokens': 8192, 'context_window': 8192},
+        'gpt-4-turbo': {'max_tokens': 4096, 'context_window': 128000},
+        'gpt-4o': {'max_tokens': 4096, 'context_window': 128000},
+        'gpt-4o-2024-05-13': {'max_tokens': 4096, 'context_window': 128000},
+        'gpt-4o-mini': {'max_tokens': 16384, 'context_window': 128000},
+        # GPT-3.5 Series
+        'gpt-3.5-turbo': {'max_tokens': 4096, 'context_window': 16385},
+        # Realtime API
+        'gpt-realtime': {'max_tokens': 4096, 'context_window': 128000},
+    },
+    'anthropic': {
+        'claude-3-5-sonnet-20241022': {'max_tokens': 8192, 'context_window': 200000},
+        'claude-3-5-haiku-20241022': {'max_tokens': 8192, 'context_window': 200000},
+        'claude-3-opus-20240229': {'max_tokens': 4096, 'context_window': 200000},
+        'claude-3-sonnet-20240229': {'max_tokens': 4096, 'context_window': 200000},
+        'claude-3-haiku-20240307': {'max_tokens': 4096, 'context_window': 200000},
+    }
+}
+
+# Frozen view of _RAW_MODELS: provider -> model name -> ModelSpec
+MODELS: Mapping[str, Mapping[str, ModelSpec]] = MappingProxyType({
+    provider: MappingProxyType({name: ModelSpec(**cfg) for name, cfg in models.items()})
+    for provider, models in _RAW_MODELS.items()
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_model(provider: str, model_name: str) -> ModelSpec:
+    """
+    Look up the spec of a model (memoized; failed lookups raise and are not cached).
+
+    Raises:
+        ModelNotFoundError: If the provider or model is unknown
+    """
+    try:
+        return MODELS[provider][model_name]
+    except KeyError:
+        raise ModelNotFoundError(f"Model '{model_name}' not found for provider '{provider}'")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoder(model_name: str):
+    """
+    Return a tiktoken encoder for the model (memoized per model).
+
+    Models tiktoken doesn't know (e.g. Claude) use cl100k_base as an approximation.
+    Returns None when tiktoken is missing or its BPE files cannot be loaded (offline).
+    """
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning("Token encoder unavailable, using length heuristic: %s", e)
+        return None
+
+
+# Transient errors worth retrying: rate limits, dropped connections and timeouts.
+# Anything else (bad request, auth, missing key, prompt too long) fails immediately.
+_retryable = [APIConnectionError]
+if openai is not None:
+    _retryable += [openai.RateLimitError, openai.APIConnectionError]
+if anthropic is not None:
+    _retryable += [anthropic.RateLimitError, anthropic.APIConnectionError]
+try:
+    import httpx
+    _retryable.append(httpx.TimeoutException)
+except ImportError:
+    pass
+RETRYABLE_ERRORS = tuple(_retryable)
+
+# Upper bound (seconds) for a single backoff sleep
+RETRY_BACKOFF_CAP = 30
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Return True for rate limits, connection problems and 5xx server errors."""
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    return isinstance(status_code, int) and (status_code == 429 or status_code >= 500)
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """
+    Seconds to wait before the next attempt.
+
+    Honors the server's Retry-After header when present, otherwise uses
+    full-jitter exponential backoff so parallel workers don't retry in lockstep.
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers is not None:
+        try:
+            retry_after = headers.get('retry-after')
+            if retry_after is not None:
+                return min(RETRY_BACKOFF_CAP, max(0.0, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+
+    return random.uniform(0, min(RETRY_BACKOFF_CAP, 2 ** attempt))
+
+
 class APIClient:
     """
     Unified client for interacting with OpenAI and Anthropic APIs.
@@ -54,44 +218,12 @@ class APIClient:
         timeout (int): Request timeout in seconds
         temperature (float): LLM temperature parameter
         max_tokens (int): Maximum tokens to generate
+        cache (LLMCache): Optional response cache (used only when temperature == 0)
+        semantic_cache (SemanticCache): Optional similarity cache consulted after an exact miss
     """
 
-    # Model configurations
-    MODELS = {
-        'openai': {
-            # GPT-5 Series (Latest)
-            'gpt-5.1': {'max_tokens': 16384, 'context_window': 128000},
-            'gpt-5': {'max_tokens': 16384, 'context_window': 128000},
-            'gpt-5-mini': {'max_tokens': 16384, 'context_window': 128000},
-            'gpt-5-nano': {'max_tokens': 16384, 'context_window': 128000},
-            'gpt-5.1-chat-latest': {'max_tokens': 16384, 'context_window': 128000},
-            'gpt-5-chat-latest': {'max_tokens': 16384, 'context_window': 128000},
-            'gpt-5.1-codex': {'max_tokens': 16384, 'context_window': 128000},
-            'gpt-5-codex': {'max_tokens': 16384, 'context_window': 128000},
-            'gpt-5-pro': {'max_tokens': 16384, 'context_window': 128000},
-            # GPT-4.1 Series
-            'gpt-4.1': {'max_tokens': 16384, 'context_window': 128000},
-            'gpt-4.1-mini': {'max_tokens': 16384, 'context_window': 128000},
-            'gpt-4.1-nano': {'max_tokens': 16384, 'context_window': 128000},
-            # GPT-4 Series
-            'gpt-4': {'max_tokens': 8192, 'context_window': 8192},
-            'gpt-4-turbo': {'max_tokens': 4096, 'context_window': 128000},
-            'gpt-4o': {'max_tokens': 4096, 'context_window': 128000},
-            'gpt-4o-2024-05-13': {'max_tokens': 4096, 'context_window': 128000},
-            'gpt-4o-mini': {'max_tokens': 16384, 'context_window': 128000},
-            # GPT-3.5 Series
-            'gpt-3.5-turbo': {'max_tokens': 4096, 'context_window': 16385},
-            # Realtime API
-            'gpt-realtime': {'max_tokens': 4096, 'context_window': 128000},
-        },
-        'anthropic': {
-            'claude-3-5-sonnet-20241022': {'max_tokens': 8192, 'context_window': 200000},
-            'claude-3-5-haiku-20241022': {'max_tokens': 8192, 'context_window': 200000},
-            'claude-3-opus-20240229': {'max_tokens': 4096, 'context_window': 200000},
-            'claude-3-sonnet-20240229': {'max_tokens': 4096, 'context_window': 200000},
-            'claude-3-haiku-20240307': {'max_tokens': 4096, 'context_window': 200000},
-        }
-    }
+    # Model configurations (read-only, shared across instances)
+    MODELS = MODELS
 
     def __init__(
         self,
@@ -99,7 +231,9 @@ class APIClient:
         model_name: Optional[str] = None,
         timeout: int = 60,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        cache: Optional[LLMCache | Literal['exact', 'semantic']] = None,
+        cache_ttl: Optional[int] = None
     ):
         """
         Initialize API client.
@@ -110,10 +244,22 @@ class APIClient:
             timeout: Request timeout in seconds (default: 60)
             temperature: LLM temperature (default: 0.7)
             max_tokens: Maximum tokens to generate (default: model-specific)
+            cache: Optional response cache; only consulted when temperature == 0.
+                'exact' creates a default LLMCache, 'semantic' additionally enables
+                a SemanticCache (requires sentence-transformers and faiss)
+            cache_ttl: Cache entry lifetime in seconds (default: no expiry)
         """
         self.provider = provider
         self.timeout = timeout
         self.temperature = temperature
+        self.cache_ttl = cache_ttl
+        self.semantic_cache: Optional[SemanticCache] = None
+        if cache in ('exact', 'semantic'):
+            self.cache = LLMCache()
+            if cache == 'semantic':
+                self.semantic_cache = SemanticCache()
+        else:
+            self.cache = cache
 
         # Set default model names
         if model_name is None:
@@ -125,41 +271,70 @@ class APIClient:
         self.model_name = model_name
 
         # Get model config
-        if provider not in self.MODELS or model_name not in self.MODELS[provider]:
-            raise ModelNotFoundError(f"Model '{model_name}' not found for provider '{provider}'")
-
-        model_config = self.MODELS[provider][model_name]
-        self.context_window = model_config['context_window']
-        self.max_tokens = max_tokens or model_config['max_tokens']
+        self._spec = _resolve_model(provider, model_name)
+        self.context_window = self._spec.context_window
+        self.max_tokens = max_tokens or self._spec.max_tokens
+
+        # Per-model request parameters, resolved once instead of on every call.
+        # GPT-5 and GPT-4.1 series use max_completion_tokens and no temperature parameter.
+        if provider == 'openai' and model_name.startswith(('gpt-5', 'gpt-4.1')):
+            self._req_kwargs = {'max_completion_tokens': self.max_tokens}
+        else:
+            self._req_kwargs = {'max_tokens': self.max_tokens, 'temperature': self.temperature}
+
+        # Bind the provider-specific request paths once so no call branches on provider
+        if provider == 'openai':
+            self._stream_impl = self._stream_openai
+            self._get_impl = self._get_openai
+            self._astream_impl = self._astream_openai
+        else:
+            self._stream_impl = self._stream_anthropic
+            self._get_impl = self._get_anthropic
+            self._astream_impl = self._astream_anthropic
 
         # Initialize API clients
         self._init_clients()
 
-        logger.info(f"Initialized APIClient with provider: {provider}, model: {model_name}")
+        logger.info("Initialized APIClient with provider: %s, model: %s", provider, model_name)
 
     def _init_clients(self):
         """Initialize API clients based on provider"""
         if self.provider == 'openai':
-            try:
-                from openai import OpenAI
-                api_key = os.getenv('OPENAI_API_KEY')
-                if not api_key:
-                    raise APIKeyMissingError("OPENAI_API_KEY not found in environment variables")
-                self.client = OpenAI(api_key=api_key, timeout=self.timeout)
-                logger.info("OpenAI client initialized")
-            except ImportError:
+            if _OpenAI is None:
                 raise APIClientError("openai package not installed. Run: pip install openai")
+            api_key = os.getenv('OPENAI_API_KEY')
+            if not api_key:
+                raise APIKeyMissingError("OPENAI_API_KEY not found in environment variables")
+            self.client = _OpenAI(api_key=api_key, timeout=self.timeout)
+            logger.info("OpenAI client initialized")
 
         elif self.provider == 'anthropic':
-            try:
-                from anthropic import Anthropic
-                api_key = os.getenv('ANTHROPIC_API_KEY')
-                if not api_key:
-                    raise APIKeyMissingError("ANTHROPIC_API_KEY not found in environment variables")
-                self.client = Anthropic(api_key=api_key, timeout=self.timeout)
-                logger.info("Anthropic client initialized")
-            except ImportError:
+            if _Anthropic is None:
                 raise APIClientError("anthropic package not installed. Run: pip install anthropic")
+            api_key = os.getenv('ANTHROPIC_API_KEY')
+            if not api_key:
+                raise APIKeyMissingError("ANTHROPIC_API_KEY not found in environment variables")
+            self.client = _Anthropic(api_key=api_key, timeout=self.timeout)
+            logger.info("Anthropic client initialized")
+
+    def _init_async_clients(self):
+        """
+        Initialize async API clients bound to the current event loop.
+
+        The underlying httpx connection pool belongs to the loop that created it,
+        so the async client is recreated whenever a different loop is running.
+        """
+        loop = asyncio.get_running_loop()
+        if getattr(self, 'aclient', None) is not None and self._aclient_loop is loop:
+            return
+
+        if self.provider == 'openai':
+            self.aclient = _AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'), timeout=self.timeout)
+        elif self.provider == 'anthropic':
+            self.aclient = _AsyncAnthropic(api_key=os.getenv('ANTHROPIC_API_KEY'), timeout=self.timeout)
+
+        self._aclient_loop = loop
+        logger.info("Async %s client initialized", self.provider)
 
     def test_connection(self) -> bool:
         """
@@ -176,7 +351,7 @@ class APIClient:
             if self.provider == 'openai':
                 # Test with models list
                 models = self.client.models.list()
-                logger.info(f"Connection successful. Available models: {len(models.data)}")
+                logger.info("Connection successful. Available models: %d", len(models.data))
 
             elif self.provider == 'anthropic':
                 # Test with a minimal message (Anthropic doesn't have a list endpoint)
@@ -185,19 +360,20 @@ class APIClient:
                     max_tokens=10,
                     messages=[{"role": "user", "content": "Hi"}]
                 )
-                logger.info(f"Connection successful. Test response: {response.content[0].text}")
+                logger.info("Connection successful. Test response: %s", response.content[0].text)
 
             return True
 
         except Exception as e:
-            logger.error(f"Connection test failed: {e}")
+            logger.error("Connection test failed: %s", e)
             raise APIConnectionError(f"Failed to connect to {self.provider} API: {e}")
 
     def analyze_code(
         self,
         prompt: str,
         stream: bool = True,
-        max_retries: int = 3
+        max_retries: int = 3,
+        system_prompt: Optional[str] = None
     ) -> Generator[str, None, None] | str:
         """
         Analyze code using LLM.
@@ -206,6 +382,8 @@ class APIClient:
             prompt: The prompt to send to LLM
             stream: Whether to stream the response (default: True)
             max_retries: Maximum number of retry attempts (default: 3)
+            system_prompt: Static instructions sent ahead of the prompt so the
+                provider can reuse its prompt-prefix cache (default: None)
 
         Returns:
             Generator yielding response tokens if stream=True, otherwise complete response string
@@ -214,140 +392,447 @@ class APIClient:
             APIConnectionError: If connection fails after retries
             PromptTooLongError: If prompt exceeds context window
         """
+        cache_key, semantic_key, vector, cached = self._cache_lookup(prompt, system_prompt)
+        if cached is not None:
+            return iter([cached]) if stream else cached
+
+        # Fail locally instead of paying a round trip (and retries) for a certain 400
+        self._check_prompt_length(prompt, system_prompt)
+
         for attempt in range(max_retries):
             try:
                 if stream:
-                    return self._stream_response(prompt)
+                    response = self._stream_response(prompt, system_prompt)
+                    if cache_key is not None:
+                        return self._cache_stream(cache_key, semantic_key, vector, response)
+                    return response
                 else:
-                    return self._get_response(prompt)
+                    response = self._get_response(prompt, system_prompt)
+                    if cache_key is not None:
+                        self._store_cached(cache_key, semantic_key, vector, response)
+                    return response
 
             except Exception as e:
-                logger.warning(f"Attempt {attempt + 1}/{max_retries} failed: {e}")
+                if not _is_retryable(e):
+                    logger.error("Non-retryable error: %s", e)
+                    raise
+
+                logger.warning("Attempt %d/%d failed: %s", attempt + 1, max_retries, e)
 
                 if attempt < max_retries - 1:
-                    # Exponential backoff: 1s, 2s, 4s
-                    wait_time = 2 ** attempt
-                    logger.info(f"Retrying in {wait_time} seconds...")
+                    wait_time = _retry_delay(e, attempt)
+                    logger.info("Retrying in %.1f seconds...", wait_time)
                     time.sleep(wait_time)
                 else:
-                    logger.error(f"All {max_retries} attempts failed")
+                    logger.error("All %d attempts failed", max_retries)
                     raise APIConnectionError(f"Failed to get LLM response after {max_retries} attempts: {e}")
 
-    def _stream_response(self, prompt: str) -> Generator[str, None, None]:
+    def _count_tokens(self, text: str) -> int:
+        """
+        Count tokens in text.
+
+        Falls back to len(text) // 4 when no tokenizer is available; that
+        under-counts, so the guard never rejects a prompt the API would accept.
+        """
+        encoder = _get_encoder(self.model_name)
+        if encoder is None:
+            return len(text) // 4
+        return len(encoder.encode(text, disallowed_special=()))
+
+    def _check_prompt_length(self, prompt: str, system_prompt: Optional[str] = None):
+        """
+        Reject prompts that cannot fit the context window together with the output budget.
+
+        Raises:
+            PromptTooLongError: If prompt tokens + max_tokens exceed the context window
+        """
+        prompt_tokens = self._count_tokens(prompt)
+        if system_prompt:
+            prompt_tokens += self._count_tokens(system_prompt)
+
+        if prompt_tokens + self.max_tokens > self.context_window:
+            raise PromptTooLongError(
+                f"Prompt is {prompt_tokens} tokens; with {self.max_tokens} reserved for output "
+                f"it exceeds the {self.context_window}-token context window of {self.model_name}"
+            )
+
+    def _cache_key(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """
+        Build a cache key from everything that determines the response.
+
+        Args:
+            prompt: The prompt to send
+            system_prompt: Optional system prompt sent with it
+
+        Returns:
+            SHA256 hex digest of the request parameters
+        """
+        payload = json.dumps(
+            {
+                'model': self.model_name,
+                'prompt': prompt,
+                'system_prompt': system_prompt,
+                'temperature': self.temperature,
+                'max_tokens': self.max_tokens,
+            },
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _cache_lookup(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[Tuple[str, str]], Any, Optional[str]]:
+        """
+        Look a prompt up in the exact cache and, on a miss, the semantic cache.
+
+        Sampled (temperature > 0) responses are not reproducible, so they are never cached.
+
+        Args:
+            prompt: The prompt to send
+            system_prompt: Optional system prompt sent with it
+
+        Returns:
+            (cache_key, semantic_key, vector, cached_response): cache_key is None when
+            caching is off; pass the first three to _store_cached after a miss
+        """
+        if self.cache is None or self.temperature != 0.0:
+            return None, None, None, None
+
+        cache_key = self._cache_key(prompt, system_prompt)
+        semantic_key = None
+        vector = None
+        cached = self.cache.get(cache_key)
+
+        if cached is None and self.semantic_cache is not None:
+            semantic_key = self._semantic_key(prompt, system_prompt)
+            scope, text = semantic_key
+            cached, vector = self.semantic_cache.search(text, scope=scope)
+            if cached is not None:
+                logger.info("Semantic cache hit for prompt")
+
+        if cached is not None:
+            logger.info("Cache hit for prompt")
+        return cache_key, semantic_key, vector, cached
+
+    def _semantic_key(self, prompt: str, system_prompt: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Split a prompt into a semantic-cache scope and the text to embed.
+
+        The embedding model only sees the first ~256 tokens, and review prompts
+        start with several thousand characters of fixed instructions, so only the
+        code under review is embedded. Everything else that shapes the response
+        (model, system prompt, instructions/categories) goes into the scope, and
+        entries are only compared within the same scope.
+
+        Args:
+            prompt: The prompt to send
+            system_prompt: Optional system prompt sent with it
+
+        Returns:
+            (scope, text): SHA256 hex digest of the fixed request parts, and the code to embed
+        """
+        fence = prompt.rfind(_CODE_FENCE)
+        if fence == -1:
+            template, text = "", prompt
+        else:
+            template, text = prompt[:fence], prompt[fence + len(_CODE_FENCE):]
+
+        payload = json.dumps(
+            {
+                'model': self.model_name,
+                'template': template,
+                'system_prompt': system_prompt,
+                'temperature': self.temperature,
+                'max_tokens': self.max_tokens,
+            },
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest(), text
+
+    def _store_cached(
+        self,
+        cache_key: str,
+        semantic_key: Optional[Tuple[str, str]],
+        vector: Any,
+        response: str
+    ):
+        """
+        Store a completed response in the exact cache and, if enabled, the semantic cache.
+
+        Args:
+            cache_key: Exact-match key from _cache_key
+            semantic_key: (scope, text) from _semantic_key (None if the semantic cache is off)
+            vector: Embedding from the semantic lookup (None to recompute)
+            response: Complete LLM response
+        """
+        self.cache.set(cache_key, response, model=self.model_name, ttl=self.cache_ttl)
+        if self.semantic_cache is not None and semantic_key is not None:
+            scope, text = semantic_key
+            self.semantic_cache.add(text, response, vector, scope=scope)
+
+    def _cache_stream(
+        self,
+        cache_key: str,
+        semantic_key: Optional[Tuple[str, str]],
+        vector: Any,
+        response: Generator[str, None, None]
+    ) -> Generator[str, None, None]:
+        """
+        Pass streamed tokens through and store the full response once the stream completes.
+
+        Args:
+            cache_key: Key to store the response under
+            semantic_key: (scope, text) from _semantic_key (None if the semantic cache is off)
+            vector: Embedding from the semantic lookup (None to recompute)
+            response: Token generator from _stream_response
+
+        Yields:
+            Response tokens as they arrive
+        """
+        chunks = []
+        for token in response:
+            chunks.append(token)
+            yield token
+
+        # Only reached when the stream finished without error
+        self._store_cached(cache_key, semantic_key, vector, ''.join(chunks))
+
+    def _openai_messages(self, prompt: str, system_prompt: Optional[str]) -> list:
+        """
+        Build OpenAI chat messages with the static system prompt first.
+
+        OpenAI caches the longest previously seen prefix automatically, so the
+        fixed instructions must come before the per-file content.
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def _anthropic_system(self, system_prompt: Optional[str]) -> Dict[str, Any]:
+        """
+        Build the Anthropic `system` argument with an ephemeral cache breakpoint.
+
+        Returns:
+            Keyword arguments to splat into messages.create/stream (empty if no system prompt)
+        """
+        if not system_prompt:
+            return {}
+        return {
+            'system': [{
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }]
+        }
+
+    # Provider-specific request implementations, bound once in __init__
+
+    def _stream_openai(self, prompt: str, system_prompt: Optional[str]) -> Generator[str, None, None]:
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=self._openai_messages(prompt, system_prompt),
+            stream=True,
+            **self._req_kwargs
+        )
+        for chunk in response:
+            if chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def _stream_anthropic(self, prompt: str, system_prompt: Optional[str]) -> Generator[str, None, None]:
+        with self.client.messages.stream(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            **self._req_kwargs,
+            **self._anthropic_system(system_prompt)
+        ) as stream:
+            yield from stream.text_stream
+
+    def _get_openai(self, prompt: str, system_prompt: Optional[str]) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=self._openai_messages(prompt, system_prompt),
+            stream=False,
+            **self._req_kwargs
+        )
+        return response.choices[0].message.content
+
+    def _get_anthropic(self, prompt: str, system_prompt: Optional[str]) -> str:
+        response = self.client.messages.create(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            **self._req_kwargs,
+            **self._anthropic_system(system_prompt)
+        )
+        return response.content[0].text
+
+    async def _astream_openai(self, prompt: str, system_prompt: Optional[str]) -> AsyncGenerator[str, None]:
+        response = await self.aclient.chat.completions.create(
+            model=self.model_name,
+            messages=self._openai_messages(prompt, system_prompt),
+            stream=True,
+            **self._req_kwargs
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _astream_anthropic(self, prompt: str, system_prompt: Optional[str]) -> AsyncGenerator[str, None]:
+        async with self.aclient.messages.stream(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            **self._req_kwargs,
+            **self._anthropic_system(system_prompt)
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+    def _stream_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None
+    ) -> Generator[str, None, None]:
         """
         Stream response from LLM.
 
         Args:
             prompt: The prompt to send
+            system_prompt: Optional static system prompt
 
         Yields:
             str: Response tokens
         """
         try:
-            logger.info(f"Sending streaming request to {self.provider}/{self.model_name}")
-            start_time = time.time()
+            logger.info("Sending streaming request to %s/%s", self.provider, self.model_name)
+            start_time = time.perf_counter()
 
-            if self.provider == 'openai':
-                # GPT-5 and GPT-4.1 series use different parameters
-                if self.model_name.startswith(('gpt-5', 'gpt-4.1')):
-                    # GPT-5 series: use max_completion_tokens, no temperature parameter
-                    response = self.client.chat.completions.create(
-                        model=self.model_name,
-                        messages=[{"role": "user", "content": prompt}],
-                        max_completion_tokens=self.max_tokens,
-                        stream=True
-                    )
-                else:
-                    # GPT-4 and older: use max_tokens and temperature
-                    response = self.client.chat.completions.create(
-                        model=self.model_name,
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=self.temperature,
-                        max_tokens=self.max_tokens,
-                        stream=True
-                    )
-
-                for chunk in response:
-                    if chunk.choices[0].delta.content:
-                        yield chunk.choices[0].delta.content
+            yield from self._stream_impl(prompt, system_prompt)
 
-            elif self.provider == 'anthropic':
-                with self.client.messages.stream(
-                    model=self.model_name,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    messages=[{"role": "user", "content": prompt}]
-                ) as stream:
-                    for text in stream.text_stream:
-                        yield text
-
-            elapsed = time.time() - start_time
-            logger.info(f"Streaming response completed in {elapsed:.2f} seconds")
+            elapsed = time.perf_counter() - start_time
+            logger.info("Streaming response completed in %.2f seconds", elapsed)
 
         except Exception as e:
-            logger.error(f"Streaming failed: {e}")
+            logger.error("Streaming failed: %s", e)
             raise
 
-    def _get_response(self, prompt: str) -> str:
+    def _get_response(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """
         Get complete response from LLM (non-streaming).
 
         Args:
             prompt: The prompt to send
+            system_prompt: Optional static system prompt
 
         Returns:
             str: Complete response text
         """
         try:
-            logger.info(f"Sending non-streaming request to {self.provider}/{self.model_name}")
-            start_time = time.time()
-
-            if self.provider == 'openai':
-                # GPT-5 and GPT-4.1 series use different parameters
-                if self.model_name.startswith(('gpt-5', 'gpt-4.1')):
-                    # GPT-5 series: use max_completion_tokens, no temperature parameter
-                    response = self.client.chat.completions.create(
-                        model=self.model_name,
-                        messages=[{"role": "user", "content": prompt}],
-                        max_completion_tokens=self.max_tokens,
-                        stream=False
-                    )
-                else:
-                    # GPT-4 and older: use max_tokens and temperature
-                    response = self.client.chat.completions.create(
-                        model=self.model_name,
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=self.temperature,
-                        max_tokens=self.max_tokens,
-                        stream=False
-                    )
-                response_text = response.choices[0].message.content
+            logger.info("Sending non-streaming request to %s/%s", self.provider, self.model_name)
+            start_time = time.perf_counter()
 
-            elif self.provider == 'anthropic':
-                response = self.client.messages.create(
-                    model=self.model_name,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                response_text = response.content[0].text
+            response_text = self._get_impl(prompt, system_prompt)
 
-            elapsed = time.time() - start_time
-            logger.info(f"Response received in {elapsed:.2f} seconds ({len(response_text)} chars)")
+            elapsed = time.perf_counter() - start_time
+            logger.info("Response received in %.2f seconds (%d chars)", elapsed, len(response_text))
 
             return response_text
 
         except Exception as e:
-            logger.error(f"Request failed: {e}")
+            logger.error("Request failed: %s", e)
             raise
 
-    def get_model_info(self) -> Dict[str, Any]:
+    async def analyze_code_async(
+        self,
+        prompt: str,
+        max_retries: int = 3,
+        system_prompt: Optional[str] = None
+    ) -> str:
         """
-        Get information about the currently configured model.
+        Analyze code using LLM without blocking a thread (for asyncio.gather fan-out).
+
+        Args:
+            prompt: The prompt to send to LLM
+            max_retries: Maximum number of retry attempts (default: 3)
+            system_prompt: Static instructions sent as a cacheable prefix (default: None)
 
         Returns:
-            Dict containing model information
+            str: Complete response text
+
+        Raises:
+            APIConnectionError: If connection fails after retries
+            PromptTooLongError: If prompt exceeds context window
+        """
+        # SQLite and embedding calls block, so keep them off the event loop
+        cache_key, semantic_key, vector, cached = await asyncio.to_thread(
+            self._cache_lookup, prompt, system_prompt
+        )
+        if cached is not None:
+            return cached
+
+        self._check_prompt_length(prompt, system_prompt)
+        self._init_async_clients()
+
+        for attempt in range(max_retries):
+            try:
+                chunks = []
+                async for token in self._stream_response_async(prompt, system_prompt):
+                    chunks.append(token)
+                response = "".join(chunks)
+
+                if cache_key is not None:
+                    await asyncio.to_thread(self._store_cached, cache_key, semantic_key, vector, response)
+                return response
+
+            except Exception as e:
+                if not _is_retryable(e):
+                    logger.error("Non-retryable error: %s", e)
+                    raise
+
+                logger.warning("Attempt %d/%d failed: %s", attempt + 1, max_retries, e)
+
+                if attempt < max_retries - 1:
+                    wait_time = _retry_delay(e, attempt)
+                    logger.info("Retrying in %.1f seconds...", wait_time)
+                    await asyncio.sleep(wait_time)
+                else:
+                    logger.error("All %d attempts failed", max_retries)
+                    raise APIConnectionError(f"Failed to get LLM response after {max_retries} attempts: {e}")
+
+    async def _stream_response_async(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
         """
+        Stream response from LLM using the async client.
+
+        Args:
+            prompt: The prompt to send
+            system_prompt: Optional static system prompt
+
+        Yields:
+            str: Response tokens
+        """
+        try:
+            logger.info("Sending async streaming request to %s/%s", self.provider, self.model_name)
+            start_time = time.perf_counter()
+
+            async for token in self._astream_impl(prompt, system_prompt):
+                yield token
+
+            elapsed = time.perf_counter() - start_time
+            logger.info("Async streaming response completed in %.2f seconds", elapsed)
+
+        except Exception as e:
+            logger.error("Async streaming failed: %s", e)
+            raise
+
+    @functools.cached_property
+    def _model_info(self) -> Dict[str, Any]:
+        """Model information, built once per client"""
         return {
             'provider': self.provider,
             'name': self.model_name,
@@ -356,11 +841,22 @@ class APIClient:
             'temperature': self.temperature
         }
 
+    def get_model_info(self) -> Dict[str, Any]:
+        """
+        Get information about the currently configured model.
+
+        Returns:
+            Dict containing model information (a copy; safe to modify)
+        """
+        return dict(self._model_info)
+
 
 # Example usage
 if __name__ == "__main__":
     import sys
 
+    logging.basicConfig(level=logging.INFO)
+
     # Choose provider from command line argument
     provider = sys.argv[1] if len(sys.argv) > 1 else 'openai'
 
@@ -1,24 +1,39 @@
 """
 다중 파일 배치 분석기
 
-여러 C# 파일을 순차적으로 분석하고 결과를 집계합니다.
+여러 C# 파일을 병렬로 분석하고 결과를 집계합니다.
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import List, Optional, Callable, Dict
+from typing import List, Optional, Callable, Dict, Tuple
 from pathlib import Path
 from datetime import datetime
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import re
+import shutil
+import tempfile
+import threading
 import time
 import traceback
+import weakref
 
-from app.core.api_client import APIClient, APIClientError
+from app.core.api_client import APIClient, APIClientError, PromptTooLongError
+from app.core.llm_cache import LLMCache
 from app.core.prompt_builder import PromptBuilder, ReviewCategory, OutputFormat
 from app.core.report_generator import ReportGenerator
 
+# 여러 파일을 한 요청으로 묶을 때 쓰는 구분자 (응답도 같은 형식으로 받음)
+_BUNDLE_BLOCK_RE = re.compile(r'^### FILE: (.+?)[ \t]*\n(.*?)\n### END[ \t]*$', re.MULTILINE | re.DOTALL)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class FileAnalysisResult:
-    """파일 분석 결과"""
+    """파일 분석 결과 (불변, 스레드 간 공유 가능)"""
     file_path: str
     file_name: str
     success: bool
@@ -28,11 +43,18 @@ class FileAnalysisResult:
     error_message: str = ""
     analysis_time: float = 0.0  # 초 단위
     retry_count: int = 0
+    improved_code_path: str = ""  # keep_code=False일 때 개선 코드가 저장된 파일
+
+    def get_improved_code(self) -> str:
+        """개선된 코드 반환 (디스크로 내려간 경우 파일에서 읽음)"""
+        if self.improved_code or not self.improved_code_path:
+            return self.improved_code
+        return Path(self.improved_code_path).read_text(encoding='utf-8')
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BatchAnalysisResult:
-    """배치 분석 결과"""
+    """배치 분석 결과 (불변, 스레드 간 공유 가능)"""
     total_files: int
     success_count: int
     failure_count: int
@@ -47,20 +69,29 @@ class BatchAnalyzer:
     """
     다중 파일 배치 분석기
 
-    여러 C# 파일을 순차적으로 분석하고 결과를 집계합니다.
+    여러 C# 파일을 스레드 풀로 병렬 분석하고 결과를 집계합니다.
+    - 파일별 LLM 요청을 동시에 처리 (max_workers개)
+    - 다음 파일들을 미리 읽어 두어 디스크 I/O를 LLM 대기 시간과 겹침
     - 에러 발생 시 재시도 (최대 3회)
     - 파일 읽기 실패 시 스킵
     - 프로그레스 콜백 지원
     - 중단 가능 (is_cancelled 콜백)
+    - 내용이 바뀌지 않은 파일은 결과 캐시에서 재사용 (result_cache 지정 시)
+    - 작은 파일 여러 개를 한 번의 LLM 요청으로 묶어 분석 (bundle_small_files 지정 시)
     """
 
     MAX_RETRIES = 3  # 최대 재시도 횟수
+    BUNDLE_FILE_SIZE = 4 * 1024  # 묶음 분석 대상 파일 크기 (바이트 미만)
+    BUNDLE_MAX_FILES = 8  # 한 요청에 묶을 최대 파일 수
 
     def __init__(
         self,
         api_client: APIClient,
         prompt_builder: Optional[PromptBuilder] = None,
-        report_generator: Optional[ReportGenerator] = None
+        report_generator: Optional[ReportGenerator] = None,
+        max_workers: int = 4,
+        result_cache: Optional[LLMCache] = None,
+        spill_dir: Optional[str] = None
     ):
         """
         배치 분석기 초기화
@@ -69,10 +100,24 @@ class BatchAnalyzer:
             api_client: API 클라이언트
             prompt_builder: 프롬프트 빌더 (None이면 새로 생성)
             report_generator: 리포트 생성기 (None이면 새로 생성)
+            max_workers: 동시에 처리할 최대 파일 수 (기본값: 4)
+            result_cache: 파일 단위 분석 결과 캐시 (None이면 매번 LLM 호출)
+            spill_dir: keep_code=False일 때 개선 코드를 저장할 상위 디렉토리 (None이면 시스템 임시 디렉토리)
+                이 안에 분석기 전용 임시 디렉토리를 만들고, 분석 실행마다 하위 디렉토리를 따로 씁니다.
+                close() 호출 또는 분석기가 해제될 때 삭제되므로 그 전에 결과의 개선 코드를 읽어야 합니다.
         """
         self.api_client = api_client
+        self.max_workers = max(1, max_workers)
         self.prompt_builder = prompt_builder or PromptBuilder()
         self.report_generator = report_generator or ReportGenerator()
+        self.result_cache = result_cache
+
+        # 다른 분석기/인스턴스와 같은 파일을 분석해도 서로 덮어쓰지 않도록 전용 디렉토리 사용
+        if spill_dir:
+            Path(spill_dir).mkdir(parents=True, exist_ok=True)
+        self.spill_dir = Path(tempfile.mkdtemp(prefix="csharp_reviewer_improved_", dir=spill_dir))
+        self._run_dir = self.spill_dir
+        self._spill_cleanup = weakref.finalize(self, shutil.rmtree, str(self.spill_dir), ignore_errors=True)
 
         # 기본 리뷰 카테고리
         self.categories = [
@@ -85,55 +130,121 @@ class BatchAnalyzer:
             ReviewCategory.CODE_DOCUMENTATION
         ]
 
+        # 파일마다 같은 값이므로 한 번만 계산
+        self._categories_frozen = tuple(self.categories)
+        self._category_values = tuple(cat.value for cat in self.categories)
+        self._cache_settings = b""
+        if self.result_cache is not None:
+            # 코드를 비운 프롬프트로 리뷰 템플릿/예제/지시문이 바뀐 경우까지 구분
+            template_digest = hashlib.sha256(self._build_prompt("").encode('utf-8')).hexdigest()
+            self._cache_settings = "|".join(
+                (str(self.api_client.model_name), self.prompt_builder.SYSTEM_PROMPT, template_digest)
+                + self._category_values
+            ).encode('utf-8')
+
     def analyze_files(
         self,
         file_paths: List[str],
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
-        is_cancelled_callback: Optional[Callable[[], bool]] = None
+        is_cancelled_callback: Optional[Callable[[], bool]] = None,
+        keep_code: bool = False,
+        bundle_small_files: bool = False
     ) -> BatchAnalysisResult:
         """
-        파일 목록을 순차적으로 분석
+        파일 목록을 병렬로 분석
+
+        LLM 호출은 대부분 네트워크 대기 시간이므로 스레드 풀로 여러 요청을 동시에 보냅니다.
+        별도 스레드가 다음 파일들을 제한된 큐에 미리 읽어 두고, 작업자는 큐에서 꺼내 분석합니다.
+        콜백은 호출한 스레드에서 파일 분석이 하나 끝날 때마다 호출됩니다.
 
         Args:
             file_paths: 분석할 파일 경로 리스트
-            progress_callback: 진행 상황 콜백 (현재 인덱스, 전체 개수, 파일명)
+            progress_callback: 진행 상황 콜백 (완료된 개수, 전체 개수, 파일명)
             is_cancelled_callback: 취소 여부 확인 콜백 (True 반환 시 중단)
+            keep_code: 개선된 코드를 결과에 그대로 보관할지 여부
+                (False면 디스크에 저장하고 improved_code_path만 보관)
+            bundle_small_files: BUNDLE_FILE_SIZE 미만 파일을 최대 BUNDLE_MAX_FILES개씩
+                한 요청으로 묶어 분석 (응답 파싱 실패 시 파일별 분석으로 대체)
 
         Returns:
-            BatchAnalysisResult: 배치 분석 결과
+            BatchAnalysisResult: 배치 분석 결과 (원본 파일 순서 유지)
         """
         start_time = datetime.now()
-        results = []
+        started = time.perf_counter()
+        results_by_index: Dict[int, FileAnalysisResult] = {}
+        self._start_run(keep_code)
 
         success_count = 0
         failure_count = 0
         skipped_count = 0
 
-        for i, file_path in enumerate(file_paths):
-            # 취소 확인
-            if is_cancelled_callback and is_cancelled_callback():
-                print(f"⚠️ 분석이 취소되었습니다. (처리된 파일: {i}/{len(file_paths)})")
-                break
-
-            # 프로그레스 업데이트
-            file_name = Path(file_path).name
-            if progress_callback:
-                progress_callback(i, len(file_paths), file_name)
-
-            # 파일 분석
-            result = self._analyze_single_file(file_path)
-            results.append(result)
-
-            # 결과 집계
-            if result.success:
-                success_count += 1
-            elif result.error_message and "스킵" in result.error_message:
-                skipped_count += 1
-            else:
-                failure_count += 1
+        # 작은 파일은 묶음으로, 나머지는 미리 읽기 큐를 거쳐 파일별로 분석
+        indexed_paths = list(enumerate(file_paths))
+        bundles: List[List[Tuple[int, str]]] = []
+        if bundle_small_files:
+            bundles, indexed_paths = self._pack_bundles(indexed_paths)
+
+        # 미리 읽은 파일 큐 (메모리 사용량 제한을 위해 크기 제한)
+        prefetched: queue.Queue = queue.Queue(maxsize=2 * self.max_workers)
+        cancel_event = threading.Event()
+        prefetcher = threading.Thread(
+            target=self._prefetch_worker,
+            args=(indexed_paths, prefetched, cancel_event),
+            daemon=True
+        )
+        prefetcher.start()
+
+        completed = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 묶음 작업 + 큐 항목 하나씩 처리하는 작업 (모두 (인덱스, 결과) 리스트 반환)
+            # 작업별 담당 파일 (예상치 못한 예외를 해당 파일의 실패 결과로 바꾸기 위함)
+            futures: Dict = {
+                executor.submit(self._analyze_bundle, bundle, keep_code): bundle
+                for bundle in bundles
+            }
+            futures.update({
+                executor.submit(self._analyze_prefetched, prefetched, cancel_event, keep_code): []
+                for _ in indexed_paths
+            })
+
+            for future in as_completed(futures):
+                # 취소 확인 (대기 중인 작업은 취소, 실행 중인 작업은 완료 후 종료)
+                if is_cancelled_callback and is_cancelled_callback():
+                    print(f"⚠️ 분석이 취소되었습니다. (처리된 파일: {completed}/{len(file_paths)})")
+                    cancel_event.set()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+
+                try:
+                    file_results = future.result()
+                except Exception as e:
+                    traceback.print_exc()
+                    file_results = [
+                        (index, self._build_error_result(file_path, e))
+                        for index, file_path in futures[future]
+                    ]
+
+                for index, result in file_results:
+                    results_by_index[index] = result
+
+                    # 프로그레스 업데이트
+                    if progress_callback:
+                        progress_callback(completed, len(file_paths), result.file_name)
+                    completed += 1
+
+                    # 결과 집계
+                    if result.success:
+                        success_count += 1
+                    elif result.error_message and "스킵" in result.error_message:
+                        skipped_count += 1
+                    else:
+                        failure_count += 1
+
+        # 원본 파일 순서대로 정렬
+        results = [results_by_index[i] for i in sorted(results_by_index)]
 
         end_time = datetime.now()
-        total_time = (end_time - start_time).total_seconds()
+        total_time = time.perf_counter() - started
 
         return BatchAnalysisResult(
             total_files=len(file_paths),
@@ -146,23 +257,447 @@ class BatchAnalyzer:
             end_time=end_time
         )
 
-    def _analyze_single_file(self, file_path: str) -> FileAnalysisResult:
+    async def analyze_files_async(
+        self,
+        file_paths: List[str],
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        is_cancelled_callback: Optional[Callable[[], bool]] = None,
+        max_concurrency: Optional[int] = None,
+        keep_code: bool = False
+    ) -> BatchAnalysisResult:
+        """
+        파일 목록을 asyncio로 병렬 분석
+
+        하나의 이벤트 루프에서 모든 LLM 요청을 다중화하므로 스레드를 파일 수만큼 만들지 않습니다.
+        세마포어로 동시 요청 수를 제한하여 API 요청 한도(RPM)를 넘지 않도록 합니다.
+
+        Args:
+            file_paths: 분석할 파일 경로 리스트
+            progress_callback: 진행 상황 콜백 (완료된 개수, 전체 개수, 파일명)
+            is_cancelled_callback: 취소 여부 확인 콜백 (True 반환 시 남은 파일 건너뜀)
+            max_concurrency: 동시 요청 수 (None이면 max_workers 사용)
+            keep_code: 개선된 코드를 결과에 그대로 보관할지 여부
+
+        Returns:
+            BatchAnalysisResult: 배치 분석 결과 (원본 파일 순서 유지)
+        """
+        start_time = datetime.now()
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_workers)
+        completed = 0
+        self._start_run(keep_code)
+
+        async def run(file_path: str) -> Optional[FileAnalysisResult]:
+            nonlocal completed
+            async with semaphore:
+                if is_cancelled_callback and is_cancelled_callback():
+                    return None
+                result = await self._analyze_single_file_async(file_path, keep_code)
+
+            if progress_callback:
+                progress_callback(completed, len(file_paths), result.file_name)
+            completed += 1
+            return result
+
+        gathered = await asyncio.gather(*[run(file_path) for file_path in file_paths])
+        results = [result for result in gathered if result is not None]
+
+        if len(results) < len(file_paths):
+            print(f"⚠️ 분석이 취소되었습니다. (처리된 파일: {len(results)}/{len(file_paths)})")
+
+        end_time = datetime.now()
+
+        return BatchAnalysisResult(
+            total_files=len(file_paths),
+            success_count=sum(1 for r in results if r.success),
+            failure_count=sum(1 for r in results if not r.success and "스킵" not in r.error_message),
+            skipped_count=sum(1 for r in results if not r.success and "스킵" in r.error_message),
+            total_time=time.perf_counter() - started,
+            results=results,
+            start_time=start_time,
+            end_time=end_time
+        )
+
+    def close(self):
+        """디스크로 내린 개선 코드 삭제 (이후 결과의 get_improved_code()는 사용할 수 없음)"""
+        self._spill_cleanup()
+
+    def _start_run(self, keep_code: bool):
+        """분석 실행마다 개선 코드 저장 디렉토리를 새로 만들어 이전 실행 결과를 덮어쓰지 않도록 함"""
+        if not keep_code:
+            self._run_dir = Path(tempfile.mkdtemp(prefix="run_", dir=self.spill_dir))
+
+    def _prefetch_worker(
+        self,
+        indexed_paths: List[Tuple[int, str]],
+        prefetched: queue.Queue,
+        cancel_event: threading.Event
+    ):
+        """
+        파일을 순서대로 미리 읽어 큐에 넣는 생산자 스레드
+
+        읽기 실패 시 None을 넣어 작업자가 다시 읽으면서 스킵 결과를 만들도록 합니다.
+
+        Args:
+            indexed_paths: (원본 인덱스, 파일 경로) 리스트
+            prefetched: (인덱스, 파일 경로, 바이트) 큐
+            cancel_event: 취소 시 설정되는 이벤트
+        """
+        for index, file_path in indexed_paths:
+            try:
+                data = Path(file_path).read_bytes()
+            except OSError:
+                data = None
+
+            # 큐가 가득 찬 상태에서 취소되면 멈추지 않도록 주기적으로 확인
+            while not cancel_event.is_set():
+                try:
+                    prefetched.put((index, file_path, data), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+            if cancel_event.is_set():
+                return
+
+    def _analyze_prefetched(
+        self,
+        prefetched: queue.Queue,
+        cancel_event: threading.Event,
+        keep_code: bool = True
+    ) -> List[Tuple[int, FileAnalysisResult]]:
+        """
+        큐에서 미리 읽은 파일을 하나 꺼내 분석 [(인덱스, 결과)] 반환
+
+        취소되면 생산자가 더 이상 큐에 넣지 않으므로, 기다리는 동안 주기적으로
+        취소 여부를 확인하고 빈 리스트를 반환합니다.
+        """
+        while True:
+            if cancel_event.is_set():
+                return []
+            try:
+                index, file_path, data = prefetched.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+
+        try:
+            return [(index, self._analyze_single_file(file_path, data, keep_code))]
+        except Exception as e:
+            traceback.print_exc()
+            return [(index, self._build_error_result(file_path, e))]
+
+    def _pack_bundles(
+        self,
+        indexed_paths: List[Tuple[int, str]]
+    ) -> Tuple[List[List[Tuple[int, str]]], List[Tuple[int, str]]]:
+        """
+        작은 파일을 요청 단위 묶음으로 나누기
+
+        응답에 묶음 안 모든 파일의 개선 코드가 들어가야 하므로, 원본 크기 합이
+        출력 토큰 예산(약 4바이트/토큰, 개선 후 2배 증가 가정)을 넘지 않게 채웁니다.
+        같은 이름의 파일은 응답을 구분할 수 없으므로 한 묶음에 넣지 않습니다.
+
+        Returns:
+            (2개 이상 파일로 구성된 묶음 리스트, 파일별로 분석할 나머지)
+        """
+        byte_budget = self.api_client.max_tokens * 2
+        bundles: List[List[Tuple[int, str]]] = []
+        singles: List[Tuple[int, str]] = []
+        current: List[Tuple[int, str]] = []
+        current_bytes = 0
+
+        for index, file_path in indexed_paths:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = None
+
+            if size is None or size >= self.BUNDLE_FILE_SIZE:
+                singles.append((index, file_path))
+                continue
+
+            names = {Path(path).name for _, path in current}
+            if current and (
+                len(current) >= self.BUNDLE_MAX_FILES
+                or current_bytes + size > byte_budget
+                or Path(file_path).name in names
+            ):
+                bundles.append(current)
+                current, current_bytes = [], 0
+
+            current.append((index, file_path))
+            current_bytes += size
+
+        if current:
+            bundles.append(current)
+
+        # 파일 하나짜리 묶음은 일반 경로로 처리
+        singles.extend(bundle[0] for bundle in bundles if len(bundle) == 1)
+        return [bundle for bundle in bundles if len(bundle) > 1], singles
+
+    def _analyze_bundle(
+        self,
+        bundle: List[Tuple[int, str]],
+        keep_code: bool = True
+    ) -> List[Tuple[int, FileAnalysisResult]]:
+        """
+        작은 파일 여러 개를 한 번의 LLM 요청으로 분석
+
+        각 파일을 `### FILE: 이름` ~ `### END` 블록으로 감싸 보내고 같은 형식의 응답을
+        파일별 결과로 나눕니다. 요청 실패나 파싱 실패 시 파일별 분석으로 대체합니다.
+
+        Args:
+            bundle: (원본 인덱스, 파일 경로) 리스트
+            keep_code: 개선된 코드를 결과에 보관할지 여부
+
+        Returns:
+            [(인덱스, 결과)] 리스트
+        """
+        start_time = time.perf_counter()
+        results: List[Tuple[int, FileAnalysisResult]] = []
+        pending = []  # (인덱스, 경로, 원본 코드, 바이트, 캐시 키)
+
+        # 1. 파일 읽기 및 캐시 확인 (스킵/캐시 적중은 바로 결과로)
+        for index, file_path in bundle:
+            source = self._read_source(file_path, start_time)
+            if isinstance(source, FileAnalysisResult):
+                results.append((index, source))
+                continue
+
+            original_code, data = source
+            cache_key = self._result_cache_key(data)
+            cached = self._load_cached_result(file_path, original_code, cache_key, keep_code)
+            if cached is not None:
+                results.append((index, cached))
+                continue
+
+            pending.append((index, file_path, original_code, data, cache_key))
+
+        if len(pending) < 2:
+            return results + [
+                (index, self._analyze_single_file(file_path, data, keep_code))
+                for index, file_path, _, data, _ in pending
+            ]
+
+        # 2. 묶음 요청
+        framed = "\n\n".join(
+            f"### FILE: {Path(file_path).name}\n{original_code}\n### END"
+            for _, file_path, original_code, _, _ in pending
+        )
+        prompt = (
+            f"{self._build_prompt(framed)}\n\n"
+            f"위 코드는 서로 독립된 {len(pending)}개 파일입니다. 각 파일을 따로 개선하고, "
+            f"파일마다 `### FILE: 파일명` 줄로 시작해 `### END` 줄로 끝나는 블록을 하나씩 출력하세요."
+        )
+
+        improved_by_name = {}
+        try:
+            chunks: list[str] = []
+            for token in self.api_client.analyze_code(
+                prompt=prompt,
+                system_prompt=self.prompt_builder.SYSTEM_PROMPT,
+                stream=True
+            ):
+                chunks.append(token)
+            improved_by_name = {
+                name.strip(): code for name, code in _BUNDLE_BLOCK_RE.findall("".join(chunks))
+            }
+        except Exception as e:
+            print(f"⚠️ 묶음 분석 실패, 파일별 분석으로 대체: {str(e)}")
+
+        # 3. 응답을 파일별 결과로 분리 (모든 파일 블록이 있어야 사용)
+        names = [Path(file_path).name for _, file_path, _, _, _ in pending]
+        if not all(name in improved_by_name for name in names):
+            return results + [
+                (index, self._analyze_single_file(file_path, data, keep_code))
+                for index, file_path, _, data, _ in pending
+            ]
+
+        for (index, file_path, original_code, _, cache_key), name in zip(pending, names):
+            results.append((index, self._build_success_result(
+                file_path, original_code, improved_by_name[name], start_time, 0,
+                cache_key, keep_code
+            )))
+
+        return results
+
+    def _analyze_single_file(
+        self,
+        file_path: str,
+        data: Optional[bytes] = None,
+        keep_code: bool = True
+    ) -> FileAnalysisResult:
         """
         단일 파일 분석 (재시도 로직 포함)
 
         Args:
             file_path: 파일 경로
+            data: 미리 읽은 파일 바이트 (None이면 직접 읽음)
+            keep_code: 개선된 코드를 결과에 보관할지 여부
 
         Returns:
             FileAnalysisResult: 파일 분석 결과
         """
         file_name = Path(file_path).name
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # 1. 파일 읽기
+        source = self._read_source(file_path, start_time, data)
+        if isinstance(source, FileAnalysisResult):
+            return source
+        original_code, data = source
+
+        # 2. 이전 분석 결과 재사용 (내용이 같으면 LLM 호출 생략)
+        cache_key = self._result_cache_key(data)
+        cached = self._load_cached_result(file_path, original_code, cache_key, keep_code)
+        if cached is not None:
+            return cached
+
+        # 3. LLM 분석 (재시도 로직)
+        retry_count = 0
+        last_error = None
+
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                # LLM 호출 (스트리밍 활성화)
+                chunks: list[str] = []
+                for token in self.api_client.analyze_code(
+                    prompt=self._build_prompt(original_code),
+                    system_prompt=self.prompt_builder.SYSTEM_PROMPT,
+                    stream=True  # 스트리밍 활성화 (토큰 제한 완화)
+                ):
+                    chunks.append(token)
+                improved_code = "".join(chunks)
+
+                # 리포트 생성 및 성공
+                return self._build_success_result(
+                    file_path, original_code, improved_code, start_time, retry_count,
+                    cache_key, keep_code
+                )
+
+            except PromptTooLongError as e:
+                # 재시도해도 결과가 같으므로 즉시 실패 처리
+                last_error = e
+                print(f"⚠️ {file_name} 프롬프트가 너무 깁니다: {str(e)}")
+                break
+
+            except APIClientError as e:
+                retry_count += 1
+                last_error = e
+                print(f"⚠️ {file_name} 분석 실패 (시도 {attempt + 1}/{self.MAX_RETRIES}): {str(e)}")
+
+                # 마지막 재시도가 아니면 대기
+                if attempt < self.MAX_RETRIES - 1:
+                    time.sleep(1)  # 1초 대기 후 재시도
+
+            except Exception as e:
+                retry_count += 1
+                last_error = e
+                print(f"❌ {file_name} 분석 중 예상치 못한 오류 (시도 {attempt + 1}/{self.MAX_RETRIES}): {str(e)}")
+                print(traceback.format_exc())
+
+                # 마지막 재시도가 아니면 대기
+                if attempt < self.MAX_RETRIES - 1:
+                    time.sleep(1)
+
+        # 모든 재시도 실패
+        return self._build_failure_result(
+            file_path, original_code, last_error, start_time, retry_count
+        )
+
+    async def _analyze_single_file_async(
+        self,
+        file_path: str,
+        keep_code: bool = True
+    ) -> FileAnalysisResult:
+        """
+        단일 파일 비동기 분석 (재시도 로직 포함)
+
+        Args:
+            file_path: 파일 경로
+            keep_code: 개선된 코드를 결과에 보관할지 여부
+
+        Returns:
+            FileAnalysisResult: 파일 분석 결과
+        """
+        file_name = Path(file_path).name
+        start_time = time.perf_counter()
+
+        # 1. 파일 읽기
+        source = self._read_source(file_path, start_time)
+        if isinstance(source, FileAnalysisResult):
+            return source
+        original_code, data = source
+
+        # 2. 이전 분석 결과 재사용 (내용이 같으면 LLM 호출 생략)
+        cache_key = self._result_cache_key(data)
+        cached = self._load_cached_result(file_path, original_code, cache_key, keep_code)
+        if cached is not None:
+            return cached
+
+        # 3. LLM 분석 (재시도 로직)
+        retry_count = 0
+        last_error = None
+
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                improved_code = await self.api_client.analyze_code_async(
+                    prompt=self._build_prompt(original_code),
+                    system_prompt=self.prompt_builder.SYSTEM_PROMPT
+                )
+
+                return self._build_success_result(
+                    file_path, original_code, improved_code, start_time, retry_count,
+                    cache_key, keep_code
+                )
+
+            except PromptTooLongError as e:
+                # 재시도해도 결과가 같으므로 즉시 실패 처리
+                last_error = e
+                print(f"⚠️ {file_name} 프롬프트가 너무 깁니다: {str(e)}")
+                break
+
+            except Exception as e:
+                retry_count += 1
+                last_error = e
+                print(f"⚠️ {file_name} 분석 실패 (시도 {attempt + 1}/{self.MAX_RETRIES}): {str(e)}")
+
+                # 마지막 재시도가 아니면 대기 (이벤트 루프는 막지 않음)
+                if attempt < self.MAX_RETRIES - 1:
+                    await asyncio.sleep(1)
+
+        # 모든 재시도 실패
+        return self._build_failure_result(
+            file_path, original_code, last_error, start_time, retry_count
+        )
+
+    def _read_source(
+        self,
+        file_path: str,
+        start_time: float,
+        data: Optional[bytes] = None
+    ) -> tuple[str, bytes] | FileAnalysisResult:
+        """
+        분석할 소스 파일 읽기
+
+        텍스트 IO 계층을 거치지 않고 바이트로 한 번에 읽은 뒤 한 번만 디코딩합니다.
+        읽은 바이트는 결과 캐시 키 계산에 그대로 재사용합니다.
+
+        Args:
+            file_path: 파일 경로
+            start_time: 분석 시작 시점 (time.perf_counter())
+            data: 미리 읽은 파일 바이트 (None이면 직접 읽음)
+
+        Returns:
+            (원본 코드 문자열, 파일 바이트), 읽을 수 없으면 스킵 처리된 FileAnalysisResult
+        """
+        file_name = Path(file_path).name
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                original_code = f.read().strip()
+            if data is None:
+                data = Path(file_path).read_bytes()
+            original_code = data.decode('utf-8').strip()
 
             if not original_code:
                 return FileAnalysisResult(
@@ -170,16 +705,18 @@ class BatchAnalyzer:
                     file_name=file_name,
                     success=False,
                     error_message=f"빈 파일 (스킵)",
-                    analysis_time=time.time() - start_time
+                    analysis_time=time.perf_counter() - start_time
                 )
 
+            return original_code, data
+
         except UnicodeDecodeError:
             return FileAnalysisResult(
                 file_path=file_path,
                 file_name=file_name,
                 success=False,
                 error_message=f"UTF-8 인코딩 오류 (스킵)",
-                analysis_time=time.time() - start_time
+                analysis_time=time.perf_counter() - start_time
             )
 
         except Exception as e:
@@ -188,87 +725,160 @@ class BatchAnalyzer:
                 file_name=file_name,
                 success=False,
                 error_message=f"파일 읽기 실패: {str(e)} (스킵)",
-                analysis_time=time.time() - start_time
+                analysis_time=time.perf_counter() - start_time
             )
 
-        # 2. LLM 분석 (재시도 로직)
-        retry_count = 0
-        last_error = None
+    def _build_prompt(self, original_code: str) -> str:
+        """원본 코드로 LLM 사용자 프롬프트 생성 (시스템 프롬프트는 analyze_code에 별도 전달)"""
+        return self.prompt_builder.build_review_prompt(
+            code=original_code,
+            categories=self._categories_frozen,
+            output_format=OutputFormat.IMPROVED_CODE,
+            include_examples=True
+        )
 
-        for attempt in range(self.MAX_RETRIES):
-            try:
-                # 프롬프트 생성
-                prompt = self.prompt_builder.build_review_prompt(
-                    code=original_code,
-                    categories=self.categories,
-                    output_format=OutputFormat.IMPROVED_CODE,
-                    include_examples=True
-                )
+    def _result_cache_key(self, data: bytes) -> Optional[str]:
+        """
+        파일 결과 캐시 키 생성
 
-                full_prompt = f"{self.prompt_builder.SYSTEM_PROMPT}\n\n{prompt}"
+        파일 바이트, 모델, 리뷰 카테고리, 시스템 프롬프트, 프롬프트 템플릿(예제 포함)이
+        모두 같을 때만 같은 키가 됩니다. 샘플링(temperature > 0) 응답은 재현되지 않으므로
+        APIClient와 마찬가지로 캐시하지 않습니다.
 
-                # LLM 호출 (스트리밍 활성화)
-                improved_code = ""
-                for token in self.api_client.analyze_code(
-                    prompt=full_prompt,
-                    stream=True  # 스트리밍 활성화 (토큰 제한 완화)
-                ):
-                    improved_code += token
-
-                # 리포트 생성
-                report_markdown = self.report_generator.generate_report(
-                    original_code=original_code,
-                    improved_code=improved_code,
-                    categories=[cat.value for cat in self.categories],
-                    model_name="phi3:mini"
-                )
+        Returns:
+            SHA256 키 (결과 캐시를 사용하지 않으면 None)
+        """
+        if self.result_cache is None or self.api_client.temperature != 0.0:
+            return None
 
-                # 성공
-                analysis_time = time.time() - start_time
+        hasher = hashlib.sha256(data)
+        hasher.update(b"|")
+        hasher.update(self._cache_settings)
+        return hasher.hexdigest()
 
-                return FileAnalysisResult(
-                    file_path=file_path,
-                    file_name=file_name,
-                    success=True,
-                    original_code=original_code,
-                    improved_code=improved_code,
-                    report_markdown=report_markdown,
-                    analysis_time=analysis_time,
-                    retry_count=retry_count
-                )
+    def _load_cached_result(
+        self,
+        file_path: str,
+        original_code: str,
+        cache_key: Optional[str],
+        keep_code: bool = True
+    ) -> Optional[FileAnalysisResult]:
+        """캐시된 분석 결과가 있으면 성공 결과로 복원"""
+        if cache_key is None:
+            return None
+
+        cached = self.result_cache.get(cache_key)
+        if cached is None:
+            return None
+
+        improved_code, report_markdown = json.loads(cached)
+        print(f"♻️ {Path(file_path).name} 변경 없음 (캐시된 결과 사용)")
+        improved_code, improved_code_path = self._store_improved_code(
+            file_path, improved_code, keep_code
+        )
 
-            except APIClientError as e:
-                retry_count += 1
-                last_error = e
-                print(f"⚠️ {file_name} 분석 실패 (시도 {attempt + 1}/{self.MAX_RETRIES}): {str(e)}")
+        return FileAnalysisResult(
+            file_path=file_path,
+            file_name=Path(file_path).name,
+            success=True,
+            original_code=original_code,
+            improved_code=improved_code,
+            report_markdown=report_markdown,
+            analysis_time=0.0,
+            retry_count=0,
+            improved_code_path=improved_code_path
+        )
 
-                # 마지막 재시도가 아니면 대기
-                if attempt < self.MAX_RETRIES - 1:
-                    time.sleep(1)  # 1초 대기 후 재시도
+    def _store_improved_code(
+        self,
+        file_path: str,
+        improved_code: str,
+        keep_code: bool
+    ) -> Tuple[str, str]:
+        """
+        개선된 코드를 메모리에 둘지 디스크로 내릴지 결정
 
-            except Exception as e:
-                retry_count += 1
-                last_error = e
-                print(f"❌ {file_name} 분석 중 예상치 못한 오류 (시도 {attempt + 1}/{self.MAX_RETRIES}): {str(e)}")
-                print(traceback.format_exc())
+        Returns:
+            (결과에 보관할 개선 코드, 저장된 파일 경로) - keep_code=True면 (코드, "")
+        """
+        if keep_code:
+            return improved_code, ""
 
-                # 마지막 재시도가 아니면 대기
-                if attempt < self.MAX_RETRIES - 1:
-                    time.sleep(1)
+        name = hashlib.sha256(str(Path(file_path).resolve()).encode('utf-8')).hexdigest()[:16]
+        spill_path = self._run_dir / f"{name}.cs"
+        spill_path.write_text(improved_code, encoding='utf-8')
+        return "", str(spill_path)
 
-        # 모든 재시도 실패
-        analysis_time = time.time() - start_time
+    def _build_success_result(
+        self,
+        file_path: str,
+        original_code: str,
+        improved_code: str,
+        start_time: float,
+        retry_count: int,
+        cache_key: Optional[str] = None,
+        keep_code: bool = True
+    ) -> FileAnalysisResult:
+        """LLM 응답으로 리포트를 생성하고 성공 결과 반환 (결과 캐시에도 저장)"""
+        report_markdown = self.report_generator.generate_report(
+            original_code=original_code,
+            improved_code=improved_code,
+            categories=self._category_values,
+            model_name="phi3:mini"
+        )
+
+        if cache_key is not None:
+            self.result_cache.set(
+                cache_key,
+                json.dumps([improved_code, report_markdown], ensure_ascii=False),
+                model=str(self.api_client.model_name)
+            )
+
+        # 대용량 배치에서 메모리를 아끼기 위해 개선 코드는 디스크로 내릴 수 있음
+        improved_code, improved_code_path = self._store_improved_code(
+            file_path, improved_code, keep_code
+        )
+
+        return FileAnalysisResult(
+            file_path=file_path,
+            file_name=Path(file_path).name,
+            success=True,
+            original_code=original_code,
+            improved_code=improved_code,
+            report_markdown=report_markdown,
+            analysis_time=time.perf_counter() - start_time,
+            retry_count=retry_count,
+            improved_code_path=improved_code_path
+        )
 
+    def _build_failure_result(
+        self,
+        file_path: str,
+        original_code: str,
+        last_error: Optional[Exception],
+        start_time: float,
+        retry_count: int
+    ) -> FileAnalysisResult:
+        """모든 재시도가 실패했을 때의 결과 반환"""
         return FileAnalysisResult(
             file_path=file_path,
-            file_name=file_name,
+            file_name=Path(file_path).name,
             success=False,
             original_code=original_code,
             error_message=f"LLM 분석 실패 ({self.MAX_RETRIES}회 재시도): {str(last_error)}",
-            analysis_time=analysis_time,
+            analysis_time=time.perf_counter() - start_time,
             retry_count=retry_count
         )
 
+    def _build_error_result(self, file_path: str, error: Exception) -> FileAnalysisResult:
+        """예상치 못한 예외로 분석이 중단된 파일의 실패 결과 반환"""
+        return FileAnalysisResult(
+            file_path=file_path,
+            file_name=Path(file_path).name,
+            success=False,
+            error_message=f"분석 중 예외 발생: {str(error)}"
+        )
+
 
 # 사용 예제
 if __name__ == "__main__":
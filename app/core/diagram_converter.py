@@ -1,38 +1,530 @@
 """
-Mermaid 다이어그램 → PNG 변환기
+Mermaid 다이어그램 → SVG/PNG 변환기
 
-Markdown 내 Mermaid 코드 블록을 PNG 이미지로 변환하고
+Markdown 내 Mermaid 코드 블록을 SVG(기본) 또는 PNG 이미지로 변환하고
 Base64로 인코딩하여 Markdown에 임베딩합니다.
 """
 
-import re
+import asyncio
+import os
+import struct
 import subprocess
+import threading
 import tempfile
 import base64
+import hashlib
+import functools
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+_MERMAID_FENCE = '```mermaid'
+_CLOSING_FENCE = '\n```'
+
+# PNG 파일 시그니처
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# 출력 형식별 MIME 타입
+_MIME_TYPES = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png',
+}
+
+# stdin/stdout 입출력(-i - / -o -)을 지원하는 최소 mmdc 버전
+_MMDC_STDIO_VERSION = (10, 4)
+
+# mmdc 임시 입출력 파일 이름
+_MMD_FILE_NAME = "diagram.mmd"
+_BATCH_INPUT_NAME = "input.md"
+_BATCH_OUTPUT_NAME = "out.md"
+
+# 상주 렌더링 서버 스크립트 (use_server=True)
+_SERVER_SCRIPT = Path(__file__).parent.parent.parent / "resources" / "mermaid" / "mermaid_server.js"
+
+# 변환된 다이어그램 이미지 태그 (data: Base64 SVG/PNG)
+_IMG_TAG_TEMPLATE = (
+    '<img src="data:{mime};base64,{data}" alt="Mermaid Diagram" '
+    'style="max-width: 100%; height: auto; background-color: white; padding: 10px; border-radius: 6px;" />'
+)
+
+
+def _iter_mermaid(text: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Markdown에서 Mermaid 코드 블록을 선형 탐색
+
+    정규식 r'```mermaid\\s*\\n(.*?)\\n```' (DOTALL)과 같은 블록을 찾지만
+    str.find만 사용하므로 큰 Markdown에서도 O(N)입니다.
+
+    ```mermaid
+    graph TD
+      A --> B
+    ```
+
+    Args:
+        text: Markdown 텍스트
+
+    Yields:
+        (블록 시작 위치, 블록 끝 위치, Mermaid 코드)
+    """
+    pos = 0
+    length = len(text)
+
+    while True:
+        start = text.find(_MERMAID_FENCE, pos)
+        if start < 0:
+            return
+
+        # 펜스 뒤 공백 구간에서 마지막 줄바꿈 다음부터 코드 시작 (\s*\n)
+        ws_start = ws_end = start + len(_MERMAID_FENCE)
+        while ws_end < length and text[ws_end].isspace():
+            ws_end += 1
+
+        newline = text.rfind('\n', ws_start, ws_end)
+        if newline < 0:
+            pos = start + 1
+            continue
+
+        code_start = newline + 1
+        close = text.find(_CLOSING_FENCE, code_start)
+
+        if close < 0:
+            # 빈 다이어그램: 공백 구간의 마지막 줄바꿈이 닫는 펜스의 일부인 경우
+            previous = text.rfind('\n', ws_start, newline)
+            if previous < 0 or not text.startswith('```', code_start):
+                return
+            code_start, close = previous + 1, newline
+
+        end = close + len(_CLOSING_FENCE)
+        yield start, end, text[code_start:close]
+        pos = end
+
+
+def _parse_version(version: str) -> Tuple[int, ...]:
+    """
+    버전 문자열을 비교 가능한 튜플로 변환 (예: "10.9.1" → (10, 9, 1))
+
+    Args:
+        version: 버전 문자열
+
+    Returns:
+        숫자 튜플 (해석할 수 없으면 빈 튜플)
+    """
+    parts = []
+    for part in version.strip().lstrip('v').split('.'):
+        if not part.isdigit():
+            break
+        parts.append(int(part))
+    return tuple(parts)
+
+
+class MermaidRenderError(Exception):
+    """mmdc로 다이어그램을 렌더링하지 못함"""
+    pass
+
+
+@functools.lru_cache(maxsize=256)
+def _render_image_cached(
+    cache_path: str,
+    mermaid_code: str,
+    mmdc_path: str,
+    timeout: int,
+    theme: str,
+    background: str,
+    output_format: str = 'svg',
+    use_stdio: bool = False
+) -> bytes:
+    """
+    Mermaid 코드를 이미지로 렌더링 (프로세스 내 LRU + 디스크 캐시)
+
+    cache_path는 (mmdc 버전, 출력 형식, 테마, 배경색, 코드)의 해시로 만든 경로이므로
+    LRU 키로도 그대로 사용합니다. 실패는 예외로 알려 LRU에 캐시되지 않게 합니다.
+
+    Args:
+        cache_path: 디스크 캐시 파일 경로
+        mermaid_code: Mermaid 다이어그램 코드
+        mmdc_path: mmdc 실행 파일 경로
+        timeout: mmdc 실행 타임아웃 (초)
+        theme: Mermaid 테마
+        background: 배경색
+        output_format: 출력 형식 ('svg' 또는 'png')
+        use_stdio: stdin/stdout으로 mmdc와 주고받을지 여부 (임시 파일 생략)
+
+    Returns:
+        이미지 바이트 데이터
+
+    Raises:
+        MermaidRenderError: mmdc 실행 실패, 타임아웃 또는 출력 파일 없음
+    """
+    # 디스크 캐시 확인 (이전 실행에서 렌더링한 다이어그램이면 mmdc 실행 생략)
+    if os.path.exists(cache_path):
+        logger.debug(f"Mermaid 이미지 캐시 사용: {os.path.basename(cache_path)}")
+        return _read_file(cache_path)
+
+    image_data = None
+    if use_stdio:
+        image_data = _run_mmdc_stdio(mermaid_code, mmdc_path, timeout, theme, background, output_format)
+    if image_data is None:
+        image_data = _run_mmdc_file(mermaid_code, mmdc_path, timeout, theme, background, output_format)
+
+    logger.info(f"Mermaid 다이어그램 변환 성공 ({len(image_data)} bytes, {output_format})")
+
+    _store_cache(image_data, cache_path)
+    return image_data
+
+
+def _is_image(data: bytes, output_format: str) -> bool:
+    """
+    데이터가 해당 형식의 이미지인지 확인
+
+    Args:
+        data: 이미지 바이트 데이터
+        output_format: 출력 형식 ('svg' 또는 'png')
+
+    Returns:
+        형식이 맞으면 True
+    """
+    if output_format == 'png':
+        return data.startswith(_PNG_SIGNATURE)
+    return b'<svg' in data[:1024]
+
+
+def _run_mmdc(cmd: list, timeout: int, **kwargs) -> subprocess.CompletedProcess:
+    """
+    mmdc 실행 (타임아웃/실행 오류를 MermaidRenderError로 변환)
+
+    Args:
+        cmd: mmdc 명령어
+        timeout: 실행 타임아웃 (초)
+        **kwargs: subprocess.run 추가 인자
+
+    Returns:
+        실행 결과 (exit code 0)
+
+    Raises:
+        MermaidRenderError: 실행 실패 또는 타임아웃
+    """
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            timeout=timeout,
+            check=False,  # 에러 발생 시 예외 발생하지 않음
+            **kwargs
+        )
+    except subprocess.TimeoutExpired:
+        logger.error(f"mmdc 실행 타임아웃 ({timeout}초 초과)")
+        raise MermaidRenderError("mmdc timeout")
+    except Exception as e:
+        logger.error(f"다이어그램 이미지 생성 중 오류: {e}")
+        raise MermaidRenderError(str(e)) from e
+
+    # 실행 결과 확인
+    if result.returncode != 0:
+        stderr = result.stderr
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode('utf-8', errors='replace')
+        logger.error(f"mmdc 실행 실패 (exit code {result.returncode})")
+        logger.error(f"stderr: {stderr}")
+        raise MermaidRenderError(f"mmdc exit code {result.returncode}")
+
+    return result
+
+
+def _stdio_command(mmdc_path: str, theme: str, background: str, output_format: str) -> list:
+    """stdin/stdout 모드 mmdc 명령어"""
+    # -i -/-o -: stdin/stdout, -e: stdout에는 확장자가 없으므로 형식 명시
+    return [
+        mmdc_path,
+        '-i', '-',
+        '-o', '-',
+        '-e', output_format,
+        '-b', background,
+        '-t', theme,
+        '--quiet'
+    ]
+
+
+def _run_mmdc_stdio(
+    mermaid_code: str,
+    mmdc_path: str,
+    timeout: int,
+    theme: str,
+    background: str,
+    output_format: str
+) -> Optional[bytes]:
+    """
+    stdin으로 Mermaid 코드를 넘기고 stdout으로 이미지를 받음 (mmdc 10.x 이상)
+
+    Returns:
+        이미지 바이트 데이터 (stdout 형식이 맞지 않으면 None → 임시 파일 방식으로 폴백)
+
+    Raises:
+        MermaidRenderError: mmdc 실행 실패 또는 타임아웃
+    """
+    cmd = _stdio_command(mmdc_path, theme, background, output_format)
+    result = _run_mmdc(cmd, timeout, input=mermaid_code.encode('utf-8'))
+
+    if not _is_image(result.stdout, output_format):
+        logger.warning(f"mmdc stdout 출력이 {output_format.upper()}가 아닙니다. 임시 파일 방식으로 재시도합니다.")
+        return None
+    return result.stdout
+
+
+def _run_mmdc_file(
+    mermaid_code: str,
+    mmdc_path: str,
+    timeout: int,
+    theme: str,
+    background: str,
+    output_format: str
+) -> bytes:
+    """
+    임시 .mmd 파일을 입력으로 이미지 파일을 생성한 뒤 읽음
+
+    Returns:
+        이미지 바이트 데이터
+
+    Raises:
+        MermaidRenderError: mmdc 실행 실패, 타임아웃 또는 출력 파일 없음
+    """
+    # 임시 디렉토리 생성 (다이어그램마다 호출되므로 Path 대신 문자열 경로 사용)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # 임시 .mmd 파일 생성
+        mmd_file = os.path.join(tmpdir, _MMD_FILE_NAME)
+        image_file = os.path.join(tmpdir, f"diagram.{output_format}")
+
+        # Mermaid 코드를 파일로 저장
+        with open(mmd_file, 'w', encoding='utf-8') as f:
+            f.write(mermaid_code)
+
+        # mmdc 명령어 실행
+        # -i: 입력 파일
+        # -o: 출력 파일
+        # -b: 배경색 (투명 또는 흰색)
+        # -t: 테마 (default, dark, forest, neutral)
+        cmd = [
+            mmdc_path,
+            '-i', mmd_file,
+            '-o', image_file,
+            '-b', background,
+            '-t', theme,
+            '--quiet'             # 조용한 모드
+        ]
+        _run_mmdc(cmd, timeout, text=True)
+
+        # 이미지 파일 존재 확인
+        if not os.path.exists(image_file):
+            logger.error(f"{output_format.upper()} 파일이 생성되지 않았습니다.")
+            raise MermaidRenderError(f"{output_format} not generated")
+
+        return _read_file(image_file)
+
+
+def _read_file(path: str) -> bytes:
+    """파일 전체를 바이트로 읽기"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _store_cache(image_data: bytes, cache_path: str) -> None:
+    """
+    렌더링된 이미지를 디스크 캐시에 저장
+
+    같은 디렉토리의 임시 파일에 쓴 뒤 원자적으로 교체하므로
+    동시에 같은 다이어그램을 렌더링해도 불완전한 파일이 보이지 않습니다.
+
+    Args:
+        image_data: 이미지 바이트 데이터
+        cache_path: 디스크 캐시 파일 경로
+    """
+    try:
+        fd, tmp_cache = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(image_data)
+        os.replace(tmp_cache, cache_path)
+    except OSError as e:
+        logger.warning(f"Mermaid 이미지 캐시 저장 실패: {e}")
+
+
+def _mermaid_cli_node_paths(mmdc_path: str) -> list[str]:
+    """
+    mmdc 설치 위치에서 puppeteer/mermaid 모듈 경로 추정 (NODE_PATH용)
+
+    Args:
+        mmdc_path: mmdc 실행 파일 경로
+
+    Returns:
+        mermaid-cli 패키지의 node_modules와 전역 node_modules 경로
+    """
+    package_dir = next(
+        (parent for parent in Path(mmdc_path).resolve().parents if parent.name == 'mermaid-cli'),
+        # Windows npm 전역 설치: %APPDATA%\npm\mmdc.cmd 옆의 node_modules
+        Path(mmdc_path).parent / 'node_modules' / '@mermaid-js' / 'mermaid-cli'
+    )
+    return [str(package_dir / 'node_modules'), str(package_dir.parent.parent)]
+
+
+class _MermaidServer:
+    """
+    상주 Mermaid 렌더링 서버 (mermaid_server.js) 클라이언트
+
+    Chromium을 띄운 Node 프로세스 하나를 재사용해 다이어그램을 렌더링합니다.
+    요청은 잠금으로 직렬화되며, 프로세스가 죽으면 다음 요청에서 다시 시작합니다.
+    """
+
+    def __init__(
+        self,
+        node_path: str,
+        mmdc_path: str,
+        theme: str,
+        background: str,
+        output_format: str = 'svg'
+    ):
+        """
+        서버 클라이언트 초기화 (프로세스는 첫 요청 때 시작)
+
+        Args:
+            node_path: node 실행 파일 경로
+            mmdc_path: mmdc 실행 파일 경로 (puppeteer/mermaid 모듈 위치 추정용)
+            theme: Mermaid 테마
+            background: 배경색
+            output_format: 출력 형식 ('svg' 또는 'png')
+        """
+        self.node_path = node_path
+        self.mmdc_path = mmdc_path
+        self.theme = theme
+        self.background = background
+        self.output_format = output_format
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        """Node 서버 프로세스 시작"""
+        env = os.environ.copy()
+        node_paths = _mermaid_cli_node_paths(self.mmdc_path)
+        if env.get('NODE_PATH'):
+            node_paths.append(env['NODE_PATH'])
+        env['NODE_PATH'] = os.pathsep.join(node_paths)
+
+        self._proc = subprocess.Popen(
+            [self.node_path, str(_SERVER_SCRIPT), self.theme, self.background, self.output_format],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env
+        )
+        logger.info("Mermaid 렌더링 서버 시작")
+
+    def _read_exact(self, size: int) -> bytes:
+        """stdout에서 정확히 size 바이트 읽기 (프로세스 종료 시 ConnectionError)"""
+        data = self._proc.stdout.read(size)
+        if len(data) < size:
+            raise ConnectionError("Mermaid 렌더링 서버 응답이 끊겼습니다.")
+        return data
+
+    def render(self, mermaid_code: str, timeout: int) -> bytes:
+        """
+        다이어그램 렌더링 요청
+
+        Args:
+            mermaid_code: Mermaid 다이어그램 코드
+            timeout: 응답 대기 타임아웃 (초, 초과 시 서버 종료)
+
+        Returns:
+            이미지 바이트 데이터
+
+        Raises:
+            MermaidRenderError: 서버가 다이어그램 렌더링 실패를 응답한 경우
+            OSError: 서버 시작/통신 실패 (다음 요청에서 재시작)
+        """
+        payload = mermaid_code.encode('utf-8')
+
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+
+            # 응답이 없으면 프로세스를 종료해 블로킹된 read를 깨움
+            timer = threading.Timer(timeout, self._proc.kill)
+            timer.start()
+            try:
+                self._proc.stdin.write(struct.pack('>I', len(payload)) + payload)
+                self._proc.stdin.flush()
+                status, length = struct.unpack('>BI', self._read_exact(5))
+                body = self._read_exact(length)
+            except (OSError, ValueError) as e:
+                self._stop()
+                raise ConnectionError(f"Mermaid 렌더링 서버 통신 실패: {e}") from e
+            finally:
+                timer.cancel()
+
+        if status != 0:
+            message = body.decode('utf-8', errors='replace')
+            logger.error(f"Mermaid 렌더링 실패: {message}")
+            raise MermaidRenderError(message)
+        return body
+
+    def _stop(self) -> None:
+        """서버 프로세스 종료 (stdin을 닫으면 서버가 브라우저를 닫고 종료)"""
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.close()
+            self._proc.wait(timeout=5)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            self._proc.kill()
+        self._proc = None
+
+    def close(self) -> None:
+        """서버 프로세스 종료"""
+        with self._lock:
+            self._stop()
+
 
 class DiagramConverter:
     """
     Mermaid 다이어그램 변환기
 
-    Mermaid CLI (mmdc)를 사용하여 다이어그램을 PNG로 변환합니다.
+    Mermaid CLI (mmdc)를 사용하여 다이어그램을 SVG(기본) 또는 PNG로 변환합니다.
+    SVG는 Chromium 스크린샷 단계가 없어 더 빠르고 선 위주 다이어그램에서 크기도 작습니다.
+    변환된 이미지는 (mmdc 버전, 출력 형식, 테마, 배경색, 코드) 해시를 키로 메모리(LRU)와
+    디스크에 캐시되어 같은 다이어그램은 mmdc를 다시 실행하지 않습니다.
     """
 
-    def __init__(self, timeout: int = 10):
+    # 동시에 실행할 mmdc 프로세스 수 상한 (각각 headless Chromium을 띄움)
+    MAX_WORKERS = 8
+
+    def __init__(
+        self,
+        timeout: int = 10,
+        cache_dir: Optional[str] = None,
+        use_server: bool = False,
+        output_format: str = 'svg'
+    ):
         """
         DiagramConverter 초기화
 
         Args:
             timeout: mmdc 명령어 실행 타임아웃 (초 단위, 기본값: 10)
+            cache_dir: 이미지 캐시 디렉토리 (기본값: <임시 디렉토리>/mermaid_cache)
+            use_server: 상주 렌더링 서버 사용 여부 (Chromium을 한 번만 띄움, node 필요)
+            output_format: 출력 형식 ('svg' 또는 'png', 기본값: 'svg')
+                SVG data URI를 표시하지 못하는 PDF 내보내기 등에는 'png'를 사용합니다.
+
+        Raises:
+            ValueError: 지원하지 않는 출력 형식
         """
+        if output_format not in _MIME_TYPES:
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {output_format} (svg, png 중 선택)")
+
         self.timeout = timeout
+        self.output_format = output_format
+        self.theme = 'default'
+        self.background = 'white'
 
         # mmdc 명령어 존재 확인
         self.mmdc_path = shutil.which("mmdc")
@@ -40,6 +532,62 @@ class DiagramConverter:
             logger.warning("mmdc 명령어를 찾을 수 없습니다. Mermaid 다이어그램 변환이 비활성화됩니다.")
             logger.warning("설치: npm install -g @mermaid-js/mermaid-cli")
 
+        # 렌더링 결과가 버전에 따라 달라질 수 있으므로 캐시 키에 포함
+        self.mmdc_version = self._get_mmdc_version() if self.mmdc_path else ""
+
+        # 지원 버전이면 임시 파일 대신 stdin/stdout으로 주고받음
+        self.use_stdio = _parse_version(self.mmdc_version) >= _MMDC_STDIO_VERSION
+
+        # 이미지 캐시 디렉토리 생성
+        self._cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "mermaid_cache")
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+        # 상주 렌더링 서버 (선택, 첫 렌더링 때 시작)
+        self._server: Optional[_MermaidServer] = None
+        if use_server and self.mmdc_path:
+            node_path = shutil.which("node")
+            if node_path:
+                self._server = _MermaidServer(
+                    node_path, self.mmdc_path, self.theme, self.background, self.output_format
+                )
+            else:
+                logger.warning("node 명령어를 찾을 수 없어 렌더링 서버를 사용하지 않습니다.")
+
+    def _get_mmdc_version(self) -> str:
+        """
+        mmdc 버전 문자열 조회 (한 번만 실행)
+
+        Returns:
+            버전 문자열 (확인 실패 시 빈 문자열)
+        """
+        try:
+            result = subprocess.run(
+                [self.mmdc_path, '--version'],
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+                check=False
+            )
+            return result.stdout.strip()
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.warning(f"mmdc 버전 확인 실패: {e}")
+            return ""
+
+    def _cache_path(self, mermaid_code: str) -> str:
+        """
+        Mermaid 코드에 대응하는 이미지 캐시 파일 경로
+
+        Args:
+            mermaid_code: Mermaid 다이어그램 코드
+
+        Returns:
+            <cache_dir>/<sha256>.<svg|png> 경로 (출력 형식은 확장자로 구분)
+        """
+        key = hashlib.sha256(
+            f"{self.mmdc_version}|{self.theme}|{self.background}|{mermaid_code}".encode('utf-8')
+        ).hexdigest()
+        return os.path.join(self._cache_dir, f"{key}.{self.output_format}")
+
     def is_available(self) -> bool:
         """
         Mermaid CLI 사용 가능 여부 확인
@@ -51,7 +599,42 @@ class DiagramConverter:
 
     def convert_markdown(self, markdown_text: str) -> str:
         """
-        Markdown 내 모든 Mermaid 코드 블록을 PNG 이미지로 변환
+        Markdown 내 모든 Mermaid 코드 블록을 이미지(SVG/PNG)로 변환
+
+        Args:
+            markdown_text: Mermaid 코드 블록이 포함된 Markdown 텍스트
+
+        Returns:
+            Mermaid 블록이 이미지로 변환된 Markdown 텍스트
+        """
+        prepared = self._prepare(markdown_text)
+        if prepared is None:
+            return markdown_text
+
+        blocks, unique_codes, pending = prepared
+
+        # 1단계: 캐시에 없는 다이어그램이 여러 개면 mmdc 한 번으로 일괄 렌더링
+        if pending:
+            self._render_batch(pending)
+
+        # 2단계: 고유한 다이어그램별 이미지 조회 (일괄 렌더링 결과는 캐시 적중,
+        # 실패한 블록만 asyncio 서브프로세스로 동시에 개별 렌더링)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            images = asyncio.run(self._render_all_async(unique_codes))
+        else:
+            # 이미 이벤트 루프 안에서 호출되면 asyncio.run을 쓸 수 없으므로 스레드 풀 사용
+            max_workers = min(self.MAX_WORKERS, os.cpu_count() or 1, len(unique_codes))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                images = list(executor.map(self._generate_image, unique_codes))
+
+        # 3단계: 원본 순서대로 이미지 태그를 이어 붙임
+        return self._splice(markdown_text, blocks, dict(zip(unique_codes, images)))
+
+    async def convert_markdown_async(self, markdown_text: str) -> str:
+        """
+        convert_markdown의 비동기 버전 (이벤트 루프 안에서 호출)
 
         Args:
             markdown_text: Mermaid 코드 블록이 포함된 Markdown 텍스트
@@ -59,125 +642,306 @@ class DiagramConverter:
         Returns:
             Mermaid 블록이 이미지로 변환된 Markdown 텍스트
         """
+        prepared = self._prepare(markdown_text)
+        if prepared is None:
+            return markdown_text
+
+        blocks, unique_codes, pending = prepared
+        if pending:
+            await asyncio.to_thread(self._render_batch, pending)
+
+        images = await self._render_all_async(unique_codes)
+        return self._splice(markdown_text, blocks, dict(zip(unique_codes, images)))
+
+    def _prepare(self, markdown_text: str) -> Optional[Tuple[list, list, list]]:
+        """
+        변환할 Mermaid 블록 수집
+
+        Args:
+            markdown_text: Markdown 텍스트
+
+        Returns:
+            (블록 리스트, 고유한 다이어그램 코드, 일괄 렌더링할 코드) 또는 변환할 것이 없으면 None
+        """
+        # 대부분의 코드 리뷰 리포트에는 Mermaid 블록이 없으므로 먼저 확인
+        if _MERMAID_FENCE not in markdown_text:
+            return None
+
         if not self.is_available():
             # mmdc가 없으면 원본 반환
             logger.warning("mmdc를 사용할 수 없어 Mermaid 변환을 건너뜁니다.")
-            return markdown_text
+            return None
 
-        # Mermaid 코드 블록 패턴
-        # ```mermaid
-        # graph TD
-        #   A --> B
-        # ```
-        pattern = r'```mermaid\s*\n(.*?)\n```'
+        blocks = list(_iter_mermaid(markdown_text))
+        if not blocks:
+            return None
 
-        def replace_mermaid_block(match):
-            """각 Mermaid 블록을 이미지로 변환"""
-            mermaid_code = match.group(1)
+        unique_codes = list(dict.fromkeys(code for _, _, code in blocks))
 
-            try:
-                # PNG 이미지 생성
-                png_data = self._generate_png(mermaid_code)
-
-                if png_data:
-                    # Base64로 인코딩
-                    base64_img = base64.b64encode(png_data).decode('utf-8')
-
-                    # HTML 이미지 태그로 변환
-                    img_tag = f'<img src="data:image/png;base64,{base64_img}" alt="Mermaid Diagram" style="max-width: 100%; height: auto; background-color: white; padding: 10px; border-radius: 6px;" />'
-
-                    return img_tag
-                else:
-                    # 변환 실패 시 원본 코드 블록 유지 (폴백)
-                    logger.warning("Mermaid 블록 변환 실패, 원본 유지")
-                    return match.group(0)
-
-            except Exception as e:
-                logger.error(f"Mermaid 변환 중 오류 발생: {e}")
-                # 에러 발생 시 원본 유지
-                return match.group(0)
-
-        # 모든 Mermaid 블록 변환
-        converted_markdown = re.sub(
-            pattern,
-            replace_mermaid_block,
-            markdown_text,
-            flags=re.DOTALL
-        )
+        # 캐시에 없는 다이어그램이 여러 개면 일괄 렌더링 대상
+        # (Node + Chromium 시작 비용을 한 번만 지불, 결과는 디스크 캐시에 저장됨)
+        # 렌더링 서버를 쓰면 이미 시작 비용이 없으므로 생략
+        pending = []
+        if self._server is None:
+            pending = [code for code in unique_codes if not os.path.exists(self._cache_path(code))]
+            if len(pending) < 2:
+                pending = []
+
+        return blocks, unique_codes, pending
+
+    def _splice(self, markdown_text: str, blocks: list, image_by_code: dict) -> str:
+        """
+        원본 순서대로 Mermaid 블록을 이미지 태그로 바꿔 이어 붙임
+
+        Args:
+            markdown_text: 원본 Markdown 텍스트
+            blocks: (시작, 끝, 코드) 블록 리스트
+            image_by_code: 다이어그램 코드 → 이미지 데이터 (실패 시 None)
+
+        Returns:
+            변환된 Markdown 텍스트
+        """
+        parts = []
+        last_end = 0
+        for start, end, code in blocks:
+            parts.append(markdown_text[last_end:start])
+            parts.append(self._to_img_tag(image_by_code[code], markdown_text[start:end]))
+            last_end = end
+        parts.append(markdown_text[last_end:])
+
+        return "".join(parts)
+
+    async def _render_all_async(self, mermaid_codes: list[str]) -> list[Optional[bytes]]:
+        """
+        여러 다이어그램을 동시에 렌더링 (동시 실행 mmdc 수는 MAX_WORKERS로 제한)
+
+        Args:
+            mermaid_codes: Mermaid 다이어그램 코드 리스트
 
-        return converted_markdown
+        Returns:
+            코드 순서대로의 이미지 데이터 리스트 (실패 시 None)
+        """
+        semaphore = asyncio.Semaphore(self.MAX_WORKERS)
+
+        async def render(mermaid_code: str) -> Optional[bytes]:
+            async with semaphore:
+                return await self._generate_image_async(mermaid_code)
+
+        return await asyncio.gather(*(render(code) for code in mermaid_codes))
 
-    def _generate_png(self, mermaid_code: str) -> Optional[bytes]:
+    async def _generate_image_async(self, mermaid_code: str) -> Optional[bytes]:
         """
-        Mermaid 코드를 PNG 이미지로 변환
+        Mermaid 코드를 이미지로 변환 (asyncio 서브프로세스)
+
+        stdin/stdout 모드에서는 스레드 없이 mmdc 프로세스를 기다리고,
+        그 외(임시 파일 방식, 렌더링 서버)에는 _generate_image를 스레드에서 실행합니다.
 
         Args:
             mermaid_code: Mermaid 다이어그램 코드
 
         Returns:
-            PNG 이미지 바이트 데이터 (실패 시 None)
+            이미지 바이트 데이터 (실패 시 None)
         """
-        # 임시 디렉토리 생성
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_path = Path(tmpdir)
+        if self._server is not None or not self.use_stdio:
+            return await asyncio.to_thread(self._generate_image, mermaid_code)
 
-            # 임시 .mmd 파일 생성
-            mmd_file = tmp_path / "diagram.mmd"
-            png_file = tmp_path / "diagram.png"
+        cache_path = self._cache_path(mermaid_code)
+        if os.path.exists(cache_path):
+            return _read_file(cache_path)
 
+        cmd = _stdio_command(self.mmdc_path, self.theme, self.background, self.output_format)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
             try:
-                # Mermaid 코드를 파일로 저장
-                with open(mmd_file, 'w', encoding='utf-8') as f:
-                    f.write(mermaid_code)
-
-                # mmdc 명령어 실행
-                # -i: 입력 파일
-                # -o: 출력 파일
-                # -b: 배경색 (투명 또는 흰색)
-                # -t: 테마 (default, dark, forest, neutral)
-                cmd = [
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(mermaid_code.encode('utf-8')),
+                    timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                logger.error(f"mmdc 실행 타임아웃 ({self.timeout}초 초과)")
+                return None
+        except OSError as e:
+            logger.error(f"다이어그램 이미지 생성 중 오류: {e}")
+            return None
+
+        if process.returncode != 0:
+            logger.error(f"mmdc 실행 실패 (exit code {process.returncode})")
+            logger.error(f"stderr: {stderr.decode('utf-8', errors='replace')}")
+            return None
+
+        if not _is_image(stdout, self.output_format):
+            logger.warning(f"mmdc stdout 출력이 {self.output_format.upper()}가 아닙니다. 임시 파일 방식으로 재시도합니다.")
+            try:
+                stdout = await asyncio.to_thread(
+                    _run_mmdc_file,
+                    mermaid_code,
                     self.mmdc_path,
-                    '-i', str(mmd_file),
-                    '-o', str(png_file),
-                    '-b', 'white',        # 흰색 배경
-                    '-t', 'default',      # 기본 테마
-                    '--quiet'             # 조용한 모드
-                ]
-
-                # subprocess로 실행 (타임아웃 설정)
+                    self.timeout,
+                    self.theme,
+                    self.background,
+                    self.output_format
+                )
+            except MermaidRenderError:
+                return None
+
+        logger.info(f"Mermaid 다이어그램 변환 성공 ({len(stdout)} bytes, {self.output_format})")
+        _store_cache(stdout, cache_path)
+        return stdout
+
+    def _render_batch(self, mermaid_codes: list[str]) -> int:
+        """
+        mmdc Markdown 입력 모드로 여러 다이어그램을 한 번에 렌더링
+
+        mmdc는 .md 입력의 Mermaid 블록을 순서대로 <출력 이름>-N.<svg|png>로 렌더링합니다.
+        생성된 이미지는 디스크 캐시에 저장되며, 이 모드를 지원하지 않는 mmdc이거나
+        일부 블록이 실패하면 해당 블록은 이후 개별 렌더링으로 처리됩니다.
+
+        Args:
+            mermaid_codes: 렌더링할 Mermaid 다이어그램 코드 리스트
+
+        Returns:
+            캐시에 저장된 다이어그램 수
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_file = os.path.join(tmpdir, _BATCH_INPUT_NAME)
+            output_file = os.path.join(tmpdir, _BATCH_OUTPUT_NAME)
+
+            with open(input_file, 'w', encoding='utf-8') as f:
+                f.write("\n\n".join(f"```mermaid\n{code}\n```" for code in mermaid_codes))
+
+            cmd = [
+                self.mmdc_path,
+                '-i', input_file,
+                '-o', output_file,
+                '-e', self.output_format,
+                '-b', self.background,
+                '-t', self.theme,
+                '--quiet'
+            ]
+
+            try:
                 result = subprocess.run(
                     cmd,
                     capture_output=True,
                     text=True,
-                    timeout=self.timeout,
-                    check=False  # 에러 발생 시 예외 발생하지 않음
+                    timeout=self.timeout * len(mermaid_codes),
+                    check=False
                 )
+            except (subprocess.TimeoutExpired, OSError) as e:
+                logger.warning(f"mmdc 일괄 렌더링 실패, 개별 렌더링으로 전환: {e}")
+                return 0
 
-                # 실행 결과 확인
-                if result.returncode != 0:
-                    logger.error(f"mmdc 실행 실패 (exit code {result.returncode})")
-                    logger.error(f"stderr: {result.stderr}")
-                    return None
+            if result.returncode != 0:
+                logger.warning(f"mmdc 일괄 렌더링 실패 (exit code {result.returncode}), 개별 렌더링으로 전환")
+                return 0
 
-                # PNG 파일 존재 확인
-                if not png_file.exists():
-                    logger.error("PNG 파일이 생성되지 않았습니다.")
-                    return None
+            stored = 0
+            for index, code in enumerate(mermaid_codes, start=1):
+                image_file = os.path.join(tmpdir, f"out-{index}.{self.output_format}")
+                if os.path.exists(image_file):
+                    _store_cache(_read_file(image_file), self._cache_path(code))
+                    stored += 1
 
-                # PNG 파일 읽기
-                with open(png_file, 'rb') as f:
-                    png_data = f.read()
+        logger.info(f"Mermaid 다이어그램 일괄 변환: {stored}/{len(mermaid_codes)}개")
+        return stored
 
-                logger.info(f"Mermaid 다이어그램 변환 성공 ({len(png_data)} bytes)")
-                return png_data
+    def _to_img_tag(self, image_data: Optional[bytes], original_block: str) -> str:
+        """
+        이미지 데이터를 Base64 이미지 태그로 변환
 
-            except subprocess.TimeoutExpired:
-                logger.error(f"mmdc 실행 타임아웃 ({self.timeout}초 초과)")
-                return None
+        SVG도 인라인 <svg> 대신 data URI로 넣어 다이어그램별 스타일/ID가 충돌하지 않게 합니다.
 
-            except Exception as e:
-                logger.error(f"PNG 생성 중 오류: {e}")
-                return None
+        Args:
+            image_data: 이미지 바이트 데이터 (변환 실패 시 None)
+            original_block: 원본 Mermaid 코드 블록 (폴백용)
+
+        Returns:
+            HTML 이미지 태그 (실패 시 원본 코드 블록)
+        """
+        if not image_data:
+            # 변환 실패 시 원본 코드 블록 유지 (폴백)
+            logger.warning("Mermaid 블록 변환 실패, 원본 유지")
+            return original_block
+
+        # Base64로 인코딩하여 HTML 이미지 태그로 변환
+        return _IMG_TAG_TEMPLATE.format(
+            mime=_MIME_TYPES[self.output_format],
+            data=base64.b64encode(image_data).decode('ascii')
+        )
+
+    def _generate_image(self, mermaid_code: str) -> Optional[bytes]:
+        """
+        Mermaid 코드를 이미지(SVG/PNG)로 변환
+
+        같은 프로세스에서 이미 변환한 다이어그램은 메모리(LRU)에서,
+        이전 실행에서 변환한 다이어그램은 디스크 캐시에서 가져옵니다.
+        렌더링 서버를 사용하는 경우 서버에 오류가 나면 mmdc 실행으로 전환합니다.
+
+        Args:
+            mermaid_code: Mermaid 다이어그램 코드
+
+        Returns:
+            이미지 바이트 데이터 (실패 시 None)
+        """
+        cache_path = self._cache_path(mermaid_code)
+        try:
+            if self._server is not None:
+                try:
+                    return self._render_with_server(cache_path, mermaid_code)
+                except OSError as e:
+                    logger.warning(f"Mermaid 렌더링 서버 오류, mmdc로 전환: {e}")
+
+            return _render_image_cached(
+                cache_path,
+                mermaid_code,
+                self.mmdc_path,
+                self.timeout,
+                self.theme,
+                self.background,
+                self.output_format,
+                self.use_stdio
+            )
+        except MermaidRenderError:
+            return None
+        except Exception as e:
+            logger.error(f"Mermaid 변환 중 오류 발생: {e}")
+            return None
+
+    def _render_with_server(self, cache_path: str, mermaid_code: str) -> bytes:
+        """
+        상주 렌더링 서버로 이미지 생성 (디스크 캐시 사용)
+
+        Args:
+            cache_path: 디스크 캐시 파일 경로
+            mermaid_code: Mermaid 다이어그램 코드
+
+        Returns:
+            이미지 바이트 데이터
+
+        Raises:
+            MermaidRenderError: 다이어그램 렌더링 실패
+            OSError: 서버 시작/통신 실패
+        """
+        if os.path.exists(cache_path):
+            return _read_file(cache_path)
+
+        image_data = self._server.render(mermaid_code, self.timeout)
+        logger.info(f"Mermaid 다이어그램 변환 성공 ({len(image_data)} bytes, 렌더링 서버)")
+
+        _store_cache(image_data, cache_path)
+        return image_data
+
+    def close(self) -> None:
+        """렌더링 서버 종료 (사용하지 않으면 아무 작업도 하지 않음)"""
+        if self._server is not None:
+            self._server.close()
 
     def extract_mermaid_blocks(self, markdown_text: str) -> list[str]:
         """
@@ -189,9 +953,9 @@ class DiagramConverter:
         Returns:
             Mermaid 코드 블록 리스트
         """
-        pattern = r'```mermaid\s*\n(.*?)\n```'
-        matches = re.findall(pattern, markdown_text, flags=re.DOTALL)
-        return matches
+        if _MERMAID_FENCE not in markdown_text:
+            return []
+        return [code for _, _, code in _iter_mermaid(markdown_text)]
 
 
 # 사용 예제
@@ -233,7 +997,7 @@ graph LR
 """
 
     print("=" * 80)
-    print("Mermaid → PNG 변환 테스트")
+    print("Mermaid → 이미지 변환 테스트")
     print("=" * 80)
 
     # DiagramConverter 생성
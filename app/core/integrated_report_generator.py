@@ -6,20 +6,100 @@
 """
 
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
+import io
+import math
+import os
 import re
+from html import escape
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import matplotlib
     matplotlib.use('Agg')  # GUI 없이 사용
-    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
 
 
+# 차트 색상 팔레트
+CHART_COLORS = [
+    '#ff6b6b',  # 빨강
+    '#feca57',  # 노랑
+    '#48dbfb',  # 파랑
+    '#1dd1a1',  # 초록
+    '#ee5a6f',  # 분홍
+    '#c56cf0',  # 보라
+    '#f368e0',  # 핑크
+    '#ff9f43'   # 주황
+]
+
+# 차트 렌더링 작업 프로세스에서 재사용하는 Figure/Axes
+_worker_figure = None
+
+
+def _draw_pie_png(fig, ax, labels, sizes, colors, title, output_path) -> None:
+    """주어진 Figure/Axes에 원형 차트를 그려 PNG로 저장"""
+    ax.pie(
+        sizes,
+        labels=labels,
+        colors=colors,
+        autopct='%1.1f%%',
+        startangle=90,
+        textprops={'fontsize': 11, 'weight': 'bold'}
+    )
+    ax.axis('equal')
+    ax.set_title(
+        title,
+        fontsize=14,
+        weight='bold',
+        pad=20
+    )
+
+    # 저장
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+
+
+def _render_chart_worker(labels, sizes, colors, title, output_path) -> bool:
+    """
+    작업 프로세스용 원형 차트 렌더링 (ProcessPoolExecutor에서 pickle 가능하도록 모듈 수준)
+
+    Returns:
+        성공 여부
+    """
+    global _worker_figure
+
+    try:
+        if _worker_figure is None:
+            fig = Figure(figsize=(10, 7))
+            _worker_figure = (fig, fig.add_subplot())
+        else:
+            _worker_figure[1].clear()
+
+        _draw_pie_png(*_worker_figure, labels, sizes, colors, title, output_path)
+        return True
+    except Exception as e:
+        print(f"차트 생성 실패: {e}")
+        return False
+
+
+# 개별 리포트의 Before/After 섹션 제목
+_BEFORE_HEADER = "### Before (원본 코드)"
+_AFTER_HEADER = "### After (개선된 코드)"
+
+# Before/After 코드 블록을 한 번의 스캔으로 함께 추출하는 패턴
+_BEFORE_AFTER_RE = re.compile(
+    r'### Before \(원본 코드\)\s*```csharp\s*(.*?)\s*```'
+    r'.*?'
+    r'### After \(개선된 코드\)\s*```csharp\s*(.*?)\s*```',
+    re.DOTALL
+)
+
+
 @dataclass
 class CategoryStatistics:
     """카테고리별 통계"""
@@ -61,6 +141,15 @@ class IntegratedReportGenerator:
         'hardcoding_to_config': '하드코딩 → Config 파일'
     }
 
+    # 한글 이름 → 카테고리 ID 역매핑
+    _NAME_TO_ID = {name: category_id for category_id, name in CATEGORY_NAMES.items()}
+
+    # 리포트의 카테고리 표기("**Null 참조 체크**")를 한 번의 스캔으로 찾는 패턴과 역매핑
+    _CATEGORY_TOKEN_RE = re.compile(
+        "|".join(re.escape(f"**{name}**") for name in CATEGORY_NAMES.values())
+    )
+    _TOKEN_TO_ID = {f"**{name}**": category_id for category_id, name in CATEGORY_NAMES.items()}
+
     # 우선순위 가중치 (높을수록 중요)
     CATEGORY_PRIORITY = {
         'security': 10,              # 보안 최우선
@@ -75,7 +164,9 @@ class IntegratedReportGenerator:
 
     def __init__(self):
         """통합 리포트 생성기 초기화"""
-        pass
+        # 차트용 Figure/Axes (첫 generate_chart 호출 때 생성 후 재사용)
+        self._fig = None
+        self._ax = None
 
     def generate_integrated_report(
         self,
@@ -137,13 +228,15 @@ class IntegratedReportGenerator:
             if not result.success or not result.report_markdown:
                 continue
 
-            # 리포트 마크다운에서 카테고리 감지
-            for category_id, category_name in self.CATEGORY_NAMES.items():
-                # "✅ **Null 참조 체크**" 같은 패턴 찾기
-                if f"**{category_name}**" in result.report_markdown:
-                    # 실제로 개선 사항이 있는지 확인 (간단한 휴리스틱)
-                    if self._has_improvements(result.report_markdown, category_name):
-                        category_issues[category_id].append(result.file_name)
+            # 리포트 마크다운에서 "✅ **Null 참조 체크**" 같은 카테고리 표기를 한 번에 감지
+            hits = set(self._CATEGORY_TOKEN_RE.findall(result.report_markdown))
+
+            # 실제로 개선 사항이 있는지 확인 (간단한 휴리스틱, 리포트당 한 번)
+            if not hits or not self._has_improvements(result.report_markdown):
+                continue
+
+            for token in hits:
+                category_issues[self._TOKEN_TO_ID[token]].append(result.file_name)
 
         # 통계 생성
         stats = []
@@ -165,35 +258,16 @@ class IntegratedReportGenerator:
 
         return stats
 
-    def _has_improvements(self, report_markdown: str, category_name: str) -> bool:
-        """리포트에 실제 개선 사항이 있는지 확인 (휴리스틱)"""
+    def _has_improvements(self, report_markdown: str) -> bool:
+        """리포트에 실제 개선 사항이 있는지 확인 (휴리스틱, 카테고리와 무관하게 리포트 단위)"""
         # Before/After 코드 차이가 있으면 개선 사항이 있는 것으로 판단
-        before_section = "### Before (원본 코드)" in report_markdown
-        after_section = "### After (개선된 코드)" in report_markdown
-
-        if not (before_section and after_section):
-            return False
+        match = _BEFORE_AFTER_RE.search(report_markdown)
+        if match:
+            # 코드가 다르면 개선 사항 있음
+            return match.group(1) != match.group(2)
 
-        # Before와 After 코드 추출
-        try:
-            before_code = re.search(
-                r'### Before \(원본 코드\)\s*```csharp\s*(.*?)\s*```',
-                report_markdown,
-                re.DOTALL
-            )
-            after_code = re.search(
-                r'### After \(개선된 코드\)\s*```csharp\s*(.*?)\s*```',
-                report_markdown,
-                re.DOTALL
-            )
-
-            if before_code and after_code:
-                # 코드가 다르면 개선 사항 있음
-                return before_code.group(1) != after_code.group(1)
-        except:
-            pass
-
-        return True  # 안전하게 True 반환
+        # 코드 블록을 추출하지 못한 경우: 두 섹션이 모두 있으면 안전하게 True 반환
+        return _BEFORE_HEADER in report_markdown and _AFTER_HEADER in report_markdown
 
     def _generate_priority_recommendations(
         self,
@@ -207,11 +281,7 @@ class IntegratedReportGenerator:
         for stat in category_stats:
             if stat.issue_count > 0:
                 # 카테고리 ID 찾기
-                category_id = None
-                for cid, cname in self.CATEGORY_NAMES.items():
-                    if cname == stat.category_name:
-                        category_id = cid
-                        break
+                category_id = self._NAME_TO_ID.get(stat.category_name)
 
                 if category_id:
                     priority = self.CATEGORY_PRIORITY.get(category_id, 1)
@@ -240,98 +310,74 @@ class IntegratedReportGenerator:
 
     def _generate_markdown(self, data: IntegratedReportData) -> str:
         """Markdown 형식의 통합 리포트 생성"""
-        lines = []
+        buffer = io.StringIO()
+        write = buffer.write
 
         # 헤더
-        lines.append("# 📊 C# 프로젝트 코드 리뷰 통합 리포트")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+        write("# 📊 C# 프로젝트 코드 리뷰 통합 리포트\n\n---\n\n")
 
         # 프로젝트 정보
-        lines.append("## 📁 프로젝트 정보")
-        lines.append("")
-        lines.append(f"- **프로젝트명**: {data.project_name}")
-        lines.append(f"- **분석 일시**: {data.analysis_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"- **전체 파일**: {data.total_files}개")
-        lines.append(f"- **분석 성공**: {data.success_files}개 ✅")
+        write("## 📁 프로젝트 정보\n\n")
+        write(f"- **프로젝트명**: {data.project_name}\n")
+        write(f"- **분석 일시**: {data.analysis_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        write(f"- **전체 파일**: {data.total_files}개\n")
+        write(f"- **분석 성공**: {data.success_files}개 ✅\n")
         if data.failure_files > 0:
-            lines.append(f"- **분석 실패**: {data.failure_files}개 ❌")
-        lines.append(f"- **소요 시간**: {self._format_time(data.total_time)}")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+            write(f"- **분석 실패**: {data.failure_files}개 ❌\n")
+        write(f"- **소요 시간**: {self._format_time(data.total_time)}\n\n---\n\n")
 
         # 카테고리별 이슈 통계
-        lines.append("## 📈 카테고리별 이슈 통계")
-        lines.append("")
+        write("## 📈 카테고리별 이슈 통계\n\n")
 
-        if any(stat.issue_count > 0 for stat in data.category_stats):
+        issue_stats = [stat for stat in data.category_stats if stat.issue_count > 0]
+        if issue_stats:
             # 테이블 형식
-            lines.append("| 카테고리 | 이슈 파일 수 | 비율 |")
-            lines.append("|---------|-------------|------|")
-
-            for stat in data.category_stats:
-                if stat.issue_count > 0:
-                    bar = self._generate_bar(stat.percentage)
-                    lines.append(
-                        f"| {stat.category_name} | {stat.issue_count}개 | "
-                        f"{stat.percentage:.1f}% {bar} |"
-                    )
-
-            lines.append("")
+            write("| 카테고리 | 이슈 파일 수 | 비율 |\n|---------|-------------|------|\n")
+            for stat in issue_stats:
+                bar = self._generate_bar(stat.percentage)
+                write(
+                    f"| {stat.category_name} | {stat.issue_count}개 | "
+                    f"{stat.percentage:.1f}% {bar} |\n"
+                )
 
             # 상세 파일 목록
-            lines.append("### 🔍 카테고리별 상세")
-            lines.append("")
+            write("\n### 🔍 카테고리별 상세\n\n")
 
-            for stat in data.category_stats:
-                if stat.issue_count > 0:
-                    lines.append(f"#### {stat.category_name}")
-                    lines.append("")
-                    lines.append(f"총 {stat.issue_count}개 파일에서 발견:")
-                    lines.append("")
+            for stat in issue_stats:
+                write(f"#### {stat.category_name}\n\n총 {stat.issue_count}개 파일에서 발견:\n\n")
 
-                    for file_name in stat.files_with_issues:
-                        lines.append(f"- `{file_name}`")
+                for file_name in stat.files_with_issues:
+                    write(f"- `{file_name}`\n")
 
-                    if stat.issue_count > len(stat.files_with_issues):
-                        remaining = stat.issue_count - len(stat.files_with_issues)
-                        lines.append(f"- ... (외 {remaining}개 파일)")
+                if stat.issue_count > len(stat.files_with_issues):
+                    remaining = stat.issue_count - len(stat.files_with_issues)
+                    write(f"- ... (외 {remaining}개 파일)\n")
 
-                    lines.append("")
+                write("\n")
         else:
-            lines.append("✅ **모든 카테고리에서 이슈가 발견되지 않았습니다!**")
-            lines.append("")
+            write("✅ **모든 카테고리에서 이슈가 발견되지 않았습니다!**\n\n")
 
-        lines.append("---")
-        lines.append("")
+        write("---\n\n")
 
         # 개선 우선순위 권장
-        lines.append("## 🎯 개선 우선순위 권장")
-        lines.append("")
-        lines.append("다음 순서로 개선하는 것을 권장합니다:")
-        lines.append("")
+        write("## 🎯 개선 우선순위 권장\n\n다음 순서로 개선하는 것을 권장합니다:\n\n")
 
         for recommendation in data.priority_recommendations:
-            lines.append(recommendation)
+            write(f"{recommendation}\n")
 
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+        write("\n---\n\n")
 
         # 푸터
-        lines.append("## 📝 참고사항")
-        lines.append("")
-        lines.append("- 이 리포트는 AI 기반 정적 분석 결과입니다")
-        lines.append("- 실제 코드 동작과 다를 수 있으니 개발자의 검토가 필요합니다")
-        lines.append("- 각 파일의 상세 리포트는 개별적으로 저장되어 있습니다")
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-        lines.append(f"*생성 일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
-
-        return "\n".join(lines)
+        write(
+            "## 📝 참고사항\n\n"
+            "- 이 리포트는 AI 기반 정적 분석 결과입니다\n"
+            "- 실제 코드 동작과 다를 수 있으니 개발자의 검토가 필요합니다\n"
+            "- 각 파일의 상세 리포트는 개별적으로 저장되어 있습니다\n"
+            "\n---\n\n"
+        )
+        write(f"*생성 일시: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*")
+
+        return buffer.getvalue()
 
     def _generate_bar(self, percentage: float) -> str:
         """퍼센티지 바 생성"""
@@ -358,64 +404,184 @@ class IntegratedReportGenerator:
         """
         카테고리별 이슈 분포 차트 생성 (원형 차트)
 
+        출력 경로가 .svg이면 matplotlib 없이 SVG 텍스트를 직접 생성하고,
+        그 외(PNG 등)에는 matplotlib으로 렌더링합니다.
+
         Args:
             data: 통합 리포트 데이터
-            output_path: 출력 파일 경로 (PNG)
+            output_path: 출력 파일 경로 (SVG 또는 PNG)
 
         Returns:
             성공 여부
         """
-        if not MATPLOTLIB_AVAILABLE:
+        is_svg = output_path.lower().endswith('.svg')
+        if not is_svg and not MATPLOTLIB_AVAILABLE:
             return False
 
         try:
-            # 이슈가 있는 카테고리만 필터링
-            categories = [stat for stat in data.category_stats if stat.issue_count > 0]
-
-            if not categories:
+            chart_args = self._chart_args(data)
+            if chart_args is None:
                 return False
 
-            # 데이터 준비
-            labels = [stat.category_name for stat in categories]
-            sizes = [stat.issue_count for stat in categories]
-
-            # 색상 팔레트
-            colors = [
-                '#ff6b6b',  # 빨강
-                '#feca57',  # 노랑
-                '#48dbfb',  # 파랑
-                '#1dd1a1',  # 초록
-                '#ee5a6f',  # 분홍
-                '#c56cf0',  # 보라
-                '#f368e0',  # 핑크
-                '#ff9f43'   # 주황
-            ]
-
-            # 차트 생성
-            plt.figure(figsize=(10, 7))
-            plt.pie(
-                sizes,
-                labels=labels,
-                colors=colors[:len(labels)],
-                autopct='%1.1f%%',
-                startangle=90,
-                textprops={'fontsize': 11, 'weight': 'bold'}
-            )
-            plt.axis('equal')
-            plt.title(
-                f'{data.project_name}\n카테고리별 이슈 분포',
-                fontsize=14,
-                weight='bold',
-                pad=20
-            )
+            labels, sizes, colors, title = chart_args
+
+            if is_svg:
+                svg = self._generate_pie_svg(labels, sizes, colors, title)
+                Path(output_path).write_text(svg, encoding='utf-8')
+                return True
 
-            # 저장
-            plt.tight_layout()
-            plt.savefig(output_path, dpi=150, bbox_inches='tight')
-            plt.close()
+            # 차트 생성 (pyplot 전역 상태 없이 인스턴스의 Figure를 재사용)
+            if self._fig is None:
+                self._fig = Figure(figsize=(10, 7))
+                self._ax = self._fig.add_subplot()
+            else:
+                self._ax.clear()
 
+            _draw_pie_png(self._fig, self._ax, labels, sizes, colors, title, output_path)
             return True
 
         except Exception as e:
             print(f"차트 생성 실패: {e}")
             return False
+
+    def generate_charts_batch(
+        self,
+        jobs: List[Tuple[IntegratedReportData, str]],
+        max_workers: Optional[int] = None
+    ) -> List[bool]:
+        """
+        여러 프로젝트의 차트를 한 번에 생성
+
+        PNG 렌더링은 CPU를 많이 쓰므로 2개 이상이면 프로세스 풀에서 병렬로 처리하고,
+        SVG는 현재 프로세스에서 바로 생성합니다.
+
+        Args:
+            jobs: (통합 리포트 데이터, 출력 파일 경로) 리스트
+            max_workers: 최대 작업 프로세스 수 (기본값: CPU 코어 수)
+
+        Returns:
+            작업 순서대로의 성공 여부 리스트
+        """
+        results = [False] * len(jobs)
+        png_jobs = []
+
+        for index, (data, output_path) in enumerate(jobs):
+            if output_path.lower().endswith('.svg') or not MATPLOTLIB_AVAILABLE:
+                results[index] = self.generate_chart(data, output_path)
+                continue
+
+            chart_args = self._chart_args(data)
+            if chart_args is not None:
+                png_jobs.append((index, (*chart_args, output_path)))
+
+        if len(png_jobs) == 1:
+            # 하나뿐이면 프로세스 시작 비용 없이 현재 프로세스에서 렌더링
+            index = png_jobs[0][0]
+            results[index] = self.generate_chart(*jobs[index])
+        elif png_jobs:
+            indices = [index for index, _ in png_jobs]
+            with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+                rendered = executor.map(_render_chart_worker, *zip(*(args for _, args in png_jobs)))
+                for index, success in zip(indices, rendered):
+                    results[index] = success
+
+        return results
+
+    def _chart_args(
+        self,
+        data: IntegratedReportData
+    ) -> Optional[Tuple[List[str], List[int], List[str], str]]:
+        """
+        차트 입력 데이터 준비 (이슈가 있는 카테고리만)
+
+        Returns:
+            (라벨, 크기, 색상, 제목) 또는 이슈가 없으면 None
+        """
+        # 이슈가 있는 카테고리만 필터링
+        categories = [stat for stat in data.category_stats if stat.issue_count > 0]
+
+        if not categories:
+            return None
+
+        # 데이터 준비
+        labels = [stat.category_name for stat in categories]
+        sizes = [stat.issue_count for stat in categories]
+        colors = CHART_COLORS[:len(labels)]
+        title = f'{data.project_name}\n카테고리별 이슈 분포'
+
+        return labels, sizes, colors, title
+
+    def _generate_pie_svg(
+        self,
+        labels: List[str],
+        sizes: List[int],
+        colors: List[str],
+        title: str
+    ) -> str:
+        """
+        원형 차트 SVG 생성 (matplotlib 없이 부채꼴 경로를 직접 계산)
+
+        matplotlib 차트와 같이 12시 방향에서 시작해 반시계 방향으로 그립니다.
+
+        Args:
+            labels: 카테고리 이름
+            sizes: 카테고리별 이슈 개수
+            colors: 조각 색상
+            title: 차트 제목 (줄바꿈 가능)
+
+        Returns:
+            SVG 문서 문자열
+        """
+        width, height = 640, 520
+        cx, cy, radius = 320, 290, 170
+        total = sum(sizes)
+
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}" font-family="Malgun Gothic, Apple SD Gothic Neo, sans-serif">',
+            f'<rect width="{width}" height="{height}" fill="white"/>',
+        ]
+
+        # 제목
+        for i, line in enumerate(title.split('\n')):
+            parts.append(
+                f'<text x="{cx}" y="{34 + i * 22}" text-anchor="middle" font-size="18" '
+                f'font-weight="bold">{escape(line)}</text>'
+            )
+
+        start = math.pi / 2
+        for label, size, color in zip(labels, sizes, colors):
+            fraction = size / total
+            end = start + fraction * 2 * math.pi
+
+            # 부채꼴 (SVG는 y축이 아래 방향이므로 sin 부호를 뒤집음)
+            if fraction >= 1:
+                parts.append(f'<circle cx="{cx}" cy="{cy}" r="{radius}" fill="{color}"/>')
+            else:
+                x1, y1 = cx + radius * math.cos(start), cy - radius * math.sin(start)
+                x2, y2 = cx + radius * math.cos(end), cy - radius * math.sin(end)
+                large_arc = 1 if fraction > 0.5 else 0
+                parts.append(
+                    f'<path d="M {cx} {cy} L {x1:.2f} {y1:.2f} '
+                    f'A {radius} {radius} 0 {large_arc} 0 {x2:.2f} {y2:.2f} Z" fill="{color}"/>'
+                )
+
+            # 비율 (조각 안쪽)과 카테고리 이름 (바깥쪽)
+            middle = (start + end) / 2
+            cos_m, sin_m = math.cos(middle), math.sin(middle)
+            parts.append(
+                f'<text x="{cx + radius * 0.6 * cos_m:.2f}" y="{cy - radius * 0.6 * sin_m:.2f}" '
+                f'text-anchor="middle" dominant-baseline="middle" font-size="13" '
+                f'font-weight="bold">{fraction * 100:.1f}%</text>'
+            )
+            anchor = 'start' if cos_m >= 0 else 'end'
+            parts.append(
+                f'<text x="{cx + radius * 1.1 * cos_m:.2f}" y="{cy - radius * 1.1 * sin_m:.2f}" '
+                f'text-anchor="{anchor}" dominant-baseline="middle" font-size="13" '
+                f'font-weight="bold">{escape(label)}</text>'
+            )
+
+            start = end
+
+        parts.append('</svg>')
+        return "\n".join(parts)
@@ -0,0 +1,284 @@
+"""
+LLM 응답 캐시
+
+동일한 프롬프트에 대한 LLM 응답을 SQLite에 저장하여 재사용합니다.
+zstandard가 설치되어 있으면 응답을 zstd로 압축해 저장합니다.
+프롬프트 템플릿을 반복 수정하면서 같은 파일을 다시 분석할 때 API 비용과 대기 시간을 없앱니다.
+선택적으로 임베딩 유사도 기반의 SemanticCache로 거의 동일한 프롬프트까지 재사용할 수 있습니다.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# zstandard는 선택적 의존성 (없으면 압축 없이 저장)
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+    _compressor = zstandard.ZstdCompressor(level=3)
+    _decompressor = zstandard.ZstdDecompressor()
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# 저장 형식 버전 (BLOB 첫 바이트). 이전 버전의 TEXT 행은 그대로 읽음
+_FORMAT_RAW = b'\x00'
+_FORMAT_ZSTD = b'\x01'
+
+# sentence-transformers / faiss는 선택적 의존성 (SemanticCache 전용)
+try:
+    import faiss
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+
+def _encode(response: str) -> bytes:
+    """응답을 버전 바이트가 붙은 BLOB으로 변환 (가능하면 zstd 압축)"""
+    data = response.encode('utf-8')
+    if ZSTD_AVAILABLE:
+        return _FORMAT_ZSTD + _compressor.compress(data)
+    return _FORMAT_RAW + data
+
+
+def _decode(value) -> Optional[str]:
+    """저장된 값을 응답 문자열로 복원 (읽을 수 없는 형식이면 None)"""
+    if isinstance(value, str):
+        return value  # 압축 도입 전 TEXT 행
+
+    version, payload = value[:1], value[1:]
+    if version == _FORMAT_RAW:
+        return payload.decode('utf-8')
+    if version == _FORMAT_ZSTD and ZSTD_AVAILABLE:
+        return _decompressor.decompress(payload).decode('utf-8')
+    return None
+
+
+class LLMCache:
+    """
+    SQLite 기반 LLM 응답 캐시
+
+    키는 호출하는 쪽에서 계산한 해시 문자열(예: SHA256)이며,
+    여러 스레드에서 동시에 사용할 수 있도록 연결을 잠금으로 보호합니다.
+    """
+
+    def __init__(self, db_path: str = "cache/llm_cache.db"):
+        """
+        캐시 초기화
+
+        Args:
+            db_path: 캐시 DB 파일 경로 (기본: cache/llm_cache.db)
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        # 캐시 디렉토리 생성
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT NOT NULL,
+                created_at INTEGER NOT NULL,
+                expires_at INTEGER
+            )
+        ''')
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        캐시된 응답 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            Optional[str]: 캐시된 응답 (없거나 만료되었으면 None)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, expires_at FROM llm_cache WHERE key = ?',
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+
+        return _decode(value)
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        model: str = "",
+        ttl: Optional[int] = None
+    ) -> None:
+        """
+        응답 저장
+
+        Args:
+            key: 캐시 키
+            response: 저장할 응답
+            model: 응답을 생성한 모델 이름
+            ttl: 유효 기간 (초 단위, None이면 만료 없음)
+        """
+        now = int(time.time())
+        expires_at = now + ttl if ttl else None
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, expires_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, model, _encode(response), now, expires_at)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """모든 캐시 항목 삭제"""
+        with self._lock:
+            self._conn.execute('DELETE FROM llm_cache')
+            self._conn.commit()
+
+    def close(self) -> None:
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+
+class SemanticCache:
+    """
+    임베딩 유사도 기반 LLM 응답 캐시 (메모리)
+
+    텍스트를 정규화된 임베딩으로 변환해 범위(scope)별 FAISS 내적 인덱스에 저장하고,
+    같은 범위 안에서 코사인 유사도가 임계값 이상인 기존 항목의 응답을 재사용합니다.
+    범위는 응답을 좌우하지만 임베딩에 담기지 않는 설정(모델, 시스템 프롬프트, 템플릿 등)을
+    구분하는 문자열이며, 다른 범위의 항목과는 비교하지 않습니다.
+    임계값 바로 아래(회색 구간)의 후보는 verifier 콜백이 있으면 그 판단에 맡깁니다.
+    """
+
+    DEFAULT_MODEL = 'all-MiniLM-L6-v2'
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        threshold: float = 0.92,
+        gray_zone: float = 0.05,
+        verifier: Optional[Callable[[str, str, float], bool]] = None
+    ):
+        """
+        시맨틱 캐시 초기화
+
+        Args:
+            model_name: sentence-transformers 임베딩 모델 이름
+            threshold: 캐시 적중으로 판단할 코사인 유사도 (기본: 0.92)
+            gray_zone: threshold 아래로 verifier에 확인을 요청할 유사도 폭 (기본: 0.05)
+            verifier: (새 텍스트, 캐시된 텍스트, 유사도) -> 재사용 여부 콜백
+
+        Raises:
+            ImportError: sentence-transformers 또는 faiss가 설치되지 않은 경우
+        """
+        if not SEMANTIC_CACHE_AVAILABLE:
+            raise ImportError(
+                "SemanticCache requires sentence-transformers and faiss. "
+                "Run: pip install sentence-transformers faiss-cpu"
+            )
+
+        self.threshold = threshold
+        self.gray_zone = gray_zone
+        self.verifier = verifier
+        self._lock = threading.Lock()
+
+        self._model = SentenceTransformer(model_name)
+        self._dimension = self._model.get_sentence_embedding_dimension()
+        # 범위 -> (인덱스, 텍스트 리스트, 응답 리스트)
+        self._scopes: Dict[str, Tuple[Any, List[str], List[str]]] = {}
+
+    def embed(self, text: str) -> Any:
+        """
+        텍스트 임베딩 계산
+
+        임베딩 모델은 앞부분(약 256토큰)만 보므로 공통 지시문이 아닌
+        항목마다 다른 부분(예: 분석할 코드)을 넘겨야 합니다.
+
+        Args:
+            text: 임베딩할 텍스트
+
+        Returns:
+            정규화된 임베딩 (1 x dim float32 배열)
+        """
+        return self._model.encode([text], normalize_embeddings=True).astype('float32')
+
+    def search(self, text: str, scope: str = "") -> Tuple[Optional[str], Any]:
+        """
+        같은 범위에서 유사한 텍스트의 캐시된 응답 조회
+
+        Args:
+            text: 임베딩할 텍스트
+            scope: 비교 대상을 제한하는 범위 키
+
+        Returns:
+            Tuple[Optional[str], Any]: (캐시된 응답 또는 None, 텍스트 임베딩)
+            임베딩은 미스 후 add()에 그대로 넘겨 재계산을 피합니다.
+        """
+        vector = self.embed(text)
+
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None or entry[0].ntotal == 0:
+                return None, vector
+
+            index, texts, responses = entry
+            scores, ids = index.search(vector, 1)
+            score, idx = float(scores[0, 0]), int(ids[0, 0])
+            cached_text = texts[idx]
+            cached_response = responses[idx]
+
+        if score >= self.threshold:
+            return cached_response, vector
+
+        # 회색 구간: 외부 검증(예: 저렴한 LLM 판정)이 허용할 때만 재사용
+        if (
+            self.verifier is not None
+            and score >= self.threshold - self.gray_zone
+            and self.verifier(text, cached_text, score)
+        ):
+            return cached_response, vector
+
+        return None, vector
+
+    def add(self, text: str, response: str, vector: Any = None, scope: str = "") -> None:
+        """
+        텍스트와 응답 저장
+
+        Args:
+            text: 임베딩한 텍스트
+            response: 응답
+            vector: search()에서 받은 임베딩 (None이면 새로 계산)
+            scope: 저장할 범위 키
+        """
+        if vector is None:
+            vector = self.embed(text)
+
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None:
+                entry = (faiss.IndexFlatIP(self._dimension), [], [])
+                self._scopes[scope] = entry
+
+            index, texts, responses = entry
+            index.add(vector)
+            texts.append(text)
+            responses.append(response)
+
+    def __len__(self) -> int:
+        return sum(len(responses) for _, _, responses in self._scopes.values())
@@ -7,9 +7,12 @@ C# 코드 리뷰를 위한 프롬프트 빌더
 리뷰 규칙과 예제는 Markdown 파일에서 동적으로 로드됩니다.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from enum import Enum
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
+import re
 import sys
 
 # 프로젝트 루트 경로 추가
@@ -17,6 +20,39 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from app.utils.markdown_parser import CategoryLoader
 
+# build_review_prompt가 만든 Few-shot 예제 섹션 ("예제:"부터 마지막 After 코드까지)
+# 섹션 뒤에는 빈 줄 두 개와 출력 형식 지시가 오고, 예제 사이에는 빈 줄 두 개와 "[카테고리]"가 옴
+_EXAMPLE_SECTION_RE = re.compile(r'\n\n\n예제:\n\n\[.*?\nAfter:\n.*?\n(?=\n\n(?!\[))', re.DOTALL)
+
+# 줄 안의 연속 공백 (축약 예제에서 하나로 합침)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=64)
+def _compact_code(code: str) -> str:
+    """
+    Few-shot 예제 코드 축약
+
+    들여쓰기와 빈 줄, 줄 안의 연속 공백을 제거합니다. 줄 구분과 주석(/// 포함)은
+    그대로 두어 예제가 보여주는 변경 내용은 유지합니다.
+    """
+    lines = (_WHITESPACE_RE.sub(' ', line.strip()) for line in code.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+@lru_cache(maxsize=128)
+def _estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (같은 프롬프트를 빌드 후 최적화 단계에서 다시 추정하므로 캐시)"""
+    # 간단한 추정: 공백 기준 단어 수 + 코드 특수문자 보정
+    # str.split()은 C 루프로 단어를 나눠 정규식 스캔보다 빠름
+    words = len(text.split())
+    chars = len(text)
+
+    # 평균적으로 영어 1단어 = 1.3토큰, 한글 1글자 = 0.5토큰
+    estimated = (words * 1.3) + (chars * 0.1)
+
+    return int(estimated)
+
 
 class ReviewCategory(Enum):
     """코드 리뷰 카테고리"""
@@ -291,6 +327,73 @@ public class DatabaseHelper
         }
     ]
 
+    # 출력 형식별 지시사항 (호출마다 딕셔너리를 다시 만들지 않도록 클래스 상수)
+    _OUTPUT_INSTRUCTIONS: Dict[OutputFormat, str] = {
+        OutputFormat.IMPROVED_CODE: """입력된 원본 코드를 개선하여 출력하세요.
+
+개선 규칙:
+1. 클래스/메서드/필드 이름은 유지하되, 필요하면 새로운 필드/생성자/프로퍼티를 추가하세요
+2. 하드코딩 제거: 하드코딩된 값을 IConfiguration으로 변경하고, 생성자 주입을 추가하세요
+3. Null 체크, using 문, try-catch 등 필요한 구조를 추가하세요
+4. SQL Injection 방지: 문자열 연결 대신 파라미터화된 쿼리를 사용하세요
+5. XML 문서 주석(///)을 모든 public 클래스/메서드에 추가하세요
+6. 순수 C# 코드만 출력 (마크다운 코드 블록이나 설명 텍스트 제외)
+7. 반드시 유효한 C# 문법으로만 출력
+
+예시:
+입력:
+```
+class UserService {
+    string apiUrl = "https://api.com";
+    void GetData() { /* ... */ }
+}
+```
+
+출력:
+```
+/// <summary>
+/// 사용자 서비스 클래스
+/// </summary>
+class UserService {
+    private readonly IConfiguration _config;
+
+    /// <summary>
+    /// UserService 생성자
+    /// </summary>
+    /// <param name="config">설정 객체</param>
+    public UserService(IConfiguration config) { _config = config; }
+
+    /// <summary>
+    /// 데이터를 가져옵니다
+    /// </summary>
+    void GetData() {
+        string apiUrl = _config["ApiSettings:Url"];
+        /* ... */
+    }
+}
+```""",
+
+        OutputFormat.CODE_COMMENTS: """원본 코드에 XML 문서 주석을 추가하여 출력하세요.""",
+
+        OutputFormat.FLOW_DIAGRAM: """Mermaid 형식의 플로우 다이어그램을 출력하세요."""
+    }
+
+    # Markdown 파일 키 → 리뷰 카테고리 (파일명은 ReviewCategory 값과 같음)
+    _CATEGORY_MAP: Tuple[Tuple[str, ReviewCategory], ...] = (
+        ('null_reference', ReviewCategory.NULL_REFERENCE),
+        ('exception_handling', ReviewCategory.EXCEPTION_HANDLING),
+        ('resource_management', ReviewCategory.RESOURCE_MANAGEMENT),
+        ('performance', ReviewCategory.PERFORMANCE),
+        ('security', ReviewCategory.SECURITY),
+        ('naming_convention', ReviewCategory.NAMING_CONVENTION),
+        ('code_documentation', ReviewCategory.CODE_DOCUMENTATION),
+        ('hardcoding_to_config', ReviewCategory.HARDCODING_TO_CONFIG),
+    )
+
+    # Markdown에서 로드한 (categories_data, review_templates, few_shot_examples) 캐시
+    # 키: (카테고리 디렉토리, .md 파일의 최신 수정 시각) → 파일이 바뀌면 다시 로드
+    _CACHE: Dict[Tuple[Path, float], Tuple[Dict, Dict, List[Dict]]] = {}
+
     def __init__(self, use_markdown=True):
         """
         PromptBuilder 초기화
@@ -299,41 +402,93 @@ public class DatabaseHelper
             use_markdown: Markdown 파일에서 규칙/예제 로드 여부 (기본값: True)
         """
         self.system_prompt = self.SYSTEM_PROMPT
+        self.use_markdown = use_markdown
+
+        # 규칙/예제와 프롬프트 조각은 처음 사용할 때 로드
+        # (주석/플로우 다이어그램 프롬프트만 쓰는 빌더는 Markdown 파일을 읽지 않음)
+        self._categories_data = None
+        self._review_templates = None
+        self._few_shot_examples = None
+        self._few_shot_examples_compact = None
+        self._prompt_blocks = None
+
+        if not use_markdown:
+            # 기존 하드코딩된 데이터 사용 (하위 호환성)
+            self._review_templates = self.REVIEW_TEMPLATES
+            self._few_shot_examples = self.FEW_SHOT_EXAMPLES
+
+    @property
+    def categories_data(self) -> Dict:
+        """Markdown에서 로드한 카테고리 데이터 (use_markdown=False면 None)"""
+        if self._categories_data is None and self.use_markdown:
+            self._load_markdown()
+        return self._categories_data
+
+    @property
+    def review_templates(self) -> Dict:
+        """카테고리별 리뷰 템플릿"""
+        if self._review_templates is None:
+            self._load_markdown()
+        return self._review_templates
+
+    @property
+    def few_shot_examples(self) -> List[Dict]:
+        """Few-shot 예제 목록"""
+        if self._few_shot_examples is None:
+            self._load_markdown()
+        return self._few_shot_examples
+
+    @property
+    def few_shot_examples_compact(self) -> List[Dict]:
+        """들여쓰기와 빈 줄을 제거한 Few-shot 예제 목록 (토큰 절약용)"""
+        if self._few_shot_examples_compact is None:
+            self._few_shot_examples_compact = [
+                {
+                    'category': example['category'],
+                    'before': _compact_code(example['before']),
+                    'after': _compact_code(example['after'])
+                }
+                for example in self.few_shot_examples
+            ]
+        return self._few_shot_examples_compact
 
-        if use_markdown:
-            # Markdown 파일에서 카테고리 데이터 로드
-            project_root = Path(__file__).parent.parent.parent
-            categories_dir = project_root / "resources" / "templates" / "review_categories"
+    def _load_markdown(self) -> None:
+        """Markdown 파일에서 카테고리 데이터, 템플릿, 예제 로드"""
+        project_root = Path(__file__).parent.parent.parent
+        categories_dir = (project_root / "resources" / "templates" / "review_categories").resolve()
 
+        # 같은 파일을 이미 파싱했으면 재사용 (요청마다 디스크 I/O + 파싱 생략)
+        cache_key = (categories_dir, self._latest_mtime(categories_dir))
+        cached = self._CACHE.get(cache_key)
+
+        if cached is None:
             loader = CategoryLoader(categories_dir)
-            self.categories_data = loader.load_all()
+            self._categories_data = loader.load_all()
 
             # REVIEW_TEMPLATES 동적 생성
-            self.review_templates = self._build_templates_from_markdown()
+            self._review_templates = self._build_templates_from_markdown()
 
             # FEW_SHOT_EXAMPLES 동적 생성
-            self.few_shot_examples = self._build_examples_from_markdown()
+            self._few_shot_examples = self._build_examples_from_markdown()
+
+            self._CACHE[cache_key] = (
+                self._categories_data,
+                self._review_templates,
+                self._few_shot_examples
+            )
         else:
-            # 기존 하드코딩된 데이터 사용 (하위 호환성)
-            self.review_templates = self.REVIEW_TEMPLATES
-            self.few_shot_examples = self.FEW_SHOT_EXAMPLES
+            self._categories_data, self._review_templates, self._few_shot_examples = cached
+
+    @staticmethod
+    def _latest_mtime(categories_dir: Path) -> float:
+        """카테고리 Markdown 파일 중 가장 최근 수정 시각 (파일이 없으면 0)"""
+        return max((md_file.stat().st_mtime for md_file in categories_dir.glob('*.md')), default=0.0)
 
     def _build_templates_from_markdown(self) -> Dict:
         """Markdown 데이터에서 REVIEW_TEMPLATES 형식으로 변환"""
         templates = {}
 
-        category_map = {
-            'null_reference': ReviewCategory.NULL_REFERENCE,
-            'exception_handling': ReviewCategory.EXCEPTION_HANDLING,
-            'resource_management': ReviewCategory.RESOURCE_MANAGEMENT,
-            'performance': ReviewCategory.PERFORMANCE,
-            'security': ReviewCategory.SECURITY,
-            'naming_convention': ReviewCategory.NAMING_CONVENTION,
-            'code_documentation': ReviewCategory.CODE_DOCUMENTATION,
-            'hardcoding_to_config': ReviewCategory.HARDCODING_TO_CONFIG,
-        }
-
-        for key, enum_value in category_map.items():
+        for key, enum_value in self._CATEGORY_MAP:
             if key in self.categories_data:
                 data = self.categories_data[key]
                 templates[enum_value] = {
@@ -348,18 +503,7 @@ public class DatabaseHelper
         """Markdown 데이터에서 FEW_SHOT_EXAMPLES 형식으로 변환"""
         examples = []
 
-        category_map = {
-            'null_reference': ReviewCategory.NULL_REFERENCE,
-            'exception_handling': ReviewCategory.EXCEPTION_HANDLING,
-            'resource_management': ReviewCategory.RESOURCE_MANAGEMENT,
-            'performance': ReviewCategory.PERFORMANCE,
-            'security': ReviewCategory.SECURITY,
-            'naming_convention': ReviewCategory.NAMING_CONVENTION,
-            'code_documentation': ReviewCategory.CODE_DOCUMENTATION,
-            'hardcoding_to_config': ReviewCategory.HARDCODING_TO_CONFIG,
-        }
-
-        for key, enum_value in category_map.items():
+        for key, enum_value in self._CATEGORY_MAP:
             if key in self.categories_data:
                 data = self.categories_data[key]
                 # 각 카테고리의 첫 번째 예제만 사용 (토큰 최적화)
@@ -373,12 +517,49 @@ public class DatabaseHelper
 
         return examples
 
+    def _get_prompt_blocks(self) -> Tuple[Dict[ReviewCategory, str], List[Tuple[ReviewCategory, str]], List[Tuple[ReviewCategory, str]]]:
+        """
+        카테고리 설명과 Few-shot 예제를 프롬프트에 들어갈 문자열로 변환 (처음 한 번만)
+
+        각 조각은 앞 조각과의 구분 줄바꿈을 포함합니다.
+
+        Returns:
+            (카테고리별 설명 줄, (카테고리, 예제 블록) 리스트, (카테고리, 축약 예제 블록) 리스트)
+        """
+        if self._prompt_blocks is not None:
+            return self._prompt_blocks
+
+        category_headers = {
+            category: f"\n\n• {template['name']}: {template['description']}"
+            for category, template in self.review_templates.items()
+        }
+
+        self._prompt_blocks = (
+            category_headers,
+            self._build_example_blocks(self.few_shot_examples),
+            self._build_example_blocks(self.few_shot_examples_compact)
+        )
+        return self._prompt_blocks
+
+    def _build_example_blocks(self, examples: List[Dict]) -> List[Tuple[ReviewCategory, str]]:
+        """Few-shot 예제를 (카테고리, 예제 블록) 리스트로 변환"""
+        example_blocks = []
+        for example in examples:
+            category_name = self.review_templates[example["category"]]["name"]
+            example_blocks.append((
+                example["category"],
+                f"\n\n[{category_name}]\nBefore:\n{example['before']}\n\nAfter:\n{example['after']}\n"
+            ))
+
+        return example_blocks
+
     def build_review_prompt(
         self,
         code: str,
         categories: List[ReviewCategory],
         output_format: OutputFormat = OutputFormat.IMPROVED_CODE,
-        include_examples: bool = True
+        include_examples: bool = True,
+        compact_examples: bool = False
     ) -> str:
         """
         코드 리뷰 프롬프트 생성
@@ -388,41 +569,44 @@ public class DatabaseHelper
             categories: 리뷰 카테고리 목록
             output_format: 출력 형식
             include_examples: Few-shot 예제 포함 여부
+            compact_examples: 들여쓰기와 빈 줄을 제거한 축약 예제 사용 여부
 
         Returns:
             최적화된 프롬프트 문자열
         """
-        prompt_parts = []
+        head = ""
 
-        # 1. 리뷰 카테고리 설명
         if categories:
-            prompt_parts.append("다음 항목을 중점적으로 검토하세요:")
-            for category in categories:
-                template = self.review_templates[category]
-                prompt_parts.append(f"\n• {template['name']}: {template['description']}")
-
-        # 2. Few-shot 예제 (선택한 카테고리만)
-        if include_examples and categories:
-            relevant_examples = [
-                ex for ex in self.few_shot_examples
-                if ex["category"] in categories
-            ]
+            category_headers, example_blocks, compact_example_blocks = self._get_prompt_blocks()
+
+            # 1. 리뷰 카테고리 설명
+            head = "다음 항목을 중점적으로 검토하세요:" + "".join(
+                category_headers[category] for category in categories
+            )
 
-            if relevant_examples:
-                prompt_parts.append("\n\n예제:")
-                for i, example in enumerate(relevant_examples[:2], 1):  # 최대 2개만
-                    category_name = self.review_templates[example["category"]]["name"]
-                    prompt_parts.append(f"\n[{category_name}]")
-                    prompt_parts.append(f"Before:\n{example['before']}")
-                    prompt_parts.append(f"\nAfter:\n{example['after']}\n")
+            # 2. Few-shot 예제 (선택한 카테고리만, 최대 2개)
+            if include_examples:
+                if compact_examples:
+                    example_blocks = compact_example_blocks
 
-        # 3. 사용자 코드
-        prompt_parts.append(f"\n분석할 코드:\n```csharp\n{code}\n```")
+                # 앞에서부터 2개를 찾으면 나머지 예제는 검사하지 않음 (카테고리 포함 여부는 해시 조회)
+                category_set = frozenset(categories)
+                relevant_examples = list(islice(
+                    (block for category, block in example_blocks if category in category_set),
+                    2
+                ))
 
-        # 4. 출력 형식 지시
-        prompt_parts.append(f"\n{self._get_output_instruction(output_format)}")
+                if relevant_examples:
+                    head += "\n\n\n예제:" + "".join(relevant_examples)
 
-        return "\n".join(prompt_parts)
+            head += "\n"
+
+        # 3. 출력 형식 지시 (고정 부분을 앞에 모아 프롬프트 캐시 접두사로 활용)
+        # 4. 사용자 코드 (파일마다 달라지는 부분은 마지막에)
+        return (
+            f"{head}\n{self._get_output_instruction(output_format)}"
+            f"\n\n분석할 코드:\n```csharp\n{code}\n```"
+        )
 
     def build_comment_prompt(self, code: str) -> str:
         """
@@ -489,57 +673,10 @@ graph TD
         Returns:
             지시사항 문자열
         """
-        instructions = {
-            OutputFormat.IMPROVED_CODE: """입력된 원본 코드를 개선하여 출력하세요.
-
-개선 규칙:
-1. 클래스/메서드/필드 이름은 유지하되, 필요하면 새로운 필드/생성자/프로퍼티를 추가하세요
-2. 하드코딩 제거: 하드코딩된 값을 IConfiguration으로 변경하고, 생성자 주입을 추가하세요
-3. Null 체크, using 문, try-catch 등 필요한 구조를 추가하세요
-4. SQL Injection 방지: 문자열 연결 대신 파라미터화된 쿼리를 사용하세요
-5. XML 문서 주석(///)을 모든 public 클래스/메서드에 추가하세요
-6. 순수 C# 코드만 출력 (마크다운 코드 블록이나 설명 텍스트 제외)
-7. 반드시 유효한 C# 문법으로만 출력
-
-예시:
-입력:
-```
-class UserService {
-    string apiUrl = "https://api.com";
-    void GetData() { /* ... */ }
-}
-```
-
-출력:
-```
-/// <summary>
-/// 사용자 서비스 클래스
-/// </summary>
-class UserService {
-    private readonly IConfiguration _config;
-
-    /// <summary>
-    /// UserService 생성자
-    /// </summary>
-    /// <param name="config">설정 객체</param>
-    public UserService(IConfiguration config) { _config = config; }
-
-    /// <summary>
-    /// 데이터를 가져옵니다
-    /// </summary>
-    void GetData() {
-        string apiUrl = _config["ApiSettings:Url"];
-        /* ... */
-    }
-}
-```""",
-
-            OutputFormat.CODE_COMMENTS: """원본 코드에 XML 문서 주석을 추가하여 출력하세요.""",
-
-            OutputFormat.FLOW_DIAGRAM: """Mermaid 형식의 플로우 다이어그램을 출력하세요."""
-        }
-
-        return instructions.get(output_format, instructions[OutputFormat.IMPROVED_CODE])
+        return self._OUTPUT_INSTRUCTIONS.get(
+            output_format,
+            self._OUTPUT_INSTRUCTIONS[OutputFormat.IMPROVED_CODE]
+        )
 
     def estimate_tokens(self, text: str) -> int:
         """
@@ -551,14 +688,7 @@ class UserService {
         Returns:
             예상 토큰 수
         """
-        # 간단한 추정: 공백 기준 단어 수 + 코드 특수문자 보정
-        words = len(text.split())
-        chars = len(text)
-
-        # 평균적으로 영어 1단어 = 1.3토큰, 한글 1글자 = 0.5토큰
-        estimated = (words * 1.3) + (chars * 0.1)
-
-        return int(estimated)
+        return _estimate_tokens(text)
 
     def optimize_prompt(self, prompt: str, max_tokens: int = 1500) -> str:
         """
@@ -576,31 +706,8 @@ class UserService {
         if current_tokens <= max_tokens:
             return prompt
 
-        # 토큰 초과 시 예제 제거 또는 축약
-        # 실제로는 더 정교한 최적화 필요
-        lines = prompt.split('\n')
-
-        # 예제 섹션 제거
-        optimized_lines = []
-        skip_example = False
-
-        for line in lines:
-            if '예제:' in line:
-                skip_example = True
-                continue
-            if skip_example and line.startswith('['):
-                continue
-            if skip_example and ('Before:' in line or 'After:' in line):
-                continue
-            if skip_example and line.strip().startswith('```'):
-                continue
-            if skip_example and not line.strip():
-                skip_example = False
-                continue
-
-            optimized_lines.append(line)
-
-        return '\n'.join(optimized_lines)
+        # 토큰 초과 시 예제 섹션을 한 번에 제거 (include_examples=False와 같은 프롬프트)
+        return _EXAMPLE_SECTION_RE.sub('', prompt, count=1)
 
 
 # 사용 예제
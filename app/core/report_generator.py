@@ -5,9 +5,103 @@ LLM 응답을 파싱하고 Markdown 형식의 리포트를 생성합니다.
 """
 
 from typing import Dict, List, Any, Optional
+from collections import OrderedDict
 from datetime import datetime
+import hashlib
+import io
+from functools import lru_cache, wraps
 from pathlib import Path
 import re
+import threading
+
+# LLM 응답의 마크다운 코드 블록 (```csharp, ```c#, ```)
+_CODE_BLOCK_RE = re.compile(r'```(?:csharp|c#)?\s*\n(.*?)\n```', re.DOTALL | re.IGNORECASE)
+
+# 코드 블록이 없는 응답에서 설명 섹션의 시작을 나타내는 키워드
+_SKIP_KEYWORDS = ('분석:', '개선:', '설명:', 'Analysis:', 'Improvement:')
+_SKIP_RE = re.compile('|'.join(map(re.escape, _SKIP_KEYWORDS)))
+
+# 설명 섹션 이후에도 코드로 간주할 줄의 시작 (앞 공백 무시)
+_CODE_PREFIX_RE = re.compile(
+    r'\s*(?:public|private|protected|internal|class|interface|namespace|using|\{|\}|//)'
+)
+
+# 리포트 헤더 (생성 시각과 모델 이름만 바뀜)
+_HEADER_TEMPLATE = """# C# 코드 리뷰 리포트
+
+**생성 일시**: {timestamp}
+**분석 모델**: {model_name}
+**생성 도구**: C# Code Reviewer v1.0.0"""
+
+# 리포트에 표시할 카테고리 이름
+_CATEGORY_NAMES = {
+    'null_reference': 'Null 참조 체크',
+    'exception_handling': 'Exception 처리',
+    'resource_management': '리소스 관리',
+    'performance': '성능 최적화',
+    'security': '보안',
+    'naming_convention': '네이밍 컨벤션',
+    'code_documentation': 'XML 문서 주석',
+    'hardcoding_to_config': '하드코딩 → Config 파일'
+}
+
+# 개선 사항 휴리스틱에 쓰는 키워드 (부분 문자열 기준, null만 대소문자 무시)
+# 어떤 키워드도 다른 키워드의 접두사와 겹치지 않으므로 한 번의 스캔으로 모두 찾음
+# 그룹 이름으로 키워드를 구분해 코드나 매치 문자열을 소문자로 복사하지 않음
+_FEATURE_RE = re.compile(
+    r'(?P<null>(?i:null))|(?P<using>using)|(?P<try>try)|(?P<catch>catch)|(?P<throw>throw)'
+)
+_FEATURE_COUNT = _FEATURE_RE.groups
+
+
+def _find_features(code: str) -> set:
+    """코드에 등장하는 휴리스틱 키워드 집합"""
+    features = set()
+    for match in _FEATURE_RE.finditer(code):
+        features.add(match.lastgroup)
+        if len(features) == _FEATURE_COUNT:
+            break  # 모든 키워드를 찾았으면 나머지는 스캔하지 않음
+    return features
+
+
+def _digest_memo(maxsize: int):
+    """
+    문자열 인자의 blake2b 다이제스트를 키로 하는 작은 LRU 메모 데코레이터
+
+    lru_cache는 인자 문자열(코드 파일 전체)을 키로 보관해 프로세스가 끝날 때까지 메모리에
+    남기므로, 16바이트 다이제스트만 키로 두고 항목 수를 작게 제한합니다.
+    """
+    def decorator(func):
+        memo: OrderedDict = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*texts: str):
+            key = b''.join(
+                hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() for text in texts
+            )
+            with lock:
+                if key in memo:
+                    memo.move_to_end(key)
+                    return memo[key]
+
+            value = func(*texts)
+            with lock:
+                memo[key] = value
+                if len(memo) > maxsize:
+                    memo.popitem(last=False)
+            return value
+
+        wrapper.memo = memo
+        return wrapper
+    return decorator
+
+
+def _count_nonblank_lines(text: str) -> int:
+    """공백이 아닌 줄 수 (중간 리스트 없이 C 내장 함수로 계산)"""
+    # bytes로 인코딩해 나누는 방식은 더 빠르지 않고, 전각 공백 등 유니코드 공백만 있는 줄을
+    # 코드 줄로 세게 되므로 str 기준으로 유지
+    return sum(map(bool, map(str.strip, text.split('\n'))))
 
 
 class ReportGenerator:
@@ -48,64 +142,72 @@ class ReportGenerator:
         # 개선 코드에서 순수 코드만 추출 (마크다운 코드 블록 제거)
         clean_improved_code = self._extract_code_from_response(improved_code)
 
-        # 리포트 섹션 생성
-        sections = []
+        # 리포트 섹션을 하나의 버퍼에 차례로 기록 (섹션 사이는 빈 줄)
+        buffer = io.StringIO()
 
         # 1. 헤더
-        sections.append(self._generate_header(analysis_time, model_name))
+        buffer.write(self._generate_header(analysis_time, model_name))
 
         # 2. 요약
-        sections.append(self._generate_summary(original_code, clean_improved_code, categories))
+        buffer.write("\n\n")
+        buffer.write(self._generate_summary(original_code, clean_improved_code, categories))
 
         # 3. 적용된 리뷰 카테고리
-        sections.append(self._generate_categories_section(categories))
+        buffer.write("\n\n")
+        buffer.write(self._generate_categories_section(categories))
 
         # 4. Before/After 코드 비교
-        sections.append(self._generate_code_comparison(original_code, clean_improved_code))
+        buffer.write("\n\n")
+        buffer.write(self._generate_code_comparison(original_code, clean_improved_code))
 
         # 5. 개선 사항 분석
-        sections.append(self._generate_improvements_section(original_code, clean_improved_code))
+        buffer.write("\n\n")
+        buffer.write(self._generate_improvements_section(original_code, clean_improved_code))
 
         # 6. 푸터
-        sections.append(self._generate_footer(model_name))
+        buffer.write("\n\n")
+        buffer.write(self._generate_footer(model_name))
 
-        return "\n\n".join(sections)
+        return buffer.getvalue()
 
-    def _extract_code_from_response(self, llm_response: str) -> str:
+    @staticmethod
+    @_digest_memo(maxsize=8)
+    def _extract_code_from_response(llm_response: str) -> str:
         """
         LLM 응답에서 순수 코드만 추출
 
+        같은 응답으로 리포트를 다시 생성하는 경우가 많아 결과를 캐시합니다.
+
         Args:
             llm_response: LLM의 전체 응답
 
         Returns:
             순수 C# 코드
         """
-        # 마크다운 코드 블록 제거
-        code_block_pattern = r'```(?:csharp|c#)?\s*\n(.*?)\n```'
-        matches = re.findall(code_block_pattern, llm_response, re.DOTALL | re.IGNORECASE)
+        # 마크다운 코드 블록 제거 (첫 번째 코드 블록만 사용하므로 search)
+        match = _CODE_BLOCK_RE.search(llm_response)
 
-        if matches:
+        if match:
             # 첫 번째 코드 블록 반환
-            return matches[0].strip()
+            return match.group(1).strip()
 
         # 코드 블록이 없으면 전체 응답에서 설명 부분 제거
-        # "분석:", "개선:", "설명:" 등의 섹션 제거
-        lines = llm_response.split('\n')
-        code_lines = []
-        in_code = True
-
-        for line in lines:
-            # 한글 설명이나 분석 섹션은 건너뛰기
-            if any(keyword in line for keyword in ['분석:', '개선:', '설명:', 'Analysis:', 'Improvement:']):
-                in_code = False
-                continue
-
-            # 코드처럼 보이는 줄만 수집
-            if in_code or line.strip().startswith(('public', 'private', 'protected', 'internal',
-                                                     'class', 'interface', 'namespace', 'using',
-                                                     '{', '}', '//')):
-                code_lines.append(line)
+        # "분석:", "개선:", "설명:" 등이 처음 나오는 줄 앞은 모두 코드로 유지하고,
+        # 그 뒤로는 설명 키워드가 없는 코드처럼 보이는 줄만 유지
+        skip_match = _SKIP_RE.search(llm_response)
+
+        if skip_match is None:
+            code_lines = [llm_response]
+        else:
+            line_start = llm_response.rfind('\n', 0, skip_match.start()) + 1
+            line_end = llm_response.find('\n', skip_match.end())
+
+            code_lines = llm_response[:line_start].split('\n')[:-1]
+            if line_end != -1:
+                code_lines.extend(
+                    line for line in llm_response[line_end + 1:].split('\n')
+                    if _CODE_PREFIX_RE.match(line) and not _SKIP_RE.search(line)
+                )
 
         result = '\n'.join(code_lines).strip()
 
@@ -114,16 +216,15 @@ class ReportGenerator:
 
     def _generate_header(self, analysis_time: datetime, model_name: str) -> str:
         """리포트 헤더 생성"""
-        return f"""# C# 코드 리뷰 리포트
-
-**생성 일시**: {analysis_time.strftime('%Y-%m-%d %H:%M:%S')}
-**분석 모델**: {model_name}
-**생성 도구**: C# Code Reviewer v1.0.0"""
+        return _HEADER_TEMPLATE.format(
+            timestamp=analysis_time.strftime('%Y-%m-%d %H:%M:%S'),
+            model_name=model_name
+        )
 
     def _generate_summary(self, original: str, improved: str, categories: List[str]) -> str:
         """요약 섹션 생성"""
-        original_lines = len([l for l in original.split('\n') if l.strip()])
-        improved_lines = len([l for l in improved.split('\n') if l.strip()])
+        original_lines = _count_nonblank_lines(original)
+        improved_lines = _count_nonblank_lines(improved)
         added_lines = improved_lines - original_lines
 
         return f"""## 📊 요약
@@ -135,22 +236,11 @@ class ReportGenerator:
 
     def _generate_categories_section(self, categories: List[str]) -> str:
         """적용된 카테고리 섹션 생성"""
-        category_names = {
-            'null_reference': 'Null 참조 체크',
-            'exception_handling': 'Exception 처리',
-            'resource_management': '리소스 관리',
-            'performance': '성능 최적화',
-            'security': '보안',
-            'naming_convention': '네이밍 컨벤션',
-            'code_documentation': 'XML 문서 주석',
-            'hardcoding_to_config': '하드코딩 → Config 파일'
-        }
-
-        items = [f"- ✅ **{category_names.get(cat, cat)}**" for cat in categories]
+        items = '\n'.join(f"- ✅ **{_CATEGORY_NAMES.get(cat, cat)}**" for cat in categories)
 
         return f"""## 🎯 적용된 리뷰 카테고리
 
-{chr(10).join(items)}"""
+{items}"""
 
     def _generate_code_comparison(self, original: str, improved: str) -> str:
         """Before/After 코드 비교 섹션"""
@@ -168,21 +258,26 @@ class ReportGenerator:
 {improved}
 ```"""
 
-    def _generate_improvements_section(self, original: str, improved: str) -> str:
-        """개선 사항 분석 섹션"""
+    @staticmethod
+    @_digest_memo(maxsize=8)
+    def _generate_improvements_section(original: str, improved: str) -> str:
+        """개선 사항 분석 섹션 (입력 코드에만 의존하므로 결과 캐시)"""
         improvements = []
 
-        # 간단한 휴리스틱으로 개선 사항 감지
-        if 'null' in improved.lower() and 'null' not in original.lower():
+        # 간단한 휴리스틱으로 개선 사항 감지 (코드마다 한 번만 스캔)
+        original_features = _find_features(original)
+        improved_features = _find_features(improved)
+
+        if 'null' in improved_features and 'null' not in original_features:
             improvements.append("- 🔍 **Null 체크 추가**: 입력 검증으로 NullReferenceException 방지")
 
-        if 'using' in improved and 'using' not in original:
+        if 'using' in improved_features and 'using' not in original_features:
             improvements.append("- 🧹 **리소스 관리 개선**: using 문으로 자동 리소스 해제")
 
-        if 'try' in improved or 'catch' in improved:
+        if 'try' in improved_features or 'catch' in improved_features:
             improvements.append("- ⚠️ **예외 처리 추가**: try-catch 블록으로 에러 핸들링 강화")
 
-        if 'throw' in improved and 'throw' not in original:
+        if 'throw' in improved_features and 'throw' not in original_features:
             improvements.append("- 🚫 **명시적 예외 발생**: 잘못된 입력에 대한 명확한 피드백")
 
         if not improvements:
@@ -194,8 +289,10 @@ class ReportGenerator:
 
 {improvements_text}"""
 
-    def _generate_footer(self, model_name: str = "Unknown") -> str:
-        """리포트 푸터 생성"""
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _generate_footer(model_name: str = "Unknown") -> str:
+        """리포트 푸터 생성 (모델별로 항상 같으므로 결과 캐시)"""
         return f"""---
 
 ## 📌 참고사항
@@ -220,9 +317,7 @@ class ReportGenerator:
         try:
             output_file = Path(output_path)
             output_file.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(report)
+            output_file.write_text(report, encoding='utf-8')
 
         except Exception as e:
             raise IOError(f"리포트 저장 실패: {e}")
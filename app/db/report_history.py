@@ -4,11 +4,26 @@
 SQLite를 사용하여 분석 리포트 히스토리를 관리합니다.
 """
 
+import queue
 import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Callable, Iterator, List, Optional, Dict, Any, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+
+# fcntl은 POSIX 전용 (Windows에서는 프로세스 간 잠금 없이 SQLite 잠금과 busy timeout에 의존)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# INSERT ... RETURNING 지원 여부 (SQLite 3.35 이상)
+_RETURNING_SUPPORTED = sqlite3.sqlite_version_info >= (3, 35, 0)
 
 
 @dataclass
@@ -44,8 +59,180 @@ class ReportHistoryDB:
     리포트 히스토리 데이터베이스 관리 클래스
 
     SQLite를 사용하여 분석 리포트의 메타데이터를 저장하고 조회합니다.
+    쓰기는 전용 스레드 하나가 쓰기 연결(WAL 모드)로 처리하며, 그 사이 대기 중인 쓰기를
+    한 트랜잭션으로 묶어 커밋합니다. 여러 프로세스가 같은 DB를 쓰는 경우 쓰기 트랜잭션은
+    DB 옆의 잠금 파일(fcntl.flock)로 직렬화되어 SQLite 쓰기 잠금을 두고 경합하지 않습니다.
+    읽기는 별도의 읽기 전용 연결을 사용하므로 쓰기를 기다리지 않습니다.
+    여러 스레드에서 동시에 사용할 수 있으며, 사용이 끝나면 close()를 호출하세요.
     """
 
+    # iter_all_reports가 잠금을 한 번 잡을 때 읽는 행 수
+    FETCH_SIZE = 256
+
+    # 스키마 버전 (PRAGMA user_version). 테이블/인덱스 구성을 바꾸면 1 증가시켜
+    # 기존 DB에서도 _ensure_db_exists의 생성/마이그레이션이 다시 실행되도록 함
+    _SCHEMA_VERSION = 2
+
+    # 조회 컬럼 (ReportRecord 필드 순서와 동일, 행을 위치로 읽음)
+    _COLUMNS = (
+        'id, filename, report_name, timestamp, markdown_path, html_path, '
+        'success, error_message, analysis_time'
+    )
+
+    # SQL 문장 (sqlite3는 연결별로 SQL 문자열을 키로 준비된 문장을 캐시하므로,
+    # 같은 쿼리는 항상 이 상수를 사용해 SQLite 파서/플래너를 다시 거치지 않도록 함)
+    _SQL = {
+        'create_table': '''
+            CREATE TABLE IF NOT EXISTS report_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                filename TEXT NOT NULL,
+                report_name TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                markdown_path TEXT NOT NULL,
+                html_path TEXT NOT NULL,
+                success INTEGER NOT NULL DEFAULT 1 CHECK (success IN (0, 1)),
+                error_message TEXT DEFAULT '',
+                analysis_time REAL DEFAULT 0.0
+            )
+        ''',
+        # success CHECK 제약 도입 전 테이블 재구성 (SQLite는 ADD CONSTRAINT 미지원)
+        'select_table_sql': '''
+            SELECT sql FROM sqlite_master
+            WHERE type = 'table' AND name = 'report_history'
+        ''',
+        'rename_table_old': 'ALTER TABLE report_history RENAME TO report_history_old',
+        'copy_from_old': '''
+            INSERT INTO report_history
+            (id, filename, report_name, timestamp, markdown_path, html_path,
+             success, error_message, analysis_time)
+            SELECT id, filename, report_name, timestamp, markdown_path, html_path,
+                   CASE WHEN success THEN 1 ELSE 0 END, error_message, analysis_time
+            FROM report_history_old
+        ''',
+        'copy_sequence_from_old': '''
+            UPDATE sqlite_sequence
+            SET seq = (
+                SELECT MAX(seq) FROM sqlite_sequence
+                WHERE name IN ('report_history', 'report_history_old')
+            )
+            WHERE name = 'report_history'
+        ''',
+        'drop_table_old': 'DROP TABLE report_history_old',
+        # 통계 카운터 (한 행). 추가/삭제 트랜잭션 안에서 함께 갱신하여
+        # get_statistics가 전체 테이블을 집계하지 않도록 함
+        'create_stats_table': '''
+            CREATE TABLE IF NOT EXISTS report_stats (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total INTEGER NOT NULL DEFAULT 0,
+                success INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                total_time REAL NOT NULL DEFAULT 0.0
+            )
+        ''',
+        'select_stats_exists': 'SELECT 1 FROM report_stats',
+        'init_stats': '''
+            INSERT INTO report_stats (id, total, success, failed, total_time)
+            SELECT
+                1,
+                COUNT(*),
+                COALESCE(SUM(success), 0),
+                COUNT(*) - COALESCE(SUM(success), 0),
+                COALESCE(SUM(analysis_time), 0.0)
+            FROM report_history
+        ''',
+        'update_stats': '''
+            UPDATE report_stats
+            SET total = total + ?,
+                success = success + ?,
+                failed = failed + ?,
+                total_time = total_time + ?
+            WHERE id = 1
+        ''',
+        # (filename, timestamp) 복합 인덱스가 파일별 조회와 정렬을 모두 처리하므로
+        # 이전 버전의 filename 단일 인덱스는 삭제
+        'create_index_filename_ts': '''
+            CREATE INDEX IF NOT EXISTS idx_filename_ts
+            ON report_history(filename, timestamp DESC)
+        ''',
+        'drop_index_filename': 'DROP INDEX IF EXISTS idx_filename',
+        'create_index_timestamp': '''
+            CREATE INDEX IF NOT EXISTS idx_timestamp
+            ON report_history(timestamp DESC)
+        ''',
+        # 실패 리포트만 담는 부분 인덱스 (실패 목록 조회용, 전체 인덱스보다 작음)
+        'create_index_failed': '''
+            CREATE INDEX IF NOT EXISTS idx_failed
+            ON report_history(timestamp DESC)
+            WHERE success = 0
+        ''',
+        'insert': '''
+            INSERT INTO report_history
+            (filename, report_name, timestamp, markdown_path, html_path,
+             success, error_message, analysis_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''',
+        'insert_returning': '''
+            INSERT INTO report_history
+            (filename, report_name, timestamp, markdown_path, html_path,
+             success, error_message, analysis_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            RETURNING id
+        ''',
+        'last_insert_id': 'SELECT last_insert_rowid()',
+        'select_all': f'''
+            SELECT {_COLUMNS} FROM report_history
+            ORDER BY timestamp DESC
+        ''',
+        'select_all_limit': f'''
+            SELECT {_COLUMNS} FROM report_history
+            ORDER BY timestamp DESC
+            LIMIT ?
+        ''',
+        'select_by_filename': f'''
+            SELECT {_COLUMNS} FROM report_history
+            WHERE filename = ?
+            ORDER BY timestamp DESC
+        ''',
+        'select_delete_info': '''
+            SELECT markdown_path, html_path, success, analysis_time FROM report_history
+            WHERE id = ?
+        ''',
+        'select_by_id': f'''
+            SELECT {_COLUMNS} FROM report_history
+            WHERE id = ?
+        ''',
+        'delete': '''
+            DELETE FROM report_history
+            WHERE id = ?
+        ''',
+        'statistics': '''
+            SELECT total, success, failed, total_time
+            FROM report_stats
+            WHERE id = 1
+        ''',
+    }
+
+    # 연결을 열 때 한 번 적용하는 PRAGMA
+    # WAL: 읽기와 쓰기가 서로 막지 않고 커밋마다 롤백 저널을 만들지 않음
+    # synchronous=NORMAL: WAL 모드에서 안전한 수준으로 fsync 횟수 감소
+    _PRAGMAS = (
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA cache_size=-64000',
+        'PRAGMA mmap_size=268435456',
+    )
+
+    # 읽기 전용 연결에 적용하는 PRAGMA (저널 모드는 쓰기 연결에서 이미 설정됨)
+    _READ_PRAGMAS = (
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA cache_size=-64000',
+        'PRAGMA mmap_size=268435456',
+    )
+
+    # 쓰기 스레드가 한 트랜잭션으로 묶는 최대 쓰기 작업 수
+    WRITE_BATCH_SIZE = 32
+
     def __init__(self, db_path: str = "reports/reports.db"):
         """
         데이터베이스 초기화
@@ -54,52 +241,175 @@ class ReportHistoryDB:
             db_path: 데이터베이스 파일 경로 (기본: reports/reports.db)
         """
         self.db_path = db_path
-        self._ensure_db_exists()
+        self._lock = threading.Lock()  # 읽기 연결 보호
+        self._closed = False
 
-    def _ensure_db_exists(self):
-        """데이터베이스 파일 및 테이블 생성"""
         # 데이터베이스 디렉토리 생성
-        db_dir = Path(self.db_path).parent
-        db_dir.mkdir(parents=True, exist_ok=True)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # 프로세스 간 쓰기 잠금 파일 (쓰기 스레드만 잡음)
+        self._lock_file = open(f"{self.db_path}.lock", 'a+b') if fcntl is not None else None
+
+        # 쓰기 연결 (스키마 생성 후에는 쓰기 스레드만 사용)
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        for pragma in self._PRAGMAS:
+            self._conn.execute(pragma)
+
+        with self._process_lock():
+            self._ensure_db_exists()
+
+        # 읽기 전용 연결 (파일과 스키마가 생긴 뒤에 열어야 함)
+        self._read_conn = sqlite3.connect(
+            f"{Path(self.db_path).resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        for pragma in self._READ_PRAGMAS:
+            self._read_conn.execute(pragma)
+
+        # 쓰기 스레드
+        self._write_queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name="ReportHistoryWriter",
+            daemon=True
+        )
+        self._writer.start()
 
-        # 테이블 생성
-        conn = self._get_connection()
+    def _ensure_db_exists(self):
+        """테이블 및 인덱스 생성 (스키마 버전이 최신이면 생략, 쓰기 스레드 시작 전에 호출)"""
+        cursor = self._conn.cursor()
+        if cursor.execute('PRAGMA user_version').fetchone()[0] == self._SCHEMA_VERSION:
+            return
+
+        # 스키마 변경 전체를 한 트랜잭션으로 (DDL은 자동으로 트랜잭션을 시작하지 않음)
+        cursor.execute('BEGIN')
+
+        table = cursor.execute(self._SQL['select_table_sql']).fetchone()
+        if table is not None and 'CHECK' not in table[0]:
+            # 이전 버전 테이블: 새 정의로 만들고 데이터/ID 시퀀스 복사 (기존 인덱스는 함께 삭제됨)
+            cursor.execute(self._SQL['rename_table_old'])
+            cursor.execute(self._SQL['create_table'])
+            cursor.execute(self._SQL['copy_from_old'])
+            cursor.execute(self._SQL['copy_sequence_from_old'])
+            cursor.execute(self._SQL['drop_table_old'])
+        else:
+            cursor.execute(self._SQL['create_table'])
+
+        # 인덱스 생성 (빠른 조회를 위해)
+        cursor.execute(self._SQL['create_index_filename_ts'])
+        cursor.execute(self._SQL['drop_index_filename'])
+        cursor.execute(self._SQL['create_index_timestamp'])
+        cursor.execute(self._SQL['create_index_failed'])
+
+        # 통계 카운터 테이블 (카운터 도입 전 DB는 기존 레코드로 한 번 초기화)
+        cursor.execute(self._SQL['create_stats_table'])
+        if cursor.execute(self._SQL['select_stats_exists']).fetchone() is None:
+            cursor.execute(self._SQL['init_stats'])
+
+        cursor.execute(f'PRAGMA user_version = {self._SCHEMA_VERSION}')
+        self._conn.commit()
+
+    def close(self) -> None:
+        """대기 중인 쓰기를 마치고 DB 연결 종료 (종료 전에 쿼리 플래너 통계 갱신)"""
+        if self._closed:
+            return
+        self._closed = True
+
+        self._write_queue.put(None)
+        self._writer.join()
+
+        with self._lock:
+            self._read_conn.close()
+
+        self._conn.execute('PRAGMA optimize')
+        self._conn.close()
+
+        if self._lock_file is not None:
+            self._lock_file.close()
+
+    @contextmanager
+    def _process_lock(self) -> Iterator[None]:
+        """
+        다른 프로세스의 쓰기 트랜잭션과 겹치지 않도록 잠금 파일에 배타 잠금
+
+        fcntl이 없는 플랫폼에서는 아무것도 하지 않습니다 (SQLite 잠금과 busy timeout에 의존).
+        """
+        if self._lock_file is None:
+            yield
+            return
+
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
         try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS report_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    filename TEXT NOT NULL,
-                    report_name TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    markdown_path TEXT NOT NULL,
-                    html_path TEXT NOT NULL,
-                    success INTEGER NOT NULL DEFAULT 1,
-                    error_message TEXT DEFAULT '',
-                    analysis_time REAL DEFAULT 0.0
-                )
-            ''')
-
-            # 인덱스 생성 (빠른 조회를 위해)
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_filename
-                ON report_history(filename)
-            ''')
-
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_timestamp
-                ON report_history(timestamp DESC)
-            ''')
-
-            conn.commit()
+            yield
         finally:
-            conn.close()
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write(self, operation: Callable[[sqlite3.Cursor], Any]) -> Any:
+        """
+        쓰기 작업을 쓰기 스레드에 맡기고 커밋될 때까지 대기
+
+        Args:
+            operation: 쓰기 트랜잭션 안에서 실행할 함수 (쓰기 커서를 받음)
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """SQLite 연결 반환"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Row 객체로 반환
-        return conn
+        Returns:
+            operation의 반환값
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+
+        future: Future = Future()
+        self._write_queue.put((operation, future))
+        return future.result()
+
+    def _writer_loop(self) -> None:
+        """쓰기 스레드: 대기 중인 쓰기 작업을 모아 한 트랜잭션으로 커밋"""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                return
+
+            # 이미 대기 중인 작업을 함께 처리 (그룹 커밋). 새 작업을 기다리지는 않음
+            batch = [item]
+            stop = False
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._run_write_batch(batch)
+            if stop:
+                return
+
+    def _run_write_batch(self, batch: list) -> None:
+        """쓰기 작업들을 한 트랜잭션으로 실행하고 각 작업의 Future에 결과 전달"""
+        try:
+            # 연결 컨텍스트: 성공하면 커밋, 예외가 나면 롤백
+            with self._process_lock(), self._conn:
+                cursor = self._conn.cursor()
+                results = [operation(cursor) for operation, _ in batch]
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+
+            # 실패한 작업만 오류를 받도록 하나씩 다시 실행
+            for item in batch:
+                self._run_write_batch([item])
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
 
     def add_report(self, record: ReportRecord) -> int:
         """
@@ -111,15 +421,23 @@ class ReportHistoryDB:
         Returns:
             int: 생성된 레코드의 ID
         """
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO report_history
-                (filename, report_name, timestamp, markdown_path, html_path,
-                 success, error_message, analysis_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+        return self.add_reports([record])[0]
+
+    def add_reports(self, records: List[ReportRecord]) -> List[int]:
+        """
+        여러 리포트 레코드를 한 트랜잭션으로 추가 (커밋/fsync 한 번)
+
+        Args:
+            records: 추가할 리포트 레코드 목록
+
+        Returns:
+            List[int]: 생성된 레코드의 ID 목록 (records 순서)
+        """
+        if not records:
+            return []
+
+        params = [
+            (
                 record.filename,
                 record.report_name,
                 record.timestamp,
@@ -128,11 +446,31 @@ class ReportHistoryDB:
                 1 if record.success else 0,
                 record.error_message,
                 record.analysis_time
+            )
+            for record in records
+        ]
+        success_count = sum(1 for record in records if record.success)
+
+        def insert(cursor: sqlite3.Cursor) -> List[int]:
+            if len(params) == 1 and _RETURNING_SUPPORTED:
+                # 한 건이면 INSERT ... RETURNING으로 같은 문장에서 ID를 받음
+                record_ids = [cursor.execute(self._SQL['insert_returning'], params[0]).fetchone()[0]]
+            else:
+                # executemany는 RETURNING 결과와 lastrowid를 돌려주지 않음. 프로세스 간 잠금
+                # 안에서 쓰기 스레드만 연속으로 추가했으므로 ID는 마지막 ID까지 1씩 증가하는 연속 값
+                cursor.executemany(self._SQL['insert'], params)
+                last_id = cursor.execute(self._SQL['last_insert_id']).fetchone()[0]
+                record_ids = list(range(last_id - len(records) + 1, last_id + 1))
+
+            cursor.execute(self._SQL['update_stats'], (
+                len(records),
+                success_count,
+                len(records) - success_count,
+                sum(record.analysis_time for record in records)
             ))
-            conn.commit()
-            return cursor.lastrowid
-        finally:
-            conn.close()
+            return record_ids
+
+        return self._write(insert)
 
     def get_all_reports(self, limit: Optional[int] = None) -> List[ReportRecord]:
         """
@@ -144,26 +482,38 @@ class ReportHistoryDB:
         Returns:
             List[ReportRecord]: 리포트 레코드 목록
         """
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
+        return list(self.iter_all_reports(limit))
+
+    def iter_all_reports(self, limit: Optional[int] = None) -> Iterator[ReportRecord]:
+        """
+        모든 리포트를 최신순으로 하나씩 반환 (전체 목록을 메모리에 만들지 않음)
+
+        행은 FETCH_SIZE개씩 잠금 안에서 읽고 잠금 밖에서 반환하므로
+        순회 중에도 같은 인스턴스의 다른 메서드를 호출할 수 있습니다.
+
+        Args:
+            limit: 조회할 최대 개수 (None이면 전체)
+
+        Yields:
+            ReportRecord: 리포트 레코드
+        """
+        with self._lock:
+            cursor = self._read_conn.cursor()
 
             if limit:
-                cursor.execute('''
-                    SELECT * FROM report_history
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                ''', (limit,))
+                cursor.execute(self._SQL['select_all_limit'], (limit,))
             else:
-                cursor.execute('''
-                    SELECT * FROM report_history
-                    ORDER BY timestamp DESC
-                ''')
+                cursor.execute(self._SQL['select_all'])
 
-            rows = cursor.fetchall()
-            return [self._row_to_record(row) for row in rows]
-        finally:
-            conn.close()
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(self.FETCH_SIZE)
+
+            if not rows:
+                return
+
+            for row in rows:
+                yield self._row_to_record(row)
 
     def get_reports_by_filename(self, filename: str) -> List[ReportRecord]:
         """
@@ -175,19 +525,11 @@ class ReportHistoryDB:
         Returns:
             List[ReportRecord]: 해당 파일의 리포트 레코드 목록
         """
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM report_history
-                WHERE filename = ?
-                ORDER BY timestamp DESC
-            ''', (filename,))
-
-            rows = cursor.fetchall()
-            return [self._row_to_record(row) for row in rows]
-        finally:
-            conn.close()
+        with self._lock:
+            cursor = self._read_conn.cursor()
+            cursor.execute(self._SQL['select_by_filename'], (filename,))
+
+            return [self._row_to_record(row) for row in cursor]
 
     def get_report_by_id(self, report_id: int) -> Optional[ReportRecord]:
         """
@@ -199,18 +541,12 @@ class ReportHistoryDB:
         Returns:
             Optional[ReportRecord]: 리포트 레코드 (없으면 None)
         """
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM report_history
-                WHERE id = ?
-            ''', (report_id,))
+        with self._lock:
+            cursor = self._read_conn.cursor()
+            cursor.execute(self._SQL['select_by_id'], (report_id,))
 
             row = cursor.fetchone()
             return self._row_to_record(row) if row else None
-        finally:
-            conn.close()
 
     def delete_report(self, report_id: int) -> bool:
         """
@@ -222,17 +558,7 @@ class ReportHistoryDB:
         Returns:
             bool: 삭제 성공 여부
         """
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                DELETE FROM report_history
-                WHERE id = ?
-            ''', (report_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-        finally:
-            conn.close()
+        return self._write(lambda cursor: self._delete_row(cursor, report_id)) is not None
 
     def delete_report_with_files(self, report_id: int) -> bool:
         """
@@ -244,24 +570,43 @@ class ReportHistoryDB:
         Returns:
             bool: 삭제 성공 여부
         """
-        # 먼저 레코드 조회
-        record = self.get_report_by_id(report_id)
-        if not record:
+        # 경로 조회와 레코드 삭제를 한 트랜잭션으로 처리
+        paths = self._write(lambda cursor: self._delete_row(cursor, report_id))
+
+        if paths is None:
             return False
 
-        # 파일 삭제
+        # 파일 삭제 (이미 없는 파일은 무시)
         try:
-            if record.markdown_path and Path(record.markdown_path).exists():
-                Path(record.markdown_path).unlink()
-
-            if record.html_path and Path(record.html_path).exists():
-                Path(record.html_path).unlink()
+            for path in paths:
+                if path:
+                    Path(path).unlink(missing_ok=True)
         except Exception as e:
             print(f"파일 삭제 중 오류: {e}")
-            # 파일 삭제 실패해도 DB 레코드는 삭제
+            # 파일 삭제 실패해도 DB 레코드는 삭제됨
+
+        return True
 
-        # DB 레코드 삭제
-        return self.delete_report(report_id)
+    def _delete_row(self, cursor: sqlite3.Cursor, report_id: int) -> Optional[Tuple[str, str]]:
+        """
+        레코드를 삭제하고 통계 카운터 갱신 (쓰기 스레드의 트랜잭션 안에서 호출)
+
+        Returns:
+            Optional[Tuple[str, str]]: 삭제한 레코드의 (markdown_path, html_path), 없으면 None
+        """
+        row = cursor.execute(self._SQL['select_delete_info'], (report_id,)).fetchone()
+        if row is None:
+            return None
+
+        markdown_path, html_path, success, analysis_time = row
+        cursor.execute(self._SQL['delete'], (report_id,))
+        cursor.execute(self._SQL['update_stats'], (
+            -1,
+            -1 if success else 0,
+            0 if success else -1,
+            -analysis_time
+        ))
+        return markdown_path, html_path
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -275,48 +620,32 @@ class ReportHistoryDB:
                 - total_analysis_time: 총 분석 시간
                 - avg_analysis_time: 평균 분석 시간
         """
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as success,
-                    SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed,
-                    SUM(analysis_time) as total_time,
-                    AVG(analysis_time) as avg_time
-                FROM report_history
-            ''')
+        with self._lock:
+            cursor = self._read_conn.cursor()
+            cursor.execute(self._SQL['statistics'])
 
-            row = cursor.fetchone()
+            total, success, failed, total_time = cursor.fetchone()
 
-            return {
-                'total': row['total'] or 0,
-                'success': row['success'] or 0,
-                'failed': row['failed'] or 0,
-                'total_analysis_time': row['total_time'] or 0.0,
-                'avg_analysis_time': row['avg_time'] or 0.0
-            }
-        finally:
-            conn.close()
-
-    def _row_to_record(self, row: sqlite3.Row) -> ReportRecord:
-        """SQLite Row를 ReportRecord로 변환"""
-        return ReportRecord(
-            id=row['id'],
-            filename=row['filename'],
-            report_name=row['report_name'],
-            timestamp=row['timestamp'],
-            markdown_path=row['markdown_path'],
-            html_path=row['html_path'],
-            success=bool(row['success']),
-            error_message=row['error_message'],
-            analysis_time=row['analysis_time']
-        )
+        # 모두 삭제된 경우 누적 오차 없이 0으로 표시
+        if not total:
+            total_time = 0.0
+
+        return {
+            'total': total,
+            'success': success,
+            'failed': failed,
+            'total_analysis_time': total_time,
+            'avg_analysis_time': total_time / total if total else 0.0
+        }
+
+    @staticmethod
+    def _row_to_record(row: tuple) -> ReportRecord:
+        """_COLUMNS 순서의 행 튜플을 ReportRecord로 변환"""
+        return ReportRecord(*row[:6], bool(row[6]), row[7], row[8])
 
 
 # 편의 함수
+@lru_cache(maxsize=1)
 def get_db() -> ReportHistoryDB:
     """전역 DB 인스턴스 반환"""
     return ReportHistoryDB()
@@ -14,21 +14,17 @@ Features:
 import sys
 import os
 import logging
+import multiprocessing
 from pathlib import Path
-from dotenv import load_dotenv
 
 from PySide6.QtWidgets import QApplication, QMessageBox
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon
-
-# Load environment variables from .env file (override system env vars)
-load_dotenv(override=True)
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.ui.main_window import MainWindow
-
+# MainWindow (and the markdown/LLM client modules it pulls in) is imported
+# inside main() after the API check, so a missing key is reported quickly.
 
 # Ensure logs directory exists
 logs_dir = Path("logs")
@@ -77,9 +73,22 @@ def check_api_configuration() -> tuple[bool, str]:
     return True, ""
 
 
+def load_environment() -> None:
+    """Load environment variables from .env file (override system env vars)"""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        logger.warning("python-dotenv not installed; using system environment only")
+        return
+
+    load_dotenv(override=True)
+
+
 def main():
     """Main application entry point."""
 
+    load_environment()
+
     # Enable high DPI scaling
     QApplication.setHighDpiScaleFactorRoundingPolicy(
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
@@ -116,6 +125,8 @@ def main():
         sys.exit(1)
 
     # Create and show main window
+    from app.ui.main_window import MainWindow
+
     window = MainWindow()
     window.show()
 
@@ -123,8 +134,13 @@ def main():
     exit_code = app.exec()
 
     logger.info("Application shutting down...")
+    window.report_saver.close()
+    window.batch_result_cache.close()
+    window.llm_cache.close()
     sys.exit(exit_code)
 
 
 if __name__ == "__main__":
+    # Required for process pools (chart rendering) in the PyInstaller build
+    multiprocessing.freeze_support()
     main()
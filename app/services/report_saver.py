@@ -4,15 +4,225 @@
 분석 리포트를 Markdown 및 HTML 형식으로 저장하고 DB에 기록합니다.
 """
 
+import html
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 import markdown
 
 from app.db.report_history import ReportHistoryDB, ReportRecord
 
 
+# HTML 리포트 스타일 (html 디렉토리에 style.css로 한 번 저장하고 각 리포트에서 링크)
+_STYLESHEET_NAME = "style.css"
+_CSS = """\
+* {
+    margin: 0;
+    padding: 0;
+    box-sizing: border-box;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
+    line-height: 1.6;
+    color: #d4d4d4;
+    background-color: #1e1e1e;
+    padding: 20px;
+    max-width: 1200px;
+    margin: 0 auto;
+}
+
+.header {
+    background: #252526;
+    padding: 30px;
+    border-radius: 8px;
+    margin-bottom: 30px;
+    border-left: 4px solid #007acc;
+}
+
+.header h1 {
+    color: #ffffff;
+    font-size: 28px;
+    margin-bottom: 10px;
+}
+
+.header .meta {
+    color: #858585;
+    font-size: 14px;
+}
+
+.content {
+    background: #252526;
+    padding: 30px;
+    border-radius: 8px;
+}
+
+h1 {
+    color: #4ec9b0;
+    border-bottom: 2px solid #007acc;
+    padding-bottom: 10px;
+    margin: 30px 0 20px 0;
+    font-size: 24px;
+}
+
+h2 {
+    color: #569cd6;
+    margin: 25px 0 15px 0;
+    font-size: 20px;
+}
+
+h3 {
+    color: #dcdcaa;
+    margin: 20px 0 10px 0;
+    font-size: 18px;
+}
+
+p {
+    margin: 10px 0;
+}
+
+ul, ol {
+    margin: 10px 0 10px 30px;
+}
+
+li {
+    margin: 5px 0;
+}
+
+code {
+    background: #1e1e1e;
+    padding: 2px 6px;
+    border-radius: 3px;
+    font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
+    color: #ce9178;
+    font-size: 14px;
+}
+
+pre {
+    background: #1e1e1e;
+    padding: 15px;
+    border-radius: 5px;
+    overflow-x: auto;
+    margin: 15px 0;
+    border: 1px solid #3e3e42;
+}
+
+pre code {
+    background: none;
+    padding: 0;
+    color: #d4d4d4;
+}
+
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 15px 0;
+}
+
+th, td {
+    padding: 12px;
+    text-align: left;
+    border: 1px solid #3e3e42;
+}
+
+th {
+    background: #094771;
+    color: #ffffff;
+    font-weight: 600;
+}
+
+tr:nth-child(even) {
+    background: #2d2d30;
+}
+
+blockquote {
+    border-left: 4px solid #007acc;
+    padding-left: 15px;
+    margin: 15px 0;
+    color: #858585;
+    font-style: italic;
+}
+
+.footer {
+    text-align: center;
+    margin-top: 40px;
+    padding-top: 20px;
+    border-top: 1px solid #3e3e42;
+    color: #858585;
+    font-size: 14px;
+}
+
+a {
+    color: #4fc3f7;
+    text-decoration: none;
+}
+
+a:hover {
+    text-decoration: underline;
+}
+
+.badge {
+    display: inline-block;
+    padding: 3px 8px;
+    border-radius: 3px;
+    font-size: 12px;
+    font-weight: 600;
+    margin-right: 5px;
+}
+
+.badge-success {
+    background: #388e3c;
+    color: #ffffff;
+}
+
+.badge-warning {
+    background: #f57c00;
+    color: #ffffff;
+}
+
+.badge-error {
+    background: #d32f2f;
+    color: #ffffff;
+}
+"""
+
+# HTML 리포트 문서 틀 (본문 앞/뒤로 나누어 본문과 함께 순서대로 파일에 기록)
+# 머리말은 중괄호가 없는 정적 문자열이므로 정규식 기반 string.Template 대신 str.format으로 치환
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>코드 리뷰 리포트 - {filename}</title>
+    <link rel="stylesheet" href="{stylesheet}">
+</head>
+<body>
+    <div class="header">
+        <h1>📋 코드 리뷰 리포트</h1>
+        <div class="meta">
+            <strong>파일:</strong> {filename} |
+            <strong>생성 시각:</strong> {timestamp_str}
+        </div>
+    </div>
+
+    <div class="content">
+        """
+
+_HTML_FOOTER = """
+    </div>
+
+    <div class="footer">
+        <p>Generated by <strong>C# Code Reviewer</strong> | Powered by Phi-3-mini</p>
+    </div>
+</body>
+</html>
+"""
+
+
 class ReportSaver:
     """
     리포트 저장 서비스
@@ -20,6 +230,9 @@ class ReportSaver:
     분석 결과를 파일로 저장하고 DB에 메타데이터를 기록합니다.
     """
 
+    # save_reports에서 동시에 저장할 최대 리포트 수
+    MAX_WORKERS = 4
+
     def __init__(
         self,
         reports_dir: str = "reports",
@@ -40,6 +253,24 @@ class ReportSaver:
         self.markdown_dir.mkdir(parents=True, exist_ok=True)
         self.html_dir.mkdir(parents=True, exist_ok=True)
 
+        # 공용 스타일시트 (내용이 같으면 다시 쓰지 않음)
+        self._write_stylesheet()
+
+        # Markdown 변환기 (확장 파이프라인과 정규식을 한 번만 만들고 reset()으로 재사용)
+        # Markdown 인스턴스는 스레드 안전하지 않으므로 save_reports의 동시 저장은 잠금으로 직렬화
+        self._md = markdown.Markdown(
+            extensions=[
+                'fenced_code',  # 코드 블록 지원
+                'tables',       # 테이블 지원
+                'nl2br',        # 줄바꿈 지원
+                'sane_lists'    # 리스트 개선
+            ]
+        )
+        self._md_lock = threading.Lock()
+
+        # 리포트 파일 쓰기용 스레드 (.md 쓰기와 HTML 변환을 겹쳐서 수행)
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+
         # DB 초기화
         self.db = ReportHistoryDB(db_path)
 
@@ -68,10 +299,81 @@ class ReportSaver:
         Returns:
             Tuple[str, str, int]: (markdown_path, html_path, record_id)
         """
-        # 타임스탬프 생성 (YYYYMMDD_HHMMSS 형식)
+        record = self._write_report_files(
+            filename=filename,
+            report_markdown=report_markdown,
+            analysis_time=analysis_time,
+            success=success,
+            error_message=error_message
+        )
+
+        # DB에 기록
+        record_id = self.db.add_report(record)
+
+        return record.markdown_path, record.html_path, record_id
+
+    def save_reports(self, batch: List[Dict[str, Any]]) -> List[Tuple[str, str, int]]:
+        """
+        여러 리포트를 저장하고 DB에는 한 트랜잭션으로 기록 (배치 분석용)
+
+        Args:
+            batch: save_report 인자 딕셔너리 목록
+
+        Returns:
+            List[Tuple[str, str, int]]: batch 순서대로의 (markdown_path, html_path, record_id)
+        """
+        if not batch:
+            return []
+
+        # 파일 저장은 서로 독립적이므로 동시에 수행
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(batch))) as executor:
+            records = list(executor.map(
+                lambda item: self._write_report_files(
+                    filename=item['filename'],
+                    report_markdown=item['report_markdown'],
+                    analysis_time=item.get('analysis_time', 0.0),
+                    success=item.get('success', True),
+                    error_message=item.get('error_message', "")
+                ),
+                batch
+            ))
+
+        record_ids = self.db.add_reports(records)
+
+        return [
+            (record.markdown_path, record.html_path, record_id)
+            for record, record_id in zip(records, record_ids)
+        ]
+
+    def _write_report_files(
+        self,
+        filename: str,
+        report_markdown: str,
+        analysis_time: float,
+        success: bool,
+        error_message: str
+    ) -> ReportRecord:
+        """
+        Markdown/HTML 리포트 파일을 저장하고 DB에 기록할 레코드 생성
+
+        Args:
+            filename: 원본 파일명
+            report_markdown: Markdown 리포트
+            analysis_time: 분석 소요 시간 (초)
+            success: 성공 여부
+            error_message: 에러 메시지
+
+        Returns:
+            ReportRecord: 아직 DB에 추가되지 않은 레코드
+        """
+        # 타임스탬프 생성 (YYYYMMDD_HHMMSS 형식을 한 번만 포맷하고 표시용 형식은 잘라서 조합)
         timestamp = datetime.now()
-        timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S")
+        timestamp_str = f"{timestamp:%Y%m%d_%H%M%S}"
         timestamp_iso = timestamp.isoformat()
+        timestamp_display = (
+            f"{timestamp_str[:4]}-{timestamp_str[4:6]}-{timestamp_str[6:8]} "
+            f"{timestamp_str[9:11]}:{timestamp_str[11:13]}:{timestamp_str[13:15]}"
+        )
 
         # 파일명 생성
         base_name = Path(filename).stem
@@ -83,22 +385,25 @@ class ReportSaver:
         markdown_path = self.markdown_dir / markdown_filename
         html_path = self.html_dir / html_filename
 
-        # Markdown 리포트 저장
-        with open(markdown_path, 'w', encoding='utf-8') as f:
-            f.write(report_markdown)
-
-        # HTML 변환 및 저장
-        html_content = self._convert_markdown_to_html(
-            report_markdown=report_markdown,
-            filename=filename,
-            timestamp_str=timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        # Markdown 리포트 저장과 HTML 변환/저장을 동시에 수행
+        md_future = self._io_pool.submit(markdown_path.write_text, report_markdown, encoding='utf-8')
+
+        # HTML은 문서 전체를 한 문자열로 만들지 않고 조각 단위로 기록
+        html_future = self._io_pool.submit(
+            self._write_chunks,
+            html_path,
+            self._html_chunks(
+                report_markdown=report_markdown,
+                filename=filename,
+                timestamp_str=timestamp_display
+            )
         )
 
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # 두 파일이 모두 기록된 뒤에 DB 레코드 생성 (쓰기 오류는 여기서 전파)
+        md_future.result()
+        html_future.result()
 
-        # DB에 기록
-        record = ReportRecord(
+        return ReportRecord(
             filename=filename,
             report_name=report_name,
             timestamp=timestamp_iso,
@@ -109,9 +414,17 @@ class ReportSaver:
             analysis_time=analysis_time
         )
 
-        record_id = self.db.add_report(record)
+    def _write_stylesheet(self) -> None:
+        """HTML 리포트가 링크하는 style.css를 html 디렉토리에 저장"""
+        stylesheet_path = self.html_dir / _STYLESHEET_NAME
+        if stylesheet_path.exists() and stylesheet_path.read_text(encoding='utf-8') == _CSS:
+            return
+        stylesheet_path.write_text(_CSS, encoding='utf-8')
 
-        return str(markdown_path), str(html_path), record_id
+    def close(self) -> None:
+        """파일 쓰기 스레드와 DB 연결 종료"""
+        self._io_pool.shutdown(wait=True)
+        self.db.close()
 
     def _convert_markdown_to_html(
         self,
@@ -130,220 +443,48 @@ class ReportSaver:
         Returns:
             str: HTML 문서
         """
-        # Markdown → HTML 변환 (코드 하이라이팅, 테이블 지원)
-        md = markdown.Markdown(
-            extensions=[
-                'fenced_code',  # 코드 블록 지원
-                'tables',       # 테이블 지원
-                'nl2br',        # 줄바꿈 지원
-                'sane_lists'    # 리스트 개선
-            ]
-        )
+        return ''.join(self._html_chunks(report_markdown, filename, timestamp_str))
 
-        html_body = md.convert(report_markdown)
+    def _html_chunks(
+        self,
+        report_markdown: str,
+        filename: str,
+        timestamp_str: str
+    ) -> Iterator[str]:
+        """
+        HTML 문서를 머리말, 본문, 꼬리말 조각으로 생성
 
-        # 완전한 HTML 문서 생성
-        html_template = f"""<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>코드 리뷰 리포트 - {filename}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-            line-height: 1.6;
-            color: #d4d4d4;
-            background-color: #1e1e1e;
-            padding: 20px;
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-
-        .header {{
-            background: #252526;
-            padding: 30px;
-            border-radius: 8px;
-            margin-bottom: 30px;
-            border-left: 4px solid #007acc;
-        }}
-
-        .header h1 {{
-            color: #ffffff;
-            font-size: 28px;
-            margin-bottom: 10px;
-        }}
-
-        .header .meta {{
-            color: #858585;
-            font-size: 14px;
-        }}
-
-        .content {{
-            background: #252526;
-            padding: 30px;
-            border-radius: 8px;
-        }}
-
-        h1 {{
-            color: #4ec9b0;
-            border-bottom: 2px solid #007acc;
-            padding-bottom: 10px;
-            margin: 30px 0 20px 0;
-            font-size: 24px;
-        }}
-
-        h2 {{
-            color: #569cd6;
-            margin: 25px 0 15px 0;
-            font-size: 20px;
-        }}
-
-        h3 {{
-            color: #dcdcaa;
-            margin: 20px 0 10px 0;
-            font-size: 18px;
-        }}
-
-        p {{
-            margin: 10px 0;
-        }}
-
-        ul, ol {{
-            margin: 10px 0 10px 30px;
-        }}
-
-        li {{
-            margin: 5px 0;
-        }}
-
-        code {{
-            background: #1e1e1e;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
-            color: #ce9178;
-            font-size: 14px;
-        }}
-
-        pre {{
-            background: #1e1e1e;
-            padding: 15px;
-            border-radius: 5px;
-            overflow-x: auto;
-            margin: 15px 0;
-            border: 1px solid #3e3e42;
-        }}
-
-        pre code {{
-            background: none;
-            padding: 0;
-            color: #d4d4d4;
-        }}
-
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 15px 0;
-        }}
-
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border: 1px solid #3e3e42;
-        }}
-
-        th {{
-            background: #094771;
-            color: #ffffff;
-            font-weight: 600;
-        }}
-
-        tr:nth-child(even) {{
-            background: #2d2d30;
-        }}
-
-        blockquote {{
-            border-left: 4px solid #007acc;
-            padding-left: 15px;
-            margin: 15px 0;
-            color: #858585;
-            font-style: italic;
-        }}
-
-        .footer {{
-            text-align: center;
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 1px solid #3e3e42;
-            color: #858585;
-            font-size: 14px;
-        }}
-
-        a {{
-            color: #4fc3f7;
-            text-decoration: none;
-        }}
-
-        a:hover {{
-            text-decoration: underline;
-        }}
-
-        .badge {{
-            display: inline-block;
-            padding: 3px 8px;
-            border-radius: 3px;
-            font-size: 12px;
-            font-weight: 600;
-            margin-right: 5px;
-        }}
-
-        .badge-success {{
-            background: #388e3c;
-            color: #ffffff;
-        }}
-
-        .badge-warning {{
-            background: #f57c00;
-            color: #ffffff;
-        }}
-
-        .badge-error {{
-            background: #d32f2f;
-            color: #ffffff;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>📋 코드 리뷰 리포트</h1>
-        <div class="meta">
-            <strong>파일:</strong> {filename} |
-            <strong>생성 시각:</strong> {timestamp_str}
-        </div>
-    </div>
+        Args:
+            report_markdown: Markdown 리포트
+            filename: 파일명
+            timestamp_str: 타임스탬프 문자열
 
-    <div class="content">
-        {html_body}
-    </div>
+        Yields:
+            str: HTML 문서 조각
+        """
+        # 파일명은 한 번만 이스케이프해 <title>과 머리말 두 곳에 같은 값으로 치환
+        yield _HTML_HEAD.format(
+            stylesheet=_STYLESHEET_NAME,
+            filename=html.escape(filename),
+            timestamp_str=timestamp_str
+        )
 
-    <div class="footer">
-        <p>Generated by <strong>C# Code Reviewer</strong> | Powered by Phi-3-mini</p>
-    </div>
-</body>
-</html>
-"""
+        # Markdown → HTML 변환 (코드 하이라이팅, 테이블 지원)
+        with self._md_lock:
+            html_body = self._md.reset().convert(report_markdown)
+
+        yield html_body
+        yield _HTML_FOOTER
 
-        return html_template
+    @staticmethod
+    def _write_chunks(path: Path, chunks: Iterable[str]) -> None:
+        """문자열 조각을 차례로 파일에 기록"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(chunks)
 
 
 # 편의 함수
+@lru_cache(maxsize=1)
 def get_report_saver() -> ReportSaver:
     """전역 ReportSaver 인스턴스 반환"""
     return ReportSaver()
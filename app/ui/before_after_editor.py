@@ -5,14 +5,18 @@ This module provides a split-view code editor with Before (input) and After (out
 """
 
 import sys
+from difflib import SequenceMatcher
 from pathlib import Path
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
+    QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QAbstractScrollArea,
     QPlainTextEdit, QPushButton, QLabel, QFrame, QCheckBox, QTextEdit
 )
-from PySide6.QtCore import Qt, Signal, QRect, QSize
-from PySide6.QtGui import QFont, QTextCursor, QColor, QPainter, QTextFormat
+from PySide6.QtCore import Qt, Signal, QRect, QSize, QEvent, QTimer
+from PySide6.QtGui import (
+    QFont, QTextCursor, QColor, QPainter, QTextFormat, QTextCharFormat,
+    QStaticText, QTransform, QGuiApplication
+)
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -27,6 +31,9 @@ class LineNumberArea(QWidget):
         super().__init__(editor)
         self.code_editor = editor
 
+        # paintEvent fills its whole exposed rect, so Qt need not erase it first
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
     def sizeHint(self):
         """Return size hint for line number area."""
         return QSize(self.code_editor.line_number_area_width(), 0)
@@ -39,9 +46,30 @@ class LineNumberArea(QWidget):
 class CodeEditor(QPlainTextEdit):
     """Enhanced QPlainTextEdit for code editing with line numbers and syntax highlighting."""
 
+    # Maximum number of cached line number labels
+    STATIC_NUMBER_CACHE_SIZE = 8192
+
     def __init__(self, parent=None, read_only=False):
         super().__init__(parent)
 
+        # Line number width cache (refreshed on font change)
+        self._digit_advance = self.fontMetrics().horizontalAdvance('9')
+        self._line_number_width_key = None
+        self._line_number_width = 0
+
+        # Pre-laid-out line number labels, keyed by line number
+        self._static_numbers: dict[int, QStaticText] = {}
+
+        # Line number area colors (built once instead of per paint)
+        self._line_number_background = QColor("#252526")
+        self._line_number_color = QColor("#858585")
+
+        # Current line highlight (format built once; skipped while on the same line)
+        self._current_line_format = QTextCharFormat()
+        self._current_line_format.setBackground(QColor("#2a2a2a"))  # Slightly lighter than background
+        self._current_line_format.setProperty(QTextFormat.Property.FullWidthSelection, True)
+        self._highlighted_block = None
+
         # Set monospace font
         font = QFont("Monaco, Consolas, Courier New", 12)
         font.setStyleHint(QFont.StyleHint.Monospace)
@@ -55,6 +83,11 @@ class CodeEditor(QPlainTextEdit):
         # Placeholder text
         if not read_only:
             self.setPlaceholderText("Paste your C# code here...")
+        else:
+            # Output is only ever replaced programmatically: keep no undo history
+            # (set_text_diffed edits would otherwise grow the undo stack)
+            self.setUndoRedoEnabled(False)
+            self.setCenterOnScroll(False)
 
         # Line number area
         self.line_number_area = LineNumberArea(self)
@@ -73,15 +106,25 @@ class CodeEditor(QPlainTextEdit):
 
     def line_number_area_width(self):
         """Calculate width for line number area."""
-        digits = 1
-        max_num = max(1, self.blockCount())
-        while max_num >= 10:
-            max_num //= 10
-            digits += 1
+        block_count = self.blockCount()
+        if block_count != self._line_number_width_key:
+            digits = len(str(max(1, block_count)))
 
-        # Width = 10px padding + digit width + 10px padding
-        space = 10 + self.fontMetrics().horizontalAdvance('9') * digits + 10
-        return space
+            # Width = 10px padding + digit width + 10px padding
+            self._line_number_width = 10 + self._digit_advance * digits + 10
+            self._line_number_width_key = block_count
+
+        return self._line_number_width
+
+    def changeEvent(self, event):
+        """Refresh cached font metrics when the font changes."""
+        super().changeEvent(event)
+
+        if event.type() == QEvent.Type.FontChange:
+            self._digit_advance = self.fontMetrics().horizontalAdvance('9')
+            self._line_number_width_key = None
+            self._static_numbers.clear()
+            self.update_line_number_area_width(0)
 
     def update_line_number_area_width(self, _):
         """Update viewport margins when line count changes."""
@@ -108,14 +151,17 @@ class CodeEditor(QPlainTextEdit):
 
     def highlight_current_line(self):
         """Highlight the current line."""
+        # The selection cursor follows edits, so nothing changes until the line does
+        block_number = -1 if self.isReadOnly() else self.textCursor().blockNumber()
+        if block_number == self._highlighted_block:
+            return
+        self._highlighted_block = block_number
+
         extra_selections = []
 
         if not self.isReadOnly():
             selection = QTextEdit.ExtraSelection()
-            line_color = QColor("#2a2a2a")  # Slightly lighter than background
-
-            selection.format.setBackground(line_color)
-            selection.format.setProperty(QTextFormat.Property.FullWidthSelection, True)
+            selection.format = self._current_line_format
             selection.cursor = self.textCursor()
             selection.cursor.clearSelection()
             extra_selections.append(selection)
@@ -125,34 +171,194 @@ class CodeEditor(QPlainTextEdit):
     def line_number_area_paint_event(self, event):
         """Paint line numbers in the line number area."""
         painter = QPainter(self.line_number_area)
-        painter.fillRect(event.rect(), QColor("#252526"))  # Dark background
+        painter.fillRect(event.rect(), self._line_number_background)  # Dark background
 
         block = self.firstVisibleBlock()
         block_number = block.blockNumber()
         top = self.blockBoundingGeometry(block).translated(self.contentOffset()).top()
-        bottom = top + self.blockBoundingRect(block).height()
+
+        # Lines never wrap (NoWrap), so every block has the first block's height
+        line_height = self.blockBoundingRect(block).height()
+        bottom = top + line_height
+
+        painter.setFont(self.font())
+        painter.setPen(self._line_number_color)  # Gray text
+        right = self.line_number_area.width() - 5
 
         # Draw line numbers
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
-                number = str(block_number + 1)
-                painter.setPen(QColor("#858585"))  # Gray text
-                painter.drawText(
-                    0, int(top), self.line_number_area.width() - 5,
-                    self.fontMetrics().height(),
-                    Qt.AlignmentFlag.AlignRight, number
-                )
+                number = self._static_number(block_number + 1)
+                painter.drawStaticText(int(right - number.size().width()), int(top), number)
 
             block = block.next()
             top = bottom
-            bottom = top + self.blockBoundingRect(block).height()
+            bottom = top + line_height
             block_number += 1
 
 
+    def _static_number(self, number):
+        """Return a cached, pre-laid-out label for a line number."""
+        static_text = self._static_numbers.get(number)
+        if static_text is None:
+            if len(self._static_numbers) >= self.STATIC_NUMBER_CACHE_SIZE:
+                self._static_numbers.clear()
+
+            static_text = QStaticText(str(number))
+            static_text.setTextFormat(Qt.TextFormat.PlainText)
+            static_text.prepare(QTransform(), self.font())
+            self._static_numbers[number] = static_text
+
+        return static_text
+
+
+class LazyCodeViewer(QAbstractScrollArea):
+    """
+    Read-only code view that lays out only the visible lines.
+
+    Lines live in a plain Python list and each paint draws just the rows in
+    the viewport, so memory and paint cost do not grow with the document.
+    Used by EditorPanel for very large outputs (no syntax highlighting).
+    """
+
+    # Maximum number of cached line labels
+    STATIC_LINE_CACHE_SIZE = 4096
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self._text = ""
+        self._lines: list[str] = [""]
+        self._longest_line = 0
+
+        # Pre-laid-out line labels, keyed by line index
+        self._static_lines: dict[int, QStaticText] = {}
+
+        # Colors (dark theme, same as CodeEditor)
+        self._background = QColor("#1e1e1e")
+        self._text_color = QColor("#d4d4d4")
+        self._line_number_background = QColor("#252526")
+        self._line_number_color = QColor("#858585")
+
+        self._line_height = 1
+        self._digit_advance = 1
+
+        # Set monospace font (metrics are refreshed in changeEvent)
+        font = QFont("Monaco, Consolas, Courier New", 12)
+        font.setStyleHint(QFont.StyleHint.Monospace)
+        self.setFont(font)
+        self._update_metrics()
+
+    def text(self) -> str:
+        """Return the full text."""
+        return self._text
+
+    def set_lines(self, lines: list[str]):
+        """Replace the displayed lines (scroll position is kept)."""
+        self._lines = lines or [""]
+        self._text = '\n'.join(self._lines)
+        self._longest_line = max(map(len, self._lines))
+        self._static_lines.clear()
+        self._update_scroll_bars()
+        self.viewport().update()
+
+    def line_number_area_width(self):
+        """Width of the line number gutter."""
+        digits = len(str(len(self._lines)))
+        return 10 + self._digit_advance * digits + 10
+
+    def changeEvent(self, event):
+        """Refresh cached font metrics when the font changes."""
+        super().changeEvent(event)
+
+        if event.type() == QEvent.Type.FontChange:
+            self._update_metrics()
+
+    def resizeEvent(self, event):
+        """Recompute scroll ranges for the new viewport size."""
+        super().resizeEvent(event)
+        self._update_scroll_bars()
+
+    def scrollContentsBy(self, dx, dy):
+        """Repaint the viewport; rows are positioned from the scroll bars."""
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        """Paint only the rows that intersect the exposed rect."""
+        painter = QPainter(self.viewport())
+        rect = event.rect()
+        painter.fillRect(rect, self._background)
+        painter.setFont(self.font())
+
+        first_line = self.verticalScrollBar().value()
+        first_row = rect.top() // self._line_height
+        last_row = rect.bottom() // self._line_height
+        end = min(len(self._lines), first_line + last_row + 1)
+
+        # Text first; the gutter is painted over anything scrolled under it
+        gutter_width = self.line_number_area_width()
+        x = gutter_width + 5 - self.horizontalScrollBar().value()
+        painter.setPen(self._text_color)
+        for index in range(first_line + first_row, end):
+            y = (index - first_line) * self._line_height
+            painter.drawStaticText(x, y, self._static_line(index))
+
+        painter.fillRect(0, rect.top(), gutter_width, rect.height(), self._line_number_background)
+        painter.setPen(self._line_number_color)
+        for index in range(first_line + first_row, end):
+            y = (index - first_line) * self._line_height
+            painter.drawText(
+                QRect(0, y, gutter_width - 5, self._line_height),
+                Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                str(index + 1)
+            )
+
+    def _static_line(self, index):
+        """Return a cached, pre-laid-out label for a line."""
+        static_text = self._static_lines.get(index)
+        if static_text is None:
+            if len(self._static_lines) >= self.STATIC_LINE_CACHE_SIZE:
+                self._static_lines.clear()
+
+            static_text = QStaticText(self._lines[index].expandtabs(4))
+            static_text.setTextFormat(Qt.TextFormat.PlainText)
+            static_text.prepare(QTransform(), self.font())
+            self._static_lines[index] = static_text
+
+        return static_text
+
+    def _update_metrics(self):
+        """Cache line height and digit width for the current font."""
+        metrics = self.fontMetrics()
+        self._line_height = max(1, metrics.lineSpacing())
+        self._digit_advance = metrics.horizontalAdvance('9')
+        self._static_lines.clear()
+        self._update_scroll_bars()
+        self.viewport().update()
+
+    def _update_scroll_bars(self):
+        """Set scroll ranges; the vertical scroll bar counts lines, like QPlainTextEdit."""
+        viewport = self.viewport()
+        visible_lines = max(1, viewport.height() // self._line_height)
+
+        vertical = self.verticalScrollBar()
+        vertical.setPageStep(visible_lines)
+        vertical.setRange(0, max(0, len(self._lines) - visible_lines))
+
+        content_width = self.line_number_area_width() + 5 + self._longest_line * self._digit_advance
+        horizontal = self.horizontalScrollBar()
+        horizontal.setPageStep(viewport.width())
+        horizontal.setRange(0, max(0, content_width - viewport.width()))
+
+
 class EditorPanel(QWidget):
     """Single editor panel with label and copy button."""
 
     copy_clicked = Signal()  # Signal emitted when copy button is clicked
+    text_changed = Signal()  # Emitted when the displayed text changes
+
+    # Read-only panels switch to LazyCodeViewer above this many lines
+    LAZY_VIEW_MIN_LINES = 2000
 
     def __init__(self, title: str, read_only: bool = False, parent=None):
         super().__init__(parent)
@@ -187,43 +393,170 @@ class EditorPanel(QWidget):
         # Editor
         self.editor = CodeEditor(read_only=read_only)
 
+        self.editor.textChanged.connect(self.text_changed)
+
         # Apply syntax highlighter
         self.highlighter = CSharpSyntaxHighlighter(self.editor.document())
 
         layout.addWidget(self.editor)
 
+        # Virtualized view for very large read-only text (hidden until needed)
+        self.lazy_viewer = None
+        if read_only:
+            self.lazy_viewer = LazyCodeViewer()
+            self.lazy_viewer.hide()
+            layout.addWidget(self.lazy_viewer)
+
+    @property
+    def view(self):
+        """The widget currently showing the text (editor or lazy viewer)."""
+        return self.lazy_viewer if self._is_lazy() else self.editor
+
+    def _is_lazy(self) -> bool:
+        """Whether the lazy viewer currently holds the text."""
+        return self.lazy_viewer is not None and not self.lazy_viewer.isHidden()
+
     def get_text(self) -> str:
         """Get editor text content."""
+        if self._is_lazy():
+            return self.lazy_viewer.text()
         return self.editor.toPlainText()
 
+    def _set_lazy_text(self, text: str) -> bool:
+        """
+        Show text in the lazy viewer if it is large enough (read-only panels only).
+
+        Returns:
+            bool: True if the lazy viewer now shows the text
+        """
+        if self.lazy_viewer is None:
+            return False
+
+        lines = text.split('\n')
+        if len(lines) <= self.LAZY_VIEW_MIN_LINES:
+            if self._is_lazy():
+                # Back to the editor; it is refilled by the caller
+                self.lazy_viewer.hide()
+                self.lazy_viewer.set_lines([])
+                self.editor.show()
+            return False
+
+        self.lazy_viewer.set_lines(lines)
+        if self.lazy_viewer.isHidden():
+            self.lazy_viewer.verticalScrollBar().setValue(
+                self.editor.verticalScrollBar().value()
+            )
+            self.editor.hide()
+            self.lazy_viewer.show()
+
+        # Drop the editor's blocks; get_text() now reads from the viewer
+        self.highlighter.setDocument(None)
+        self.editor.clear()
+        self.text_changed.emit()
+        return True
+
     def set_text(self, text: str):
         """Set editor text content."""
+        if self._set_lazy_text(text):
+            return
+
+        # Detach the highlighter while loading; re-attaching schedules a single
+        # deferred rehighlight, so the text is painted before it is coloured
+        self.highlighter.setDocument(None)
         self.editor.setPlainText(text)
+        self.highlighter.setDocument(self.editor.document())
+
+    def set_text_diffed(self, text: str):
+        """
+        Set editor text content by patching only the lines that changed.
+
+        Unlike set_text(), untouched blocks keep their layout and highlighting,
+        so small revisions (and streamed output that only grows) do not
+        rebuild and rehighlight the whole document.
+        """
+        was_lazy = self._is_lazy()
+        if self._set_lazy_text(text):
+            return
+        if was_lazy:
+            # Coming back from the lazy viewer: the editor is empty
+            self.set_text(text)
+            return
+
+        document = self.editor.document()
+        old_lines = self.editor.toPlainText().split('\n')
+        new_lines = text.split('\n')
+
+        opcodes = SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes()
+        if all(tag == 'equal' for tag, *_ in opcodes):
+            return
+
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+
+        # Apply from the bottom up so earlier block numbers stay valid
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == 'equal':
+                continue
+
+            replacement = '\n'.join(new_lines[j1:j2])
+
+            if i1 == i2:
+                # Insert whole lines before block i1 (or after the last block)
+                if i1 < document.blockCount():
+                    cursor.setPosition(document.findBlockByNumber(i1).position())
+                    cursor.insertText(replacement + '\n')
+                else:
+                    cursor.movePosition(QTextCursor.MoveOperation.End)
+                    cursor.insertText('\n' + replacement)
+                continue
+
+            first = document.findBlockByNumber(i1)
+            last = document.findBlockByNumber(i2 - 1)
+            start = first.position()
+            end = last.position() + last.length() - 1
+
+            if j1 == j2:
+                # Delete whole lines including one line separator
+                if i2 < document.blockCount():
+                    end += 1
+                elif i1 > 0:
+                    start -= 1
+
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(replacement)
+
+        cursor.endEditBlock()
 
     def clear(self):
         """Clear editor content."""
+        if self._is_lazy():
+            self.set_text("")
+            return
         self.editor.clear()
 
     def copy_to_clipboard(self):
-        """Copy editor content to clipboard."""
-        self.editor.selectAll()
-        self.editor.copy()
-        # Clear selection
-        cursor = self.editor.textCursor()
-        cursor.clearSelection()
-        self.editor.setTextCursor(cursor)
+        """Copy editor content to clipboard (plain text, selection untouched)."""
+        QGuiApplication.clipboard().setText(self.get_text())
 
 
 class BeforeAfterEditor(QWidget):
     """Split-view code editor with Before and After panels."""
 
-    # Signals
+    # Signals (debounced: emitted once per burst of edits)
     before_text_changed = Signal(str)  # Emitted when before text changes
     after_text_changed = Signal(str)   # Emitted when after text changes
 
+    # Delay before emitting *_text_changed after the last edit (ms)
+    TEXT_CHANGED_DELAY_MS = 100
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
+        # Coalesce textChanged so the document is copied once per edit burst
+        self._before_emit_timer = self._create_emit_timer(self._flush_before_emit)
+        self._after_emit_timer = self._create_emit_timer(self._flush_after_emit)
+
         # Scroll synchronization state
         self.scroll_sync_enabled = True
         self._is_syncing = False  # Prevent infinite loop
@@ -254,16 +587,17 @@ class BeforeAfterEditor(QWidget):
         # Before panel (editable)
         self.before_panel = EditorPanel("Before (Original Code)", read_only=False)
         self.before_panel.copy_clicked.connect(self._on_before_copy)
-        self.before_panel.editor.textChanged.connect(self._on_before_text_changed)
+        self.before_panel.text_changed.connect(self._on_before_text_changed)
 
         # After panel (read-only)
         self.after_panel = EditorPanel("After (Improved Code)", read_only=True)
         self.after_panel.copy_clicked.connect(self._on_after_copy)
-        self.after_panel.editor.textChanged.connect(self._on_after_text_changed)
+        self.after_panel.text_changed.connect(self._on_after_text_changed)
 
         # Connect scroll events for synchronization
         self.before_panel.editor.verticalScrollBar().valueChanged.connect(self._on_before_scroll)
         self.after_panel.editor.verticalScrollBar().valueChanged.connect(self._on_after_scroll)
+        self.after_panel.lazy_viewer.verticalScrollBar().valueChanged.connect(self._on_after_scroll)
 
         # Add panels to splitter
         self.splitter.addWidget(self.before_panel)
@@ -288,8 +622,8 @@ class BeforeAfterEditor(QWidget):
         self.before_panel.set_text(text)
 
     def set_after_text(self, text: str):
-        """Set text in After editor."""
-        self.after_panel.set_text(text)
+        """Set text in After editor (only changed lines are replaced)."""
+        self.after_panel.set_text_diffed(text)
 
     def clear_before(self):
         """Clear Before editor."""
@@ -312,15 +646,29 @@ class BeforeAfterEditor(QWidget):
         """Handle After copy button click."""
         self.after_panel.copy_to_clipboard()
 
+    def _create_emit_timer(self, slot):
+        """Create a single-shot timer used to debounce a text-changed signal."""
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(self.TEXT_CHANGED_DELAY_MS)
+        timer.timeout.connect(slot)
+        return timer
+
     def _on_before_text_changed(self):
-        """Handle Before text changed."""
-        text = self.get_before_text()
-        self.before_text_changed.emit(text)
+        """Handle Before text changed (restarts the debounce timer)."""
+        self._before_emit_timer.start()
 
     def _on_after_text_changed(self):
-        """Handle After text changed."""
-        text = self.get_after_text()
-        self.after_text_changed.emit(text)
+        """Handle After text changed (restarts the debounce timer)."""
+        self._after_emit_timer.start()
+
+    def _flush_before_emit(self):
+        """Emit before_text_changed with the current Before text."""
+        self.before_text_changed.emit(self.get_before_text())
+
+    def _flush_after_emit(self):
+        """Emit after_text_changed with the current After text."""
+        self.after_text_changed.emit(self.get_after_text())
 
     def _on_sync_toggle(self, state):
         """Handle scroll sync checkbox toggle."""
@@ -330,33 +678,21 @@ class BeforeAfterEditor(QWidget):
         """Handle Before editor scroll event."""
         if self.scroll_sync_enabled and not self._is_syncing:
             self._is_syncing = True
-            self._sync_scroll(self.before_panel.editor, self.after_panel.editor)
+            self._sync_scroll(self.before_panel.view, self.after_panel.view)
             self._is_syncing = False
 
     def _on_after_scroll(self, value):
         """Handle After editor scroll event."""
         if self.scroll_sync_enabled and not self._is_syncing:
             self._is_syncing = True
-            self._sync_scroll(self.after_panel.editor, self.before_panel.editor)
+            self._sync_scroll(self.after_panel.view, self.before_panel.view)
             self._is_syncing = False
 
     def _sync_scroll(self, source_editor, target_editor):
-        """Synchronize scroll position from source to target editor."""
-        source_scrollbar = source_editor.verticalScrollBar()
-        target_scrollbar = target_editor.verticalScrollBar()
-
-        # Get scroll position as percentage
-        source_max = source_scrollbar.maximum()
-        target_max = target_scrollbar.maximum()
-
-        if source_max > 0:
-            # Calculate percentage of scroll
-            percentage = source_scrollbar.value() / source_max
-
-            # Apply to target
-            if target_max > 0:
-                target_value = int(percentage * target_max)
-                target_scrollbar.setValue(target_value)
+        """Synchronize scroll position from source to target editor (line-aligned)."""
+        # QPlainTextEdit's vertical scroll bar counts blocks (no wrapping here),
+        # so its value is the first visible line; setValue clamps to the target range
+        target_editor.verticalScrollBar().setValue(source_editor.verticalScrollBar().value())
 
 
 # Test the editor
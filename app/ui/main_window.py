@@ -5,6 +5,7 @@ This module provides the main application window with menu bar, toolbar, and sta
 """
 
 import sys
+import logging
 from pathlib import Path
 from typing import List
 
@@ -28,9 +29,12 @@ from app.core.api_client import APIClient, APIClientError
 from app.core.prompt_builder import PromptBuilder, ReviewCategory, OutputFormat
 from app.core.report_generator import ReportGenerator
 from app.core.batch_analyzer import BatchAnalyzer, BatchAnalysisResult
+from app.core.llm_cache import LLMCache
 from app.utils.markdown_renderer import MarkdownRenderer
 from app.services.report_saver import ReportSaver
 
+logger = logging.getLogger(__name__)
+
 
 class MainWindow(QMainWindow):
     """Main application window."""
@@ -44,6 +48,7 @@ class MainWindow(QMainWindow):
 
         # Initialize Ollama client
         self.api_client = None
+        self._batch_api_client = None  # 배치 전용 결정적(temperature=0) 클라이언트
         self.ollama_status = "Disconnected"
 
         # Initialize Prompt Builder
@@ -54,6 +59,10 @@ class MainWindow(QMainWindow):
 
         # Initialize Report Saver
         self.report_saver = ReportSaver()
+        # 배치 분석 결과 캐시 (창 수명 동안 연결 하나를 재사용, 종료 시 report_saver와 함께 닫음)
+        self.batch_result_cache = LLMCache("cache/batch_results.db")
+        # 배치 클라이언트의 LLM 응답 캐시 (같은 프롬프트 재요청 시 API 호출 생략)
+        self.llm_cache = LLMCache()
 
         # Initialize Markdown Renderer (for HTML export)
         self.markdown_renderer = MarkdownRenderer(theme="monokai")
@@ -676,15 +685,12 @@ class MainWindow(QMainWindow):
                 include_examples=True
             )
 
-            # 시스템 프롬프트와 사용자 프롬프트 결합
-            full_prompt = f"{self.prompt_builder.SYSTEM_PROMPT}\n\n{prompt}"
+            # 시스템 프롬프트는 별도 전달 (프로바이더 프롬프트 캐시 활용)
+            system_prompt = self.prompt_builder.SYSTEM_PROMPT
 
-            # 디버깅: 프롬프트 출력
-            print("\n" + "="*80)
-            print("📝 전송되는 프롬프트:")
-            print("="*80)
-            print(full_prompt)
-            print("="*80 + "\n")
+            # 디버깅: 프롬프트 출력 (DEBUG 레벨에서만 긴 프롬프트 문자열 생성)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📝 전송되는 프롬프트:\n%s\n\n%s", system_prompt, prompt)
 
             # Step 2: LLM 분석 (30%)
             progress.setLabelText("AI 분석 중... (실시간 생성)")
@@ -695,21 +701,22 @@ class MainWindow(QMainWindow):
                 return
 
             # Ollama로 코드 분석 (스트리밍 활성화)
-            improved_code = ""
+            chunks: list[str] = []
             token_count = 0
 
             try:
                 # Generator를 받아서 토큰 단위로 실시간 처리
                 for token in self.api_client.analyze_code(
-                    prompt=full_prompt,
+                    prompt=prompt,
+                    system_prompt=system_prompt,
                     stream=True  # 스트리밍 활성화
                 ):
-                    improved_code += token
+                    chunks.append(token)
                     token_count += 1
 
                     # 50 토큰마다 UI 업데이트 (과도한 업데이트 방지)
                     if token_count % 50 == 0:
-                        self.editor.set_after_text(improved_code)
+                        self.editor.set_after_text("".join(chunks))
                         progress.setLabelText(
                             f"AI 분석 중... ({token_count} tokens 생성됨)"
                         )
@@ -721,6 +728,7 @@ class MainWindow(QMainWindow):
                         return
 
                 # 최종 업데이트
+                improved_code = "".join(chunks)
                 self.editor.set_after_text(improved_code)
 
             except Exception as e:
@@ -1049,6 +1057,34 @@ class MainWindow(QMainWindow):
         dialog.setLayout(layout)
         dialog.exec()
 
+    def _get_batch_api_client(self) -> APIClient:
+        """
+        배치 분석용 API 클라이언트 (연결된 클라이언트와 같은 모델, temperature=0)
+
+        결과 캐시와 응답 캐시는 재현 가능한(temperature=0) 응답만 저장하므로 배치는 별도의
+        결정적 클라이언트로 요청하고, 응답 캐시(llm_cache)를 연결합니다. 모델이 바뀌면 새로 만듭니다.
+        """
+        client = self._batch_api_client
+        if client is None or (client.provider, client.model_name) != (
+            self.api_client.provider, self.api_client.model_name
+        ):
+            client = APIClient(
+                provider=self.api_client.provider,
+                model_name=self.api_client.model_name,
+                temperature=0.0,
+                cache=self.llm_cache
+            )
+            self._batch_api_client = client
+        return client
+
+    def _create_batch_analyzer(self) -> BatchAnalyzer:
+        """배치 분석기 생성 (변경되지 않은 파일은 이전 분석 결과를 재사용하여 LLM 호출 생략)"""
+        return BatchAnalyzer(
+            api_client=self._get_batch_api_client(),
+            prompt_builder=self.prompt_builder,
+            result_cache=self.batch_result_cache
+        )
+
     def _analyze_multiple_files(self, file_paths: List[str]):
         """
         다중 파일 배치 분석 (Day 11)
@@ -1064,11 +1100,7 @@ class MainWindow(QMainWindow):
             )
             return
 
-        # 배치 분석기 생성
-        batch_analyzer = BatchAnalyzer(
-            api_client=self.api_client,
-            prompt_builder=self.prompt_builder
-        )
+        batch_analyzer = self._create_batch_analyzer()
 
         # 프로그레스 다이얼로그 생성
         progress = QProgressDialog(
@@ -1119,21 +1151,24 @@ class MainWindow(QMainWindow):
             progress.close()
 
             # 성공한 파일들의 리포트 자동 저장
+            # (파일 저장 후 DB에는 한 트랜잭션으로 기록)
             saved_count = 0
-            for result in batch_result.results:
-                if result.success:
-                    try:
-                        md_path, html_path, record_id = self.report_saver.save_report(
-                            filename=result.file_name,
-                            original_code=result.original_code,
-                            improved_code=result.improved_code,
-                            report_markdown=result.report_markdown,
-                            analysis_time=result.analysis_time,
-                            success=True
-                        )
-                        saved_count += 1
-                    except Exception as save_error:
-                        print(f"{result.file_name} 리포트 저장 실패: {save_error}")
+            save_batch = [
+                {
+                    'filename': result.file_name,
+                    'original_code': result.original_code,
+                    'improved_code': result.get_improved_code(),
+                    'report_markdown': result.report_markdown,
+                    'analysis_time': result.analysis_time,
+                    'success': True
+                }
+                for result in batch_result.results
+                if result.success
+            ]
+            try:
+                saved_count = len(self.report_saver.save_reports(save_batch))
+            except Exception as save_error:
+                print(f"배치 리포트 저장 실패: {save_error}")
 
             # 결과 요약 다이얼로그 표시
             self._show_batch_results_dialog(batch_result, saved_count)
@@ -1170,6 +1205,9 @@ class MainWindow(QMainWindow):
             )
 
         finally:
+            # 결과 다이얼로그까지 닫혔으므로 디스크로 내린 개선 코드 정리
+            batch_analyzer.close()
+
             # 분석 완료 후 버튼 다시 활성화
             self.analyze_button.setEnabled(True)
             self._batch_cancelled = False
@@ -1222,7 +1260,7 @@ class MainWindow(QMainWindow):
                 details_content.append(f"   - 분석 시간: {result.analysis_time:.2f}초")
                 if result.retry_count > 0:
                     details_content.append(f"   - 재시도 횟수: {result.retry_count}회")
-                details_content.append(f"   - 개선된 코드: {len(result.improved_code)} 문자")
+                details_content.append(f"   - 개선된 코드: {len(result.get_improved_code())} 문자")
                 details_content.append(f"   - 리포트: {len(result.report_markdown)} 문자")
             else:
                 details_content.append(f"   - 오류: {result.error_message}")
@@ -1290,7 +1328,7 @@ class MainWindow(QMainWindow):
 
                 # 개선된 코드 저장
                 with open(improved_file, 'w', encoding='utf-8') as f:
-                    f.write(result.improved_code)
+                    f.write(result.get_improved_code())
 
                 saved_count += 1
 
@@ -23,9 +23,15 @@ class CSharpSyntaxHighlighter(QSyntaxHighlighter):
     - Functions: #DCDCAA (yellow)
     """
 
+    # Maximum number of cached line highlights
+    LINE_CACHE_SIZE = 4096
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
+        # (block text, previous block state) -> (format spans, block state)
+        self._line_cache = {}
+
         # Define text formats
         self.highlighting_rules = []
 
@@ -50,9 +56,9 @@ class CSharpSyntaxHighlighter(QSyntaxHighlighter):
             'volatile', 'while'
         ]
 
-        for keyword in keywords:
-            pattern = QRegularExpression(r'\b' + keyword + r'\b')
-            self.highlighting_rules.append((pattern, keyword_format))
+        # One alternation instead of a pattern per keyword: a single scan per block
+        keyword_pattern = QRegularExpression(r'\b(?:' + '|'.join(keywords) + r')\b')
+        self.highlighting_rules.append((keyword_pattern, keyword_format))
 
         # Class/Type format (cyan)
         class_format = QTextCharFormat()
@@ -125,27 +131,62 @@ class CSharpSyntaxHighlighter(QSyntaxHighlighter):
         xml_doc_pattern = QRegularExpression(r'///[^\n]*')
         self.highlighting_rules.append((xml_doc_pattern, xml_doc_format))
 
+        # Compile (and JIT) every pattern now instead of on the first highlighted block
+        for pattern, _ in self.highlighting_rules:
+            pattern.optimize()
+        self.comment_start_expression.optimize()
+        self.comment_end_expression.optimize()
+
     def highlightBlock(self, text):
         """
         Highlight a single block of text.
 
+        Qt calls this only for blocks that changed (or whose preceding state
+        changed). Spans for a given (text, previous state) are cached, so lines
+        that reappear, e.g. when the same code is loaded again, skip the regex scan.
+
+        Args:
+            text: The text to highlight
+        """
+        key = (text, self.previousBlockState())
+        cached = self._line_cache.get(key)
+        if cached is None:
+            cached = self._highlight_spans(text, key[1])
+            if len(self._line_cache) >= self.LINE_CACHE_SIZE:
+                self._line_cache.clear()
+            self._line_cache[key] = cached
+
+        spans, state = cached
+        self.setCurrentBlockState(state)
+        for start, length, format in spans:
+            self.setFormat(start, length, format)
+
+    def _highlight_spans(self, text, previous_state):
+        """
+        Compute the format spans and end state for a block.
+
         Args:
             text: The text to highlight
+            previous_state: Block state of the previous block
+
+        Returns:
+            (spans, state): (start, length, format) tuples in application order
+            and the block state (1 if a multi-line comment continues)
         """
+        spans = []
+
         # Apply all single-line highlighting rules
         for pattern, format in self.highlighting_rules:
             match_iterator = pattern.globalMatch(text)
             while match_iterator.hasNext():
                 match = match_iterator.next()
-                start = match.capturedStart()
-                length = match.capturedLength()
-                self.setFormat(start, length, format)
+                spans.append((match.capturedStart(), match.capturedLength(), format))
 
         # Handle multi-line comments
-        self.setCurrentBlockState(0)
+        state = 0
 
         start_index = 0
-        if self.previousBlockState() != 1:
+        if previous_state != 1:
             match = self.comment_start_expression.match(text)
             start_index = match.capturedStart() if match.hasMatch() else -1
 
@@ -154,18 +195,20 @@ class CSharpSyntaxHighlighter(QSyntaxHighlighter):
             if match.hasMatch():
                 end_index = match.capturedStart()
                 comment_length = end_index - start_index + match.capturedLength()
-                self.setFormat(start_index, comment_length, self.multiline_comment_format)
+                spans.append((start_index, comment_length, self.multiline_comment_format))
 
                 # Look for next comment start
                 match = self.comment_start_expression.match(text, start_index + comment_length)
                 start_index = match.capturedStart() if match.hasMatch() else -1
             else:
                 # Comment continues to next block
-                self.setCurrentBlockState(1)
+                state = 1
                 comment_length = len(text) - start_index
-                self.setFormat(start_index, comment_length, self.multiline_comment_format)
+                spans.append((start_index, comment_length, self.multiline_comment_format))
                 break
 
+        return tuple(spans), state
+
 
 # Test the highlighter
 if __name__ == "__main__":
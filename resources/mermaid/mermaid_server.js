@@ -0,0 +1,98 @@
+/**
+ * Mermaid 렌더링 서버 (DiagramConverter use_server=True 전용)
+ *
+ * headless Chromium을 한 번만 띄워 두고 stdin으로 받은 Mermaid 코드를
+ * 차례로 SVG 또는 PNG로 렌더링해 stdout으로 돌려줍니다. mmdc를 다이어그램마다
+ * 실행할 때 드는 Node + Chromium 시작 비용(1~3초)을 첫 요청에서만 지불합니다.
+ *
+ * 프레임 형식
+ *   요청: [4바이트 길이 (big-endian)][UTF-8 Mermaid 코드]
+ *   응답: [1바이트 상태 (0: 성공, 1: 실패)][4바이트 길이][SVG/PNG 또는 UTF-8 오류 메시지]
+ *
+ * 사용법: node mermaid_server.js <theme> <background> <svg|png>
+ * puppeteer와 mermaid는 @mermaid-js/mermaid-cli 설치본에서 찾습니다 (NODE_PATH).
+ */
+
+const puppeteer = require('puppeteer');
+
+const theme = process.argv[2] || 'default';
+const background = process.argv[3] || 'white';
+const format = process.argv[4] || 'svg';
+
+function writeFrame(status, payload) {
+    const header = Buffer.alloc(5);
+    header.writeUInt8(status, 0);
+    header.writeUInt32BE(payload.length, 1);
+    process.stdout.write(Buffer.concat([header, payload]));
+}
+
+async function main() {
+    const browser = await puppeteer.launch({ headless: 'new' });
+    const page = await browser.newPage();
+
+    await page.setContent(
+        `<!DOCTYPE html><html><body style="margin:0;background:${background}">` +
+        '<div id="container" style="display:inline-block;padding:8px"></div></body></html>'
+    );
+    await page.addScriptTag({ path: require.resolve('mermaid/dist/mermaid.min.js') });
+    await page.evaluate((theme) => {
+        mermaid.initialize({ startOnLoad: false, theme: theme });
+    }, theme);
+
+    let counter = 0;
+
+    async function render(code) {
+        counter += 1;
+        const svg = await page.evaluate(async (code, id) => {
+            const { svg } = await mermaid.render(id, code);
+            document.getElementById('container').innerHTML = svg;
+            return svg;
+        }, code, `diagram${counter}`);
+
+        // SVG는 스크린샷 단계 없이 그대로 반환
+        if (format === 'svg') {
+            return Buffer.from(svg, 'utf-8');
+        }
+
+        const container = await page.$('#container');
+        return container.screenshot({ type: 'png' });
+    }
+
+    // 요청은 도착 순서대로 하나씩 처리
+    let buffered = Buffer.alloc(0);
+    let queue = Promise.resolve();
+
+    process.stdin.on('data', (chunk) => {
+        buffered = Buffer.concat([buffered, chunk]);
+
+        while (buffered.length >= 4) {
+            const length = buffered.readUInt32BE(0);
+            if (buffered.length < 4 + length) {
+                break;
+            }
+
+            const code = buffered.subarray(4, 4 + length).toString('utf-8');
+            buffered = buffered.subarray(4 + length);
+
+            queue = queue.then(async () => {
+                try {
+                    writeFrame(0, await render(code));
+                } catch (error) {
+                    writeFrame(1, Buffer.from(String(error && error.message || error), 'utf-8'));
+                }
+            });
+        }
+    });
+
+    // 부모 프로세스가 stdin을 닫으면 (종료 또는 close()) 브라우저와 함께 종료
+    process.stdin.on('end', async () => {
+        await queue;
+        await browser.close();
+        process.exit(0);
+    });
+}
+
+main().catch((error) => {
+    process.stderr.write(`mermaid_server: ${error && error.stack || error}\n`);
+    process.exit(1);
+});
@@ -0,0 +1,144 @@
+"""
+APIClient 단위 테스트
+
+실제 API를 호출하지 않고 요청 파라미터 구성을 테스트합니다.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.api_client import APIClient
+
+
+@pytest.fixture(autouse=True)
+def api_keys(monkeypatch):
+    """테스트용 API 키"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-key')
+
+
+class TestRequestKwargs:
+    """모델별 요청 파라미터 테스트"""
+
+    def test_gpt5_uses_max_completion_tokens(self):
+        """GPT-5 계열은 max_completion_tokens만 사용"""
+        client = APIClient(provider='openai', model_name='gpt-5-mini')
+        assert client._req_kwargs == {'max_completion_tokens': 16384}
+
+    def test_gpt4o_uses_temperature(self):
+        """GPT-4 계열은 max_tokens와 temperature 사용"""
+        client = APIClient(provider='openai', model_name='gpt-4o', temperature=0.2)
+        assert client._req_kwargs == {'max_tokens': 4096, 'temperature': 0.2}
+
+    def test_openai_request(self):
+        """OpenAI 요청에 사전 계산된 파라미터 전달"""
+        client = APIClient(provider='openai', model_name='gpt-4.1-mini')
+        client.client = Mock()
+        client.client.chat.completions.create.return_value.choices = [
+            Mock(message=Mock(content="improved"))
+        ]
+
+        assert client._get_response("prompt", "system") == "improved"
+
+        kwargs = client.client.chat.completions.create.call_args.kwargs
+        assert kwargs['max_completion_tokens'] == 16384
+        assert 'temperature' not in kwargs
+        assert kwargs['messages'][0] == {"role": "system", "content": "system"}
+
+    def test_anthropic_request(self):
+        """Anthropic 요청에 시스템 프롬프트 캐시 블록 전달"""
+        client = APIClient(provider='anthropic')
+        client.client = Mock()
+        client.client.messages.create.return_value.content = [Mock(text="improved")]
+
+        assert client._get_response("prompt", "system") == "improved"
+
+        kwargs = client.client.messages.create.call_args.kwargs
+        assert kwargs['max_tokens'] == 8192
+        assert kwargs['system'][0]['cache_control'] == {"type": "ephemeral"}
+
+
+class TestRetry:
+    """재시도 정책 테스트"""
+
+    def test_non_retryable_error_raised_immediately(self):
+        """재시도 불가 오류는 즉시 전파"""
+        client = APIClient(provider='openai')
+        client._get_response = Mock(side_effect=ValueError("bad request"))
+
+        with pytest.raises(ValueError):
+            client.analyze_code("prompt", stream=False)
+        assert client._get_response.call_count == 1
+
+    def test_retryable_error_retried(self, monkeypatch):
+        """서버 오류(5xx)는 재시도"""
+        monkeypatch.setattr('app.core.api_client.time.sleep', lambda seconds: None)
+        server_error = Exception("server error")
+        server_error.status_code = 503
+
+        client = APIClient(provider='openai')
+        client._get_response = Mock(side_effect=[server_error, "improved"])
+
+        assert client.analyze_code("prompt", stream=False) == "improved"
+        assert client._get_response.call_count == 2
+
+    def test_retry_after_header_honored(self):
+        """Retry-After 헤더가 있으면 그 값만큼 대기"""
+        from app.core.api_client import _retry_delay
+
+        error = Exception("rate limited")
+        error.response = Mock(headers={'retry-after': '3'})
+        assert _retry_delay(error, attempt=0) == 3.0
+
+
+class TestModelSpec:
+    """모델 설정 조회 테스트"""
+
+    def test_models_read_only(self):
+        """모델 설정은 수정 불가"""
+        with pytest.raises(TypeError):
+            APIClient.MODELS['openai']['gpt-x'] = None
+
+    def test_unknown_model(self):
+        """알 수 없는 모델은 ModelNotFoundError"""
+        from app.core.api_client import ModelNotFoundError
+
+        with pytest.raises(ModelNotFoundError):
+            APIClient(provider='openai', model_name='gpt-unknown')
+
+    def test_model_info_copy(self):
+        """get_model_info는 수정해도 안전한 사본 반환"""
+        client = APIClient(provider='openai')
+        info = client.get_model_info()
+        info['name'] = 'changed'
+        assert client.get_model_info()['name'] == 'gpt-4o-mini'
+        assert client.get_model_info()['context_window'] == 128000
+
+
+class TestPromptLengthGuard:
+    """컨텍스트 윈도우 초과 프롬프트 사전 차단 테스트"""
+
+    def test_oversized_prompt_rejected_locally(self):
+        """초과 프롬프트는 API 호출 없이 PromptTooLongError"""
+        from app.core.api_client import PromptTooLongError
+
+        client = APIClient(provider='openai', model_name='gpt-3.5-turbo')
+        client._get_response = Mock(return_value="improved")
+        client._count_tokens = Mock(return_value=client.context_window)
+
+        with pytest.raises(PromptTooLongError):
+            client.analyze_code("prompt", stream=False)
+        client._get_response.assert_not_called()
+
+    def test_prompt_within_budget(self):
+        """예산 안의 프롬프트는 그대로 전송"""
+        client = APIClient(provider='openai', model_name='gpt-3.5-turbo')
+        client._get_response = Mock(return_value="improved")
+
+        assert client.analyze_code("short prompt", stream=False) == "improved"
@@ -4,6 +4,7 @@ BatchAnalyzer 단위 테스트
 배치 분석 엔진의 주요 기능을 테스트합니다.
 """
 
+import re
 import pytest
 import sys
 from pathlib import Path
@@ -115,6 +116,20 @@ class TestFileAnalysisResult:
         assert result.error_message == "Test error"
         assert result.improved_code == ""
 
+    def test_result_is_immutable(self):
+        """결과는 생성 후 수정 불가 (slots, frozen)"""
+        import dataclasses
+
+        result = FileAnalysisResult(
+            file_path="/path/to/file.cs",
+            file_name="file.cs",
+            success=True
+        )
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            result.success = False
+        assert not hasattr(result, '__dict__')
+
 
 class TestBatchAnalysisResult:
     """BatchAnalysisResult 데이터클래스 테스트"""
@@ -341,5 +356,557 @@ class TestBatchAnalyzer:
         assert call_count == 3
 
 
+class TestParallelBatchAnalysis:
+    """스레드 풀 기반 병렬 배치 분석 테스트"""
+
+    def test_max_workers_default(self, mock_prompt_builder, mock_report_generator):
+        """max_workers 기본값"""
+        analyzer = BatchAnalyzer(
+            api_client=Mock(),
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator
+        )
+
+        assert analyzer.max_workers == 4
+
+    def test_requests_run_concurrently(
+        self,
+        mock_prompt_builder,
+        mock_report_generator,
+        test_cs_files
+    ):
+        """여러 LLM 요청이 동시에 진행되는지 확인"""
+        import threading
+
+        # 3개 요청이 모두 동시에 도착해야 통과하는 배리어
+        barrier = threading.Barrier(len(test_cs_files), timeout=5)
+
+        def analyze_side_effect(*args, **kwargs):
+            barrier.wait()
+            return 'public class ImprovedCode { }'
+
+        mock_client = Mock()
+        mock_client.analyze_code.side_effect = analyze_side_effect
+
+        analyzer = BatchAnalyzer(
+            api_client=mock_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator,
+            max_workers=len(test_cs_files)
+        )
+
+        batch_result = analyzer.analyze_files(test_cs_files)
+
+        assert batch_result.success_count == 3
+        assert batch_result.failure_count == 0
+
+    def test_results_keep_original_order(
+        self,
+        mock_prompt_builder,
+        mock_report_generator,
+        test_cs_files
+    ):
+        """완료 순서와 관계없이 결과는 입력 순서대로 정렬"""
+        import time
+
+        delays = {"Test1": 0.2, "Test2": 0.1, "Test3": 0.0}
+
+        # 프롬프트에 원본 코드가 그대로 포함되도록 설정
+        mock_prompt_builder.build_review_prompt.side_effect = lambda code, **kwargs: code
+
+        def analyze_side_effect(*args, **kwargs):
+            prompt = kwargs['prompt']
+            for name, delay in delays.items():
+                if name in prompt:
+                    time.sleep(delay)
+            return 'public class ImprovedCode { }'
+
+        mock_client = Mock()
+        mock_client.analyze_code.side_effect = analyze_side_effect
+
+        analyzer = BatchAnalyzer(
+            api_client=mock_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator,
+            max_workers=3
+        )
+
+        progress_calls = []
+        batch_result = analyzer.analyze_files(
+            test_cs_files,
+            progress_callback=lambda current, total, name: progress_calls.append(current)
+        )
+
+        assert [r.file_name for r in batch_result.results] == ["Test1.cs", "Test2.cs", "Test3.cs"]
+        assert progress_calls == [0, 1, 2]
+
+    def test_cancellation_skips_pending_files(
+        self,
+        mock_prompt_builder,
+        mock_report_generator,
+        test_cs_files
+    ):
+        """취소 시 대기 중인 파일은 분석하지 않음"""
+        mock_client = Mock()
+        mock_client.analyze_code.return_value = 'public class ImprovedCode { }'
+
+        analyzer = BatchAnalyzer(
+            api_client=mock_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator,
+            max_workers=1
+        )
+
+        completed = []
+
+        batch_result = analyzer.analyze_files(
+            test_cs_files,
+            progress_callback=lambda current, total, name: completed.append(name),
+            is_cancelled_callback=lambda: len(completed) >= 1
+        )
+
+        assert len(batch_result.results) < len(test_cs_files)
+        assert batch_result.total_files == 3
+
+
+    def test_prefetch_keeps_unreadable_file_as_skipped(
+        self,
+        mock_prompt_builder,
+        mock_report_generator,
+        test_cs_files
+    ):
+        """미리 읽기에 실패한 파일도 순서대로 스킵 결과로 남음"""
+        mock_client = Mock()
+        mock_client.analyze_code.side_effect = lambda **kwargs: iter(["improved"])
+
+        analyzer = BatchAnalyzer(
+            api_client=mock_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator,
+            max_workers=2
+        )
+
+        paths = [test_cs_files[0], "/nonexistent/Missing.cs", test_cs_files[1]]
+        batch_result = analyzer.analyze_files(paths)
+
+        assert [r.file_path for r in batch_result.results] == paths
+        assert batch_result.success_count == 2
+        assert batch_result.skipped_count == 1
+
+
+    def test_cancellation_with_slow_reads_returns(
+        self,
+        mock_prompt_builder,
+        mock_report_generator,
+        tmp_path,
+        monkeypatch
+    ):
+        """읽기가 느릴 때 취소해도 큐를 기다리던 작업이 멈추지 않고 종료됨"""
+        import time
+
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"Slow{i}.cs"
+            path.write_text(f"public class Slow{i} {{ }}", encoding='utf-8')
+            paths.append(str(path))
+
+        original_read_bytes = Path.read_bytes
+
+        def slow_read_bytes(self):
+            time.sleep(0.5)
+            return original_read_bytes(self)
+
+        monkeypatch.setattr(Path, "read_bytes", slow_read_bytes)
+
+        mock_client = Mock()
+        mock_client.analyze_code.side_effect = lambda **kwargs: iter(["improved"])
+
+        analyzer = BatchAnalyzer(
+            api_client=mock_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator,
+            max_workers=2
+        )
+
+        started = time.perf_counter()
+        batch_result = analyzer.analyze_files(paths, is_cancelled_callback=lambda: True)
+
+        assert time.perf_counter() - started < 5
+        assert batch_result.total_files == 6
+        assert len(batch_result.results) == 0
+
+    def test_unexpected_exception_becomes_failure_result(
+        self,
+        mock_prompt_builder,
+        mock_report_generator,
+        test_cs_files
+    ):
+        """예상치 못한 예외는 배치를 중단하지 않고 해당 파일의 실패 결과가 됨"""
+        mock_client = Mock()
+        mock_client.analyze_code.side_effect = lambda **kwargs: iter(["improved"])
+
+        analyzer = BatchAnalyzer(
+            api_client=mock_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator,
+            max_workers=2
+        )
+
+        original = analyzer._analyze_single_file
+
+        def flaky(file_path, data=None, keep_code=True):
+            if file_path == test_cs_files[1]:
+                raise RuntimeError("boom")
+            return original(file_path, data, keep_code)
+
+        analyzer._analyze_single_file = flaky
+        batch_result = analyzer.analyze_files(test_cs_files)
+
+        assert [r.file_path for r in batch_result.results] == test_cs_files
+        assert batch_result.success_count == 2
+        assert batch_result.failure_count == 1
+        assert "boom" in batch_result.results[1].error_message
+
+
+class TestAsyncBatchAnalysis:
+    """asyncio 기반 배치 분석 테스트"""
+
+    def test_analyze_files_async(
+        self,
+        tmp_path,
+        mock_prompt_builder,
+        mock_report_generator,
+        test_cs_files
+    ):
+        """asyncio.gather로 모든 파일 분석"""
+        import asyncio
+        from unittest.mock import AsyncMock
+
+        mock_client = Mock()
+        mock_client.analyze_code_async = AsyncMock(return_value='public class ImprovedCode { }')
+
+        analyzer = BatchAnalyzer(
+            api_client=mock_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator,
+            spill_dir=str(tmp_path / "spill")
+        )
+
+        batch_result = asyncio.run(analyzer.analyze_files_async(test_cs_files, max_concurrency=2))
+
+        assert batch_result.success_count == 3
+        assert [r.file_name for r in batch_result.results] == ["Test1.cs", "Test2.cs", "Test3.cs"]
+        assert all("ImprovedCode" in r.get_improved_code() for r in batch_result.results)
+        assert mock_client.analyze_code_async.await_count == 3
+
+    def test_concurrency_is_bounded(
+        self,
+        mock_prompt_builder,
+        mock_report_generator,
+        test_cs_files
+    ):
+        """세마포어로 동시 요청 수 제한"""
+        import asyncio
+
+        in_flight = 0
+        peak = 0
+
+        async def analyze_side_effect(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return 'public class ImprovedCode { }'
+
+        mock_client = Mock()
+        mock_client.analyze_code_async = analyze_side_effect
+
+        analyzer = BatchAnalyzer(
+            api_client=mock_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator
+        )
+
+        batch_result = asyncio.run(analyzer.analyze_files_async(test_cs_files, max_concurrency=2))
+
+        assert batch_result.success_count == 3
+        assert peak == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestSystemPromptPrefix:
+    """시스템 프롬프트 분리 전달 테스트"""
+
+    def test_system_prompt_passed_separately(
+        self,
+        test_cs_files,
+        mock_prompt_builder,
+        mock_report_generator
+    ):
+        """SYSTEM_PROMPT는 프롬프트에 붙이지 않고 system_prompt 인자로 전달"""
+        mock_prompt_builder.SYSTEM_PROMPT = "SYSTEM"
+        api_client = Mock()
+        api_client.analyze_code.return_value = iter(["improved"])
+
+        analyzer = BatchAnalyzer(
+            api_client=api_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator
+        )
+        analyzer.analyze_files(test_cs_files[:1])
+
+        kwargs = api_client.analyze_code.call_args.kwargs
+        assert kwargs['system_prompt'] == "SYSTEM"
+        assert kwargs['prompt'] == "Test prompt"
+
+
+class TestResultCache:
+    """파일 단위 결과 캐시 테스트"""
+
+    def test_unchanged_file_skips_llm(
+        self,
+        tmp_path,
+        test_cs_files,
+        mock_prompt_builder,
+        mock_report_generator
+    ):
+        """같은 내용의 파일을 다시 분석하면 LLM을 호출하지 않음"""
+        from app.core.llm_cache import LLMCache
+
+        mock_prompt_builder.SYSTEM_PROMPT = "SYSTEM"
+        api_client = Mock()
+        api_client.model_name = "gpt-4o-mini"
+        api_client.temperature = 0.0
+        api_client.analyze_code.side_effect = lambda **kwargs: iter(["improved"])
+
+        analyzer = BatchAnalyzer(
+            api_client=api_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator,
+            result_cache=LLMCache(str(tmp_path / "results.db")),
+            spill_dir=str(tmp_path / "spill")
+        )
+
+        first = analyzer.analyze_files(test_cs_files[:1])
+        second = analyzer.analyze_files(test_cs_files[:1])
+
+        assert api_client.analyze_code.call_count == 1
+        assert second.success_count == 1
+        assert second.results[0].get_improved_code() == first.results[0].get_improved_code()
+        assert second.results[0].report_markdown == first.results[0].report_markdown
+
+    def test_template_change_or_sampling_bypasses_cache(
+        self,
+        tmp_path,
+        test_cs_files,
+        mock_prompt_builder,
+        mock_report_generator
+    ):
+        """프롬프트 템플릿이 바뀌거나 temperature > 0이면 이전 결과를 재사용하지 않음"""
+        from app.core.llm_cache import LLMCache
+
+        mock_prompt_builder.SYSTEM_PROMPT = "SYSTEM"
+        api_client = Mock()
+        api_client.model_name = "gpt-4o-mini"
+        api_client.temperature = 0.0
+        api_client.analyze_code.side_effect = lambda **kwargs: iter(["improved"])
+        result_cache = LLMCache(str(tmp_path / "results.db"))
+
+        def make_analyzer():
+            return BatchAnalyzer(
+                api_client=api_client,
+                prompt_builder=mock_prompt_builder,
+                report_generator=mock_report_generator,
+                result_cache=result_cache,
+                spill_dir=str(tmp_path / "spill")
+            )
+
+        make_analyzer().analyze_files(test_cs_files[:1])
+        mock_prompt_builder.build_review_prompt.return_value = "Changed template"
+        make_analyzer().analyze_files(test_cs_files[:1])
+        assert api_client.analyze_code.call_count == 2
+
+        api_client.temperature = 0.7
+        analyzer = make_analyzer()
+        analyzer.analyze_files(test_cs_files[:1])
+        analyzer.analyze_files(test_cs_files[:1])
+        assert api_client.analyze_code.call_count == 4
+
+    def test_main_window_batch_rerun_hits_cache(self, tmp_path, test_cs_files, monkeypatch):
+        """앱 기본 클라이언트(temperature=0.7)로 연결돼 있어도 배치 재실행 시 캐시 적중"""
+        from PySide6.QtWidgets import QApplication
+        from app.core.api_client import APIClient
+        from app.ui.main_window import MainWindow
+
+        monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+        monkeypatch.chdir(tmp_path)
+        app = QApplication.instance() or QApplication(sys.argv)
+
+        window = MainWindow()
+        try:
+            window.api_client = APIClient(provider='openai')
+
+            first_analyzer = window._create_batch_analyzer()
+            batch_client = first_analyzer.api_client
+            assert batch_client.temperature == 0.0
+            assert batch_client.cache is window.llm_cache
+            batch_client.analyze_code = Mock(side_effect=lambda **kwargs: iter(["improved"]))
+            first = first_analyzer.analyze_files(test_cs_files[:1])
+            first_code = first.results[0].get_improved_code()
+            first_analyzer.close()
+
+            second_analyzer = window._create_batch_analyzer()
+            assert second_analyzer.api_client is batch_client
+            second = second_analyzer.analyze_files(test_cs_files[:1])
+            second_code = second.results[0].get_improved_code()
+            second_analyzer.close()
+
+            assert batch_client.analyze_code.call_count == 1
+            assert second.success_count == 1
+            assert second_code == first_code == "improved"
+        finally:
+            window.report_saver.close()
+            window.batch_result_cache.close()
+            window.llm_cache.close()
+            window.deleteLater()
+
+
+class TestKeepCode:
+    """개선 코드 디스크 저장 테스트"""
+
+    def test_improved_code_spilled_to_disk(
+        self,
+        tmp_path,
+        test_cs_files,
+        mock_prompt_builder,
+        mock_report_generator
+    ):
+        """keep_code=False(기본)면 개선 코드는 파일로 저장되고 필요할 때 읽음"""
+        api_client = Mock()
+        api_client.analyze_code.side_effect = lambda **kwargs: iter(["improved"])
+
+        analyzer = BatchAnalyzer(
+            api_client=api_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator,
+            spill_dir=str(tmp_path / "spill")
+        )
+
+        result = analyzer.analyze_files(test_cs_files[:1]).results[0]
+
+        assert result.improved_code == ""
+        assert Path(result.improved_code_path).is_relative_to(tmp_path / "spill")
+        assert result.get_improved_code() == "improved"
+
+    def test_spilled_code_isolated_per_run_and_removed_on_close(
+        self,
+        tmp_path,
+        test_cs_files,
+        mock_prompt_builder,
+        mock_report_generator
+    ):
+        """같은 파일을 다시 분석해도 이전 실행의 개선 코드를 덮어쓰지 않고, close() 시 삭제됨"""
+        responses = iter(["first", "second"])
+        api_client = Mock()
+        api_client.analyze_code.side_effect = lambda **kwargs: iter([next(responses)])
+
+        analyzer = BatchAnalyzer(
+            api_client=api_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator,
+            spill_dir=str(tmp_path / "spill")
+        )
+
+        first = analyzer.analyze_files(test_cs_files[:1]).results[0]
+        second = analyzer.analyze_files(test_cs_files[:1]).results[0]
+
+        assert first.get_improved_code() == "first"
+        assert second.get_improved_code() == "second"
+
+        analyzer.close()
+        assert not Path(first.improved_code_path).exists()
+        assert list((tmp_path / "spill").iterdir()) == []
+
+    def test_keep_code(
+        self,
+        test_cs_files,
+        mock_prompt_builder,
+        mock_report_generator
+    ):
+        """keep_code=True면 개선 코드를 결과에 보관"""
+        api_client = Mock()
+        api_client.analyze_code.side_effect = lambda **kwargs: iter(["improved"])
+
+        analyzer = BatchAnalyzer(
+            api_client=api_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator
+        )
+
+        result = analyzer.analyze_files(test_cs_files[:1], keep_code=True).results[0]
+
+        assert result.improved_code == "improved"
+        assert result.improved_code_path == ""
+
+
+class TestBundledAnalysis:
+    """작은 파일 묶음 분석 테스트"""
+
+    def test_small_files_share_one_request(
+        self,
+        test_cs_files,
+        mock_prompt_builder,
+        mock_report_generator
+    ):
+        """작은 파일들은 한 번의 요청으로 분석되고 파일별 결과로 나뉨"""
+        mock_prompt_builder.build_review_prompt.side_effect = lambda code, **kwargs: code
+        api_client = Mock()
+        api_client.max_tokens = 4096
+
+        def analyze_code(**kwargs):
+            names = re.findall(r'^### FILE: (.+)$', kwargs['prompt'], re.MULTILINE)
+            return iter([
+                "\n".join(f"### FILE: {name}\n// improved {name}\n### END" for name in names)
+            ])
+
+        api_client.analyze_code.side_effect = analyze_code
+
+        analyzer = BatchAnalyzer(
+            api_client=api_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator
+        )
+
+        batch_result = analyzer.analyze_files(test_cs_files, keep_code=True, bundle_small_files=True)
+
+        assert api_client.analyze_code.call_count == 1
+        assert batch_result.success_count == 3
+        assert [r.improved_code for r in batch_result.results] == [
+            "// improved Test1.cs", "// improved Test2.cs", "// improved Test3.cs"
+        ]
+
+    def test_unparseable_response_falls_back_per_file(
+        self,
+        test_cs_files,
+        mock_prompt_builder,
+        mock_report_generator
+    ):
+        """응답을 파일별로 나눌 수 없으면 파일별 분석으로 대체"""
+        api_client = Mock()
+        api_client.max_tokens = 4096
+        api_client.analyze_code.side_effect = lambda **kwargs: iter(["public class Improved { }"])
+
+        analyzer = BatchAnalyzer(
+            api_client=api_client,
+            prompt_builder=mock_prompt_builder,
+            report_generator=mock_report_generator
+        )
+
+        batch_result = analyzer.analyze_files(test_cs_files, keep_code=True, bundle_small_files=True)
+
+        assert api_client.analyze_code.call_count == 1 + len(test_cs_files)
+        assert batch_result.success_count == 3
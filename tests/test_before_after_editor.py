@@ -0,0 +1,239 @@
+"""
+BeforeAfterEditor 단위 테스트
+
+코드 에디터의 줄 번호 영역과 Before/After 패널 동작을 테스트합니다.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QFont, QTextCursor
+from PySide6.QtTest import QTest
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.ui.before_after_editor import CodeEditor, EditorPanel, BeforeAfterEditor
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """QApplication fixture"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def panel(qapp):
+    """EditorPanel fixture"""
+    widget = EditorPanel("After", read_only=True)
+    yield widget
+    widget.close()
+
+
+@pytest.fixture
+def editor(qapp):
+    """BeforeAfterEditor fixture"""
+    widget = BeforeAfterEditor()
+    yield widget
+    widget.close()
+
+
+@pytest.fixture
+def code_editor(qapp):
+    """CodeEditor fixture"""
+    editor = CodeEditor()
+    yield editor
+    editor.close()
+
+
+class TestLineNumberArea:
+    """줄 번호 영역 테스트"""
+
+    def test_width_grows_with_digits(self, code_editor):
+        """줄 수 자릿수에 따라 너비 증가"""
+        advance = code_editor.fontMetrics().horizontalAdvance('9')
+        assert code_editor.line_number_area_width() == 20 + advance
+
+        code_editor.setPlainText("\n" * 120)
+        assert code_editor.line_number_area_width() == 20 + advance * 3
+
+    def test_width_follows_font_change(self, code_editor):
+        """폰트가 바뀌면 캐시된 숫자 폭도 갱신"""
+        font = QFont(code_editor.font())
+        font.setPointSize(30)
+        code_editor.setFont(font)
+
+        expected = 20 + code_editor.fontMetrics().horizontalAdvance('9')
+        assert code_editor.line_number_area_width() == expected
+
+    def test_line_numbers_painted_from_cache(self, code_editor):
+        """줄 번호는 QStaticText 캐시로 그림"""
+        code_editor.setPlainText("line\n" * 5)
+        code_editor.resize(400, 300)
+        code_editor.show()
+        code_editor.line_number_area.grab()
+
+        assert {1, 2, 3} <= set(code_editor._static_numbers)
+        assert code_editor._static_number(2) is code_editor._static_numbers[2]
+
+        font = QFont(code_editor.font())
+        font.setPointSize(20)
+        code_editor.setFont(font)
+        assert code_editor._static_numbers == {}
+
+    def test_current_line_highlight(self, code_editor):
+        """현재 줄 강조는 줄이 바뀔 때만 갱신"""
+        code_editor.setPlainText("first\nsecond")
+        cursor = code_editor.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        code_editor.setTextCursor(cursor)
+
+        selections = code_editor.extraSelections()
+        assert len(selections) == 1
+        assert selections[0].cursor.blockNumber() == 1
+
+        calls = []
+        code_editor.setExtraSelections = calls.append
+        cursor.movePosition(QTextCursor.MoveOperation.Left)
+        code_editor.setTextCursor(cursor)
+        assert calls == []
+
+
+class TestEditorPanel:
+    """EditorPanel 테스트"""
+
+    def test_set_text_highlighted_after_event_loop(self, panel, qapp):
+        """텍스트를 먼저 표시하고 구문 강조는 이벤트 루프에서 적용"""
+        panel.set_text("public class A { }")
+        assert panel.highlighter.document() is panel.editor.document()
+
+        qapp.processEvents()
+        assert panel.editor.document().firstBlock().layout().formats()
+
+    def test_copy_to_clipboard(self, panel, qapp):
+        """에디터 내용을 클립보드에 복사"""
+        panel.set_text("public class A { }")
+        panel.copy_to_clipboard()
+        assert qapp.clipboard().text() == "public class A { }"
+
+    @pytest.mark.parametrize("old, new", [
+        ("", "a\nb"),
+        ("a\nb\nc", "a\nc"),
+        ("a\nb\nc", "b\nc"),
+        ("a\nb\nc", "a\nb"),
+        ("a\nb", "x\na\nb\ny"),
+        ("a\nb\nc", ""),
+        ("a\nb\nc", "a\nB\nB2\nc\nd"),
+        ("a\n", "a\n\nb\n"),
+    ])
+    def test_set_text_diffed(self, panel, old, new):
+        """변경된 줄만 고쳐도 결과 텍스트는 같음"""
+        panel.set_text(old)
+        panel.set_text_diffed(new)
+        assert panel.get_text() == new
+
+    def test_read_only_editor_keeps_no_undo_history(self, panel):
+        """읽기 전용 에디터는 실행 취소 기록을 남기지 않음"""
+        panel.set_text("a\nb")
+        panel.set_text_diffed("a\nc")
+
+        assert not panel.editor.document().isUndoRedoEnabled()
+        assert panel.editor.document().availableUndoSteps() == 0
+
+    def test_set_text_diffed_keeps_unchanged_blocks(self, panel):
+        """바뀌지 않은 블록은 그대로 유지"""
+        panel.set_text("using System;\n\npublic class A { }")
+        first_block = panel.editor.document().firstBlock()
+
+        panel.set_text_diffed("using System;\n\npublic class B { }")
+
+        assert panel.editor.document().firstBlock() == first_block
+        assert panel.get_text().endswith("class B { }")
+
+
+class TestBeforeAfterEditor:
+    """BeforeAfterEditor 테스트"""
+
+    def test_text_changed_debounced(self, editor):
+        """연속 편집은 타이머가 끝난 뒤 한 번만 전달"""
+        received = []
+        editor.before_text_changed.connect(received.append)
+
+        for text in ("a", "ab", "abc"):
+            editor.set_before_text(text)
+
+        assert received == []
+        assert editor._before_emit_timer.isActive()
+
+        QTest.qWait(editor.TEXT_CHANGED_DELAY_MS * 3)
+        assert received == ["abc"]
+
+    def test_scroll_sync_line_aligned(self, editor):
+        """스크롤 동기화는 같은 줄 번호를 맞춤"""
+        editor.resize(800, 400)
+        editor.set_before_text("\n".join(f"line {i}" for i in range(300)))
+        editor.set_after_text("\n".join(f"line {i}" for i in range(200)))
+        editor.show()
+
+        editor.before_panel.editor.verticalScrollBar().setValue(50)
+        assert editor.after_panel.editor.verticalScrollBar().value() == 50
+
+        editor.after_panel.editor.verticalScrollBar().setValue(10)
+        assert editor.before_panel.editor.verticalScrollBar().value() == 10
+
+
+class TestLazyCodeViewer:
+    """대용량 After 출력용 가상화 뷰어 테스트"""
+
+    def test_large_text_uses_lazy_viewer(self, panel):
+        """기준 줄 수를 넘으면 가상화 뷰어로 전환"""
+        text = "\n".join(f"int x{i} = {i};" for i in range(panel.LAZY_VIEW_MIN_LINES + 1))
+        panel.set_text_diffed(text)
+
+        assert panel.view is panel.lazy_viewer
+        assert panel.editor.blockCount() == 1
+        assert panel.get_text() == text
+
+    def test_small_text_returns_to_editor(self, panel):
+        """작은 텍스트는 다시 에디터에 표시"""
+        panel.set_text("\n" * panel.LAZY_VIEW_MIN_LINES)
+        panel.set_text_diffed("public class A { }")
+
+        assert panel.view is panel.editor
+        assert panel.get_text() == "public class A { }"
+
+    def test_paints_visible_lines_only(self, panel, qapp):
+        """보이는 줄만 레이아웃"""
+        panel.resize(600, 400)
+        panel.set_text("\n".join(f"line {i}" for i in range(5000)))
+        panel.show()
+        qapp.processEvents()
+
+        viewer = panel.lazy_viewer
+        viewer._static_lines.clear()
+        viewer.verticalScrollBar().setValue(3000)
+        viewer.viewport().repaint()
+
+        assert viewer._static_lines
+        assert len(viewer._static_lines) < 100
+        assert min(viewer._static_lines) == 3000
+
+    def test_scroll_sync_with_lazy_viewer(self, editor, monkeypatch):
+        """가상화 뷰어도 줄 단위로 스크롤 동기화"""
+        monkeypatch.setattr(editor.after_panel, 'LAZY_VIEW_MIN_LINES', 100)
+        editor.resize(800, 400)
+        editor.set_before_text("\n".join(f"line {i}" for i in range(300)))
+        editor.set_after_text("\n".join(f"line {i}" for i in range(300)))
+        editor.show()
+
+        assert editor.after_panel.view is editor.after_panel.lazy_viewer
+        editor.before_panel.editor.verticalScrollBar().setValue(150)
+        assert editor.after_panel.lazy_viewer.verticalScrollBar().value() == 150
+
+        editor.after_panel.lazy_viewer.verticalScrollBar().setValue(20)
+        assert editor.before_panel.editor.verticalScrollBar().value() == 20
@@ -4,13 +4,14 @@ Mermaid 다이어그램 변환 테스트
 DiagramConverter의 Mermaid → PNG 변환 기능을 테스트합니다.
 """
 
+import subprocess
 import sys
 from pathlib import Path
 
 # 프로젝트 루트를 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.core.diagram_converter import DiagramConverter
+from app.core.diagram_converter import DiagramConverter, _render_image_cached
 import logging
 
 # 로깅 설정
@@ -97,7 +98,7 @@ graph TD
 ```
 """
 
-    converter = DiagramConverter(timeout=30)
+    converter = DiagramConverter(timeout=30, output_format='png')
 
     if not converter.is_available():
         print("⚠️ mmdc를 사용할 수 없어 테스트를 건너뜁니다.")
@@ -217,7 +218,7 @@ classDiagram
 ```
 """
 
-    converter = DiagramConverter(timeout=30)
+    converter = DiagramConverter(timeout=30, output_format='png')
 
     if not converter.is_available():
         print("⚠️ mmdc를 사용할 수 없어 테스트를 건너뜁니다.")
@@ -345,6 +346,278 @@ print("Hello")
     return all(checks.values())
 
 
+FAKE_PNG = b'\x89PNG\r\n\x1a\nfake'
+FAKE_SVG = b'<svg xmlns="http://www.w3.org/2000/svg"></svg>'
+
+
+def _fake_mmdc(calls, markdown_mode=True):
+    """출력 경로(-o)에 가짜 PNG를 쓰는 subprocess.run 대체 함수"""
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        image_format = cmd[cmd.index('-e') + 1] if '-e' in cmd else None
+        if cmd[cmd.index('-o') + 1] == '-':
+            # stdin/stdout 모드
+            stdout = FAKE_SVG if image_format == 'svg' else FAKE_PNG
+            return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr=b'')
+        output = Path(cmd[cmd.index('-o') + 1])
+        if output.suffix == '.md':
+            # Markdown 입력 모드: 블록마다 <이름>-N.<형식> 생성
+            if not markdown_mode:
+                return subprocess.CompletedProcess(cmd, 1, stdout='', stderr='unsupported')
+            source = Path(cmd[cmd.index('-i') + 1]).read_text(encoding='utf-8')
+            for index in range(1, source.count('```mermaid') + 1):
+                image = output.with_name(f"{output.stem}-{index}.{image_format}")
+                image.write_bytes(FAKE_SVG if image_format == 'svg' else FAKE_PNG)
+        else:
+            output.write_bytes(FAKE_SVG if output.suffix == '.svg' else FAKE_PNG)
+        return subprocess.CompletedProcess(cmd, 0, stdout='', stderr='')
+    return run
+
+
+def test_png_disk_cache(tmp_path, monkeypatch):
+    """같은 다이어그램은 디스크 캐시에서 읽고 mmdc를 다시 실행하지 않음"""
+    converter = DiagramConverter(cache_dir=str(tmp_path), output_format='png')
+    converter.mmdc_path = 'mmdc'
+
+    calls = []
+    monkeypatch.setattr('app.core.diagram_converter.subprocess.run', _fake_mmdc(calls))
+
+    code = "graph TD\n    A --> B"
+    assert converter._generate_image(code) == FAKE_PNG
+    assert converter._generate_image(code) == FAKE_PNG
+    assert len(calls) == 1
+    assert len(list(tmp_path.glob('*.png'))) == 1
+
+    # 메모리 캐시를 비워도 디스크 캐시에서 읽음
+    _render_image_cached.cache_clear()
+    assert converter._generate_image(code) == FAKE_PNG
+    assert len(calls) == 1
+
+    # 테마가 바뀌면 다른 캐시 키
+    converter.theme = 'dark'
+    converter._generate_image(code)
+    assert len(calls) == 2
+
+
+def test_failed_render_not_cached(tmp_path, monkeypatch):
+    """렌더링 실패는 캐시되지 않아 다음 호출에서 다시 시도"""
+    converter = DiagramConverter(cache_dir=str(tmp_path), output_format='png')
+    converter.mmdc_path = 'mmdc'
+
+    failed = subprocess.CompletedProcess([], 1, stdout='', stderr='Parse error')
+    monkeypatch.setattr('app.core.diagram_converter.subprocess.run', lambda cmd, **kwargs: failed)
+    assert converter._generate_image("graph TD\n    A -->") is None
+
+    calls = []
+    monkeypatch.setattr('app.core.diagram_converter.subprocess.run', _fake_mmdc(calls))
+    assert converter._generate_image("graph TD\n    A -->") == FAKE_PNG
+    assert len(calls) == 1
+
+
+
+def test_convert_markdown_parallel(tmp_path, monkeypatch):
+    """여러 블록을 병렬 렌더링하되 원본 순서를 유지하고 중복은 한 번만 렌더링"""
+    converter = DiagramConverter(cache_dir=str(tmp_path), output_format='png')
+    converter.mmdc_path = 'mmdc'
+
+    calls = []
+    monkeypatch.setattr('app.core.diagram_converter.subprocess.run', _fake_mmdc(calls))
+
+    markdown = (
+        "# 리포트\n\n```mermaid\ngraph TD\n    A --> B\n```\n\n중간 텍스트\n\n"
+        "```mermaid\ngraph LR\n    C --> D\n```\n\n"
+        "```mermaid\ngraph TD\n    A --> B\n```\n끝"
+    )
+    converted = converter.convert_markdown(markdown)
+
+    assert converted.count('<img ') == 3
+    assert '```mermaid' not in converted
+    assert converted.startswith("# 리포트\n\n<img ")
+    assert "중간 텍스트" in converted and converted.endswith("\n끝")
+
+    # 고유한 다이어그램 2개를 mmdc 한 번으로 일괄 렌더링
+    assert len(calls) == 1
+    assert calls[0][calls[0].index('-i') + 1].endswith('input.md')
+
+
+def test_batch_render_fallback(tmp_path, monkeypatch):
+    """일괄 렌더링을 지원하지 않으면 블록별 렌더링으로 폴백"""
+    converter = DiagramConverter(cache_dir=str(tmp_path), output_format='png')
+    converter.mmdc_path = 'mmdc'
+
+    calls = []
+    monkeypatch.setattr('app.core.diagram_converter.subprocess.run', _fake_mmdc(calls, markdown_mode=False))
+
+    markdown = "```mermaid\ngraph TD\n    E --> F\n```\n\n```mermaid\ngraph TD\n    G --> H\n```\n"
+    converted = converter.convert_markdown(markdown)
+
+    assert converted.count('<img ') == 2
+    assert len(calls) == 3
+
+
+def test_linear_scan_matches_regex():
+    """선형 탐색이 기존 정규식과 같은 블록을 찾음"""
+    import re
+    from app.core.diagram_converter import _iter_mermaid
+
+    pattern = re.compile(r'```mermaid\s*\n(.*?)\n```', re.DOTALL)
+    samples = [
+        "```mermaid\ngraph TD\n    A --> B\n```",
+        "텍스트\n```mermaid  \n\ngraph LR\n  A --> B\n```\n```mermaid\npie\n```\n끝",
+        "```mermaid\n\n```",
+        "```mermaid graph TD\n    A --> B\n```",
+        "```mermaid\ngraph TD\n    A --> B",
+        "```mermaid```mermaid\nB\n```",
+        "```python\nprint()\n```",
+    ]
+
+    for sample in samples:
+        expected = [(m.start(), m.end(), m.group(1)) for m in pattern.finditer(sample)]
+        assert list(_iter_mermaid(sample)) == expected, sample
+
+
+def test_stdio_render(tmp_path, monkeypatch):
+    """지원 버전의 mmdc는 임시 파일 없이 stdin/stdout으로 렌더링"""
+    converter = DiagramConverter(cache_dir=str(tmp_path), output_format='png')
+    converter.mmdc_path = 'mmdc'
+    converter.use_stdio = True
+
+    calls = []
+    monkeypatch.setattr('app.core.diagram_converter.subprocess.run', _fake_mmdc(calls))
+
+    assert converter._generate_image("graph TD\n    S --> T") == FAKE_PNG
+    assert calls[0][calls[0].index('-i') + 1] == '-'
+
+
+def test_parse_version():
+    """mmdc 버전 문자열 해석"""
+    from app.core.diagram_converter import _parse_version
+
+    assert _parse_version("10.9.1") == (10, 9, 1)
+    assert _parse_version("v11.0.0\n") == (11, 0, 0)
+    assert _parse_version("") == ()
+    assert _parse_version("9.4.0") < (10, 4)
+
+
+# mermaid_server.js와 같은 프레임 형식으로 응답하는 가짜 서버
+_FAKE_SERVER = r"""
+import struct, sys
+stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+while True:
+    header = stdin.read(4)
+    if len(header) < 4:
+        break
+    code = stdin.read(struct.unpack('>I', header)[0]).decode('utf-8')
+    if 'INVALID' in code:
+        body, status = b'Parse error', 1
+    else:
+        body, status = b'\x89PNG\r\n\x1a\n' + code.encode('utf-8'), 0
+    stdout.write(struct.pack('>BI', status, len(body)) + body)
+    stdout.flush()
+"""
+
+
+def test_render_server(tmp_path, monkeypatch):
+    """상주 렌더링 서버 프로토콜: 여러 요청을 한 프로세스로 처리하고 실패는 None"""
+    from app.core.diagram_converter import _MermaidServer
+
+    converter = DiagramConverter(cache_dir=str(tmp_path), output_format='png')
+    converter.mmdc_path = 'mmdc'
+    converter._server = _MermaidServer(sys.executable, 'mmdc', 'default', 'white')
+
+    def start():
+        converter._server._proc = subprocess.Popen(
+            [sys.executable, '-c', _FAKE_SERVER],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+    monkeypatch.setattr(converter._server, '_start', start)
+
+    try:
+        assert converter._generate_image("graph TD\n    A --> B").endswith(b"A --> B")
+        process = converter._server._proc
+        assert converter._generate_image("graph LR\n    C --> D").endswith(b"C --> D")
+        assert converter._server._proc is process
+        assert converter._generate_image("INVALID") is None
+    finally:
+        converter.close()
+
+
+def test_svg_output_default(tmp_path, monkeypatch):
+    """기본 출력 형식은 SVG이며 data:image/svg+xml 이미지로 임베딩"""
+    converter = DiagramConverter(cache_dir=str(tmp_path))
+    converter.mmdc_path = 'mmdc'
+    assert converter.output_format == 'svg'
+
+    calls = []
+    monkeypatch.setattr('app.core.diagram_converter.subprocess.run', _fake_mmdc(calls))
+
+    converted = converter.convert_markdown("```mermaid\ngraph TD\n    SVG --> OK\n```\n")
+
+    assert "data:image/svg+xml;base64," in converted
+    assert calls[0][calls[0].index('-o') + 1].endswith('.svg')
+    assert list(tmp_path.glob('*.svg'))
+
+
+def test_invalid_output_format():
+    """지원하지 않는 출력 형식은 ValueError"""
+    import pytest
+
+    with pytest.raises(ValueError):
+        DiagramConverter(output_format='gif')
+
+
+def test_no_mermaid_short_circuit(tmp_path, monkeypatch):
+    """Mermaid 블록이 없으면 mmdc 유무와 관계없이 같은 문자열을 그대로 반환"""
+    converter = DiagramConverter(cache_dir=str(tmp_path))
+    converter.mmdc_path = None
+    warnings = []
+    monkeypatch.setattr('app.core.diagram_converter.logger.warning', warnings.append)
+
+    markdown = "# 리포트\n\n```csharp\nvar a = 1;\n```\n"
+    assert converter.convert_markdown(markdown) is markdown
+    assert converter.extract_mermaid_blocks(markdown) == []
+    assert warnings == []
+
+
+class _FakeProcess:
+    """asyncio.create_subprocess_exec 결과 대용 (stdin으로 받은 코드를 SVG로 감쌈)"""
+
+    def __init__(self):
+        self.returncode = None
+
+    async def communicate(self, data):
+        self.returncode = 0
+        return b'<svg>' + data + b'</svg>', b''
+
+
+def test_async_stdio_render(tmp_path, monkeypatch):
+    """stdin/stdout 모드에서는 asyncio 서브프로세스로 고유한 다이어그램마다 한 번씩 렌더링"""
+    import asyncio
+
+    converter = DiagramConverter(cache_dir=str(tmp_path))
+    converter.mmdc_path = 'mmdc'
+    converter.use_stdio = True
+
+    calls = []
+
+    async def fake_exec(*cmd, **kwargs):
+        calls.append(cmd)
+        return _FakeProcess()
+
+    monkeypatch.setattr('app.core.diagram_converter.asyncio.create_subprocess_exec', fake_exec)
+
+    markdown = "```mermaid\ngraph TD\n    X --> Y\n```\n\n```mermaid\ngraph TD\n    X --> Y\n```\n"
+    converted = converter.convert_markdown(markdown)
+
+    assert converted.count("data:image/svg+xml;base64,") == 2
+    assert len(calls) == 1
+    assert calls[0][calls[0].index('-i') + 1] == '-'
+
+    # 비동기 API는 디스크 캐시를 그대로 사용
+    assert asyncio.run(converter.convert_markdown_async(markdown)) == converted
+    assert len(calls) == 1
+
 if __name__ == "__main__":
     print("\n🚀 Mermaid 다이어그램 변환 종합 테스트 시작\n")
 
@@ -0,0 +1,237 @@
+"""
+IntegratedReportGenerator 단위 테스트
+
+배치 분석 결과 집계(카테고리 통계, 우선순위 권장, 통합 리포트)를 테스트합니다.
+"""
+
+import pytest
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.integrated_report_generator import (
+    CategoryStatistics,
+    IntegratedReportData,
+    IntegratedReportGenerator,
+    MATPLOTLIB_AVAILABLE,
+)
+
+
+def make_report(categories, before="var a = 1;", after="var a = 2;"):
+    """카테고리 표기와 Before/After 코드가 들어간 개별 리포트"""
+    lines = [f"- ✅ **{name}**" for name in categories]
+    lines += [
+        "### Before (원본 코드)",
+        "```csharp",
+        before,
+        "```",
+        "### After (개선된 코드)",
+        "```csharp",
+        after,
+        "```",
+    ]
+    return "\n".join(lines)
+
+
+def make_result(file_name, report_markdown, success=True):
+    """FileAnalysisResult 대용 객체"""
+    return SimpleNamespace(file_name=file_name, report_markdown=report_markdown, success=success)
+
+
+def make_data(stats):
+    """차트용 통합 리포트 데이터"""
+    return IntegratedReportData(
+        project_name="Sample",
+        analysis_time=datetime(2025, 1, 1),
+        total_files=3,
+        success_files=3,
+        failure_files=0,
+        total_time=1.0,
+        category_stats=stats,
+        priority_recommendations=[],
+    )
+
+
+@pytest.fixture
+def generator():
+    return IntegratedReportGenerator()
+
+
+class TestCategoryStatistics:
+    """카테고리별 이슈 통계 테스트"""
+
+    def test_counts_categories_per_file(self, generator):
+        """리포트에 표기된 카테고리별로 파일 집계"""
+        results = [
+            make_result("A.cs", make_report(["보안", "Null 참조 체크"])),
+            make_result("B.cs", make_report(["보안"])),
+            make_result("C.cs", make_report(["성능 최적화"]), success=False),
+        ]
+
+        stats = {stat.category_name: stat for stat in generator._analyze_category_statistics(results)}
+
+        assert stats["보안"].issue_count == 2
+        assert stats["보안"].files_with_issues == ["A.cs", "B.cs"]
+        assert stats["Null 참조 체크"].issue_count == 1
+        assert stats["성능 최적화"].issue_count == 0
+        assert stats["보안"].percentage == pytest.approx(200 / 3)
+
+    def test_unchanged_code_not_counted(self, generator):
+        """Before/After 코드가 같으면 이슈로 보지 않음"""
+        results = [make_result("A.cs", make_report(["보안"], before="x", after="x"))]
+
+        stats = generator._analyze_category_statistics(results)
+        assert all(stat.issue_count == 0 for stat in stats)
+
+    def test_sorted_by_issue_count(self, generator):
+        """이슈 개수 내림차순 정렬"""
+        results = [
+            make_result("A.cs", make_report(["보안", "리소스 관리"])),
+            make_result("B.cs", make_report(["리소스 관리"])),
+        ]
+
+        stats = generator._analyze_category_statistics(results)
+        assert stats[0].category_name == "리소스 관리"
+        assert stats[1].category_name == "보안"
+
+
+class TestHasImprovements:
+    """Before/After 비교 휴리스틱 테스트"""
+
+    def test_changed_code(self, generator):
+        """코드가 바뀌면 개선 사항 있음"""
+        assert generator._has_improvements(make_report([], "a", "b"))
+
+    def test_same_code(self, generator):
+        """코드가 같으면 개선 사항 없음"""
+        assert not generator._has_improvements(make_report([], "a", "a"))
+
+    def test_sections_without_code_blocks(self, generator):
+        """섹션은 있지만 코드 블록을 못 찾으면 안전하게 True"""
+        markdown = "### Before (원본 코드)\n(생략)\n### After (개선된 코드)\n(생략)"
+        assert generator._has_improvements(markdown)
+
+    def test_missing_sections(self, generator):
+        """Before/After 섹션이 없으면 개선 사항 없음"""
+        assert not generator._has_improvements("# 리포트")
+
+
+class TestPriorityRecommendations:
+    """개선 우선순위 권장 테스트"""
+
+    def test_weighted_by_priority(self, generator):
+        """이슈 개수 × 카테고리 가중치 순으로 정렬"""
+        stats = [
+            CategoryStatistics("XML 문서 주석", 4, 50.0, []),    # 4 × 2 = 8
+            CategoryStatistics("보안", 1, 12.5, []),              # 1 × 10 = 10
+            CategoryStatistics("성능 최적화", 0, 0.0, []),
+        ]
+
+        recommendations = generator._generate_priority_recommendations(stats)
+
+        assert len(recommendations) == 2
+        assert recommendations[0].startswith("1. **보안**")
+        assert recommendations[1].startswith("2. **XML 문서 주석**")
+
+    def test_no_issues(self, generator):
+        """이슈가 없으면 안내 문구"""
+        recommendations = generator._generate_priority_recommendations([])
+        assert recommendations == ["✅ 모든 카테고리에서 이슈가 발견되지 않았습니다."]
+
+
+class TestIntegratedReport:
+    """통합 리포트 Markdown 생성 테스트"""
+
+    def test_report_sections(self, generator):
+        """프로젝트 정보, 통계 테이블, 상세 목록, 권장 사항 포함"""
+        batch_result = SimpleNamespace(
+            results=[make_result(f"File{i}.cs", make_report(["보안"])) for i in range(12)],
+            start_time=datetime(2025, 1, 1, 9, 30),
+            total_files=13,
+            success_count=12,
+            failure_count=1,
+            total_time=90.0,
+        )
+
+        markdown = generator.generate_integrated_report(batch_result, project_name="Sample")
+
+        assert markdown.startswith("# 📊 C# 프로젝트 코드 리뷰 통합 리포트\n\n---\n\n")
+        assert "- **프로젝트명**: Sample\n" in markdown
+        assert "- **분석 실패**: 1개 ❌\n" in markdown
+        assert "- **소요 시간**: 1.5분\n" in markdown
+        assert "| 보안 | 12개 | 100.0% ████████████████████ |\n" in markdown
+        assert "- `File9.cs`\n- ... (외 2개 파일)\n" in markdown
+        assert "1. **보안** - 12개 파일에서 발견 (우선순위: 높음)\n" in markdown
+        assert markdown.rstrip().endswith("*")
+
+
+
+@pytest.mark.skipif(not MATPLOTLIB_AVAILABLE, reason="matplotlib 미설치")
+class TestChart:
+    """카테고리별 이슈 분포 차트 테스트"""
+
+    def test_figure_reused(self, generator, tmp_path):
+        """여러 차트를 그려도 Figure 하나를 재사용"""
+        data = make_data([
+            CategoryStatistics("보안", 2, 66.7, []),
+            CategoryStatistics("성능 최적화", 1, 33.3, []),
+        ])
+
+        assert generator.generate_chart(data, str(tmp_path / "first.png"))
+        figure = generator._fig
+        assert generator.generate_chart(data, str(tmp_path / "second.png"))
+
+        assert generator._fig is figure
+        assert (tmp_path / "first.png").stat().st_size > 0
+        assert (tmp_path / "second.png").stat().st_size > 0
+
+    def test_batch_charts(self, generator, tmp_path):
+        """여러 차트를 프로세스 풀에서 생성하고 순서대로 결과 반환"""
+        with_issues = make_data([CategoryStatistics("보안", 1, 100.0, [])])
+        without_issues = make_data([CategoryStatistics("보안", 0, 0.0, [])])
+        jobs = [
+            (with_issues, str(tmp_path / "a.png")),
+            (without_issues, str(tmp_path / "b.png")),
+            (with_issues, str(tmp_path / "c.png")),
+            (with_issues, str(tmp_path / "d.svg")),
+        ]
+
+        assert generator.generate_charts_batch(jobs, max_workers=2) == [True, False, True, True]
+        assert (tmp_path / "a.png").exists() and (tmp_path / "c.png").exists()
+        assert not (tmp_path / "b.png").exists()
+
+    def test_no_issues(self, generator, tmp_path):
+        """이슈가 없으면 차트를 만들지 않음"""
+        data = make_data([CategoryStatistics("보안", 0, 0.0, [])])
+        assert not generator.generate_chart(data, str(tmp_path / "chart.png"))
+
+
+
+class TestSvgChart:
+    """SVG 원형 차트 테스트 (matplotlib 불필요)"""
+
+    def test_svg_chart_file(self, generator, tmp_path):
+        """.svg 경로면 조각별 경로와 라벨을 담은 SVG 생성"""
+        data = make_data([
+            CategoryStatistics("보안", 3, 75.0, []),
+            CategoryStatistics("하드코딩 → Config 파일", 1, 25.0, []),
+        ])
+        output = tmp_path / "chart.svg"
+
+        assert generator.generate_chart(data, str(output))
+
+        svg = output.read_text(encoding='utf-8')
+        assert svg.startswith('<svg ')
+        assert svg.count('<path ') == 2
+        assert '75.0%' in svg and '25.0%' in svg
+        assert '하드코딩 → Config 파일' in svg
+
+    def test_single_category_full_circle(self, generator):
+        """조각이 하나면 원 전체"""
+        svg = generator._generate_pie_svg(["보안"], [2], ["#ff6b6b"], "제목")
+        assert '<circle ' in svg and '<path ' not in svg
@@ -0,0 +1,150 @@
+"""
+LLMCache 단위 테스트
+
+LLM 응답 캐시와 APIClient 캐시 연동을 테스트합니다.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.llm_cache import LLMCache
+from app.core.api_client import APIClient
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """임시 캐시 DB"""
+    llm_cache = LLMCache(db_path=str(tmp_path / "llm_cache.db"))
+    yield llm_cache
+    llm_cache.close()
+
+
+@pytest.fixture
+def api_client(cache, monkeypatch):
+    """캐시가 연결된 결정적(temperature=0) APIClient"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    client = APIClient(provider='openai', temperature=0.0, cache=cache)
+    client._get_response = Mock(return_value="improved")
+    client._stream_response = Mock(side_effect=lambda *args: iter(["impr", "oved"]))
+    return client
+
+
+class TestLLMCache:
+    """LLMCache 테스트"""
+
+    def test_get_missing_key(self, cache):
+        """없는 키 조회"""
+        assert cache.get("missing") is None
+
+    def test_set_and_get(self, cache):
+        """저장 후 조회"""
+        cache.set("key", "response", model="gpt-4o-mini")
+        assert cache.get("key") == "response"
+
+    def test_expired_entry(self, cache):
+        """만료된 항목은 조회되지 않음"""
+        cache.set("key", "response", ttl=-1)
+        assert cache.get("key") is None
+
+
+class TestAPIClientCache:
+    """APIClient 캐시 연동 테스트"""
+
+    def test_non_stream_hit(self, api_client):
+        """두 번째 호출은 API를 호출하지 않음"""
+        assert api_client.analyze_code("prompt", stream=False) == "improved"
+        assert api_client.analyze_code("prompt", stream=False) == "improved"
+        assert api_client._get_response.call_count == 1
+
+    def test_stream_hit(self, api_client):
+        """스트리밍 응답도 완료 후 캐시되어 한 번에 반환됨"""
+        assert list(api_client.analyze_code("prompt")) == ["impr", "oved"]
+        assert list(api_client.analyze_code("prompt")) == ["improved"]
+        assert api_client._stream_response.call_count == 1
+
+    def test_key_depends_on_prompt(self, api_client):
+        """다른 프롬프트는 다른 키"""
+        assert api_client._cache_key("a") != api_client._cache_key("b")
+
+    def test_sampling_bypasses_cache(self, api_client):
+        """temperature > 0 이면 캐시를 사용하지 않음"""
+        api_client.temperature = 0.7
+        api_client.analyze_code("prompt", stream=False)
+        api_client.analyze_code("prompt", stream=False)
+        assert api_client._get_response.call_count == 2
+
+    def test_semantic_hit_after_exact_miss(self, api_client):
+        """정확 일치 미스 후 시맨틱 캐시 적중"""
+        api_client.semantic_cache = Mock()
+        api_client.semantic_cache.search.return_value = ("similar", "vec")
+        assert api_client.analyze_code("prompt", stream=False) == "similar"
+        api_client._get_response.assert_not_called()
+
+    def test_semantic_miss_stores_embedding(self, api_client):
+        """시맨틱 미스 시 검색에 쓴 임베딩을 재사용해 저장"""
+        api_client.semantic_cache = Mock()
+        api_client.semantic_cache.search.return_value = (None, "vec")
+        api_client.analyze_code("prompt", stream=False)
+        scope, text = api_client._semantic_key("prompt")
+        api_client.semantic_cache.add.assert_called_once_with(text, "improved", "vec", scope=scope)
+
+    def test_semantic_key_embeds_only_code(self, api_client):
+        """시맨틱 캐시는 코드만 임베딩하고 지시문/시스템 프롬프트는 범위로 구분"""
+        prompt_a = "지시문\n\n분석할 코드:\n```csharp\nclass A { }\n```"
+        prompt_b = "지시문\n\n분석할 코드:\n```csharp\nclass B { }\n```"
+
+        scope_a, text_a = api_client._semantic_key(prompt_a, "system")
+        scope_b, text_b = api_client._semantic_key(prompt_b, "system")
+        assert scope_a == scope_b
+        assert text_a == "class A { }\n```"
+        assert text_b == "class B { }\n```"
+
+        assert api_client._semantic_key(prompt_a, "other")[0] != scope_a
+        assert api_client._semantic_key("다른 지시문" + prompt_a, "system")[0] != scope_a
+
+    def test_async_hit(self, api_client):
+        """비동기 경로도 같은 캐시를 조회하고 저장함"""
+        import asyncio
+
+        async def fake_stream(*args):
+            for token in ["impr", "oved"]:
+                yield token
+
+        api_client._init_async_clients = Mock()
+        api_client._stream_response_async = Mock(side_effect=fake_stream)
+
+        assert asyncio.run(api_client.analyze_code_async("prompt")) == "improved"
+        assert asyncio.run(api_client.analyze_code_async("prompt")) == "improved"
+        assert api_client._stream_response_async.call_count == 1
+        assert api_client.analyze_code("prompt", stream=False) == "improved"
+        api_client._get_response.assert_not_called()
+
+    def test_key_depends_on_system_prompt(self, api_client):
+        """시스템 프롬프트가 다르면 다른 키"""
+        assert api_client._cache_key("a", "system1") != api_client._cache_key("a", "system2")
+
+
+class TestCacheStorage:
+    """캐시 저장 형식 테스트"""
+
+    def test_compressed_roundtrip(self, cache):
+        """압축 저장 후 원문 복원"""
+        response = "public class UserService { }\n" * 200
+        cache.set("key", response)
+
+        stored = cache._conn.execute('SELECT response FROM llm_cache').fetchone()[0]
+        assert isinstance(stored, bytes)
+        assert cache.get("key") == response
+
+    def test_legacy_text_row(self, cache):
+        """압축 도입 전 TEXT 행도 읽을 수 있음"""
+        cache._conn.execute(
+            "INSERT INTO llm_cache (key, model, response, created_at) VALUES ('old', '', 'legacy', 0)"
+        )
+        assert cache.get("old") == "legacy"
@@ -260,6 +260,92 @@ def test_optimization():
     print(f"최적화 성공: {'✅' if optimized_tokens <= 1500 else '❌'}")
 
 
+def test_markdown_cache(monkeypatch):
+    """두 번째 PromptBuilder부터는 Markdown 파일을 다시 파싱하지 않음"""
+    from app.core import prompt_builder
+
+    PromptBuilder._CACHE.clear()
+    first = PromptBuilder()
+    first_templates = first.review_templates
+
+    def fail_load(self):
+        raise AssertionError("캐시된 카테고리를 다시 로드함")
+
+    monkeypatch.setattr(prompt_builder.CategoryLoader, 'load_all', fail_load)
+    second = PromptBuilder()
+
+    assert second.review_templates is first_templates
+    assert second.few_shot_examples is first.few_shot_examples
+
+
+def test_markdown_loaded_lazily(monkeypatch):
+    """리뷰 프롬프트를 만들기 전에는 Markdown 파일을 읽지 않음"""
+    from app.core import prompt_builder
+
+    PromptBuilder._CACHE.clear()
+    loads = []
+    original_load_all = prompt_builder.CategoryLoader.load_all
+
+    def counting_load(self):
+        loads.append(self.categories_dir)
+        return original_load_all(self)
+
+    monkeypatch.setattr(prompt_builder.CategoryLoader, 'load_all', counting_load)
+
+    builder = PromptBuilder()
+    builder.build_comment_prompt("class A { }")
+    builder.build_flow_diagram_prompt("class A { }")
+    assert loads == []
+
+    builder.build_review_prompt("class A { }", [ReviewCategory.SECURITY])
+    assert len(loads) == 1
+
+def test_review_prompt_layout():
+    """카테고리 설명 → 예제(최대 2개) → 출력 지시 → 코드 순서"""
+    builder = PromptBuilder(use_markdown=False)
+    prompt = builder.build_review_prompt(
+        code="class A { }",
+        categories=list(ReviewCategory),
+        output_format=OutputFormat.CODE_COMMENTS
+    )
+
+    assert prompt.startswith("다음 항목을 중점적으로 검토하세요:\n\n• Null 참조 체크: ")
+    assert prompt.count("\nBefore:\n") == 2
+    assert prompt.endswith(
+        "\n\n원본 코드에 XML 문서 주석을 추가하여 출력하세요."
+        "\n\n분석할 코드:\n```csharp\nclass A { }\n```"
+    )
+
+    # 카테고리가 없으면 출력 지시와 코드만
+    assert builder.build_review_prompt("x", []).startswith("\n입력된 원본 코드를 개선하여 출력하세요.")
+
+def test_optimize_removes_example_section():
+    """토큰 초과 시 예제 섹션 전체를 제거하고 출력 지시와 코드는 유지"""
+    builder = PromptBuilder()
+    categories = [ReviewCategory.NULL_REFERENCE, ReviewCategory.SECURITY]
+
+    with_examples = builder.build_review_prompt("class A { }", categories)
+    without_examples = builder.build_review_prompt("class A { }", categories, include_examples=False)
+
+    assert builder.optimize_prompt(with_examples, max_tokens=0) == without_examples
+    assert builder.optimize_prompt(with_examples, max_tokens=100000) == with_examples
+
+def test_compact_examples():
+    """축약 예제는 들여쓰기와 빈 줄을 제거해 프롬프트를 줄이고 코드 줄은 유지"""
+    builder = PromptBuilder()
+    categories = [ReviewCategory.EXCEPTION_HANDLING, ReviewCategory.CODE_DOCUMENTATION]
+
+    full = builder.build_review_prompt("class A { }", categories)
+    compact = builder.build_review_prompt("class A { }", categories, compact_examples=True)
+
+    assert len(compact) < len(full)
+    assert builder.estimate_tokens(compact) < builder.estimate_tokens(full)
+    assert "\n    " not in compact.split("예제:")[1].split("입력된 원본 코드를")[0]
+    assert "/// <summary>" in compact
+
+    # 예제 섹션 제거 결과는 축약 여부와 관계없이 같음
+    assert builder.optimize_prompt(compact, max_tokens=0) == builder.optimize_prompt(full, max_tokens=0)
+
 if __name__ == "__main__":
     # 1. 모든 샘플 코드 테스트
     results = test_all_samples()
@@ -219,6 +219,64 @@ public class Test
     return test1_pass and test2_pass
 
 
+def test_code_extraction_without_fence():
+    """코드 블록이 없으면 설명 섹션 이후에는 코드처럼 보이는 줄만 유지"""
+    generator = ReportGenerator()
+
+    response = """public class Test
+{
+}
+분석: 설명입니다.
+이 줄은 설명입니다.
+    public void Run() { }
+  // 주석
+Improvement: 끝"""
+
+    assert generator._extract_code_from_response(response) == (
+        "public class Test\n{\n}\n    public void Run() { }\n  // 주석"
+    )
+
+def test_repeated_report_uses_cache():
+    """같은 응답으로 다시 생성하면 코드 추출 결과를 재사용"""
+    from datetime import datetime
+
+    generator = ReportGenerator()
+    memo = ReportGenerator._extract_code_from_response.memo
+    memo.clear()
+
+    response = "```csharp\npublic class Cached { }\n```"
+    first = generator.generate_report("class Cached { }", response, ['null_reference'],
+                                      analysis_time=datetime(2025, 1, 1))
+    second = generator.generate_report("class Cached { }", response, ['null_reference'],
+                                       analysis_time=datetime(2025, 1, 2))
+
+    # 키는 응답 전체가 아닌 16바이트 다이제스트
+    assert [len(key) for key in memo] == [16]
+    assert first.replace("2025-01-01", "2025-01-02") == second
+
+def test_report_cache_is_bounded():
+    """메모는 최근 몇 개 항목만 보관"""
+    memo = ReportGenerator._generate_improvements_section.memo
+    memo.clear()
+
+    for i in range(20):
+        ReportGenerator._generate_improvements_section(f"class A{i} {{ }}", "try { } catch { }")
+
+    assert len(memo) == 8
+    assert "예외 처리 추가" in ReportGenerator._generate_improvements_section("class A19 { }", "try { } catch { }")
+
+def test_improvement_heuristics():
+    """개선 사항 휴리스틱은 부분 문자열 기준 (IsNullOrEmpty도 Null 체크로 인식)"""
+    section = ReportGenerator._generate_improvements_section(
+        "void Run(string s) { Use(s); }",
+        "void Run(string s) { if (string.IsNullOrEmpty(s)) throw new ArgumentException(); Use(s); }"
+    )
+
+    assert "Null 체크 추가" in section
+    assert "명시적 예외 발생" in section
+    assert "리소스 관리 개선" not in section
+    assert "예외 처리 추가" not in section
+
 if __name__ == "__main__":
     print("\n🚀 ReportGenerator 종합 테스트 시작\n")
 
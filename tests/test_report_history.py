@@ -31,7 +31,8 @@ def temp_db(temp_dir):
     """임시 DB"""
     db_path = temp_dir / "test_reports.db"
     db = ReportHistoryDB(str(db_path))
-    return db
+    yield db
+    db.close()
 
 
 class TestReportHistoryDB:
@@ -80,6 +81,22 @@ class TestReportHistoryDB:
         assert reports[0].filename == "Test2.cs"
         assert reports[2].filename == "Test0.cs"
 
+    def test_iter_all_reports(self, temp_db, monkeypatch):
+        """여러 페이지에 걸쳐 최신순으로 순회하고 순회 중에도 DB 사용 가능"""
+        monkeypatch.setattr(ReportHistoryDB, 'FETCH_SIZE', 2)
+        temp_db.add_reports([
+            ReportRecord(filename=f"Test{i}.cs", report_name=f"Test{i}", timestamp=f"2025-01-18T12:00:0{i}")
+            for i in range(5)
+        ])
+
+        filenames = []
+        for record in temp_db.iter_all_reports():
+            filenames.append(record.filename)
+            temp_db.get_statistics()
+
+        assert filenames == [f"Test{i}.cs" for i in reversed(range(5))]
+        assert len(list(temp_db.iter_all_reports(limit=3))) == 3
+
     def test_get_reports_by_filename(self, temp_db):
         """파일명으로 리포트 조회 테스트"""
         # 동일 파일의 여러 리포트 추가
@@ -136,6 +153,23 @@ class TestReportHistoryDB:
         deleted_record = temp_db.get_report_by_id(record_id)
         assert deleted_record is None
 
+    def test_delete_report_with_files(self, temp_db, temp_dir):
+        """레코드와 파일을 함께 삭제 (없는 파일은 무시)"""
+        markdown_path = temp_dir / "Test.md"
+        markdown_path.write_text("# Review", encoding='utf-8')
+        record_id = temp_db.add_report(ReportRecord(
+            filename="Test.cs",
+            report_name="Test_review",
+            markdown_path=str(markdown_path),
+            html_path=str(temp_dir / "missing.html")
+        ))
+
+        assert temp_db.delete_report_with_files(record_id) is True
+        assert not markdown_path.exists()
+        assert temp_db.get_report_by_id(record_id) is None
+        assert temp_db.get_statistics()['total'] == 0
+        assert temp_db.delete_report_with_files(record_id) is False
+
     def test_get_statistics(self, temp_db):
         """통계 조회 테스트"""
         # 성공 2개, 실패 1개 추가
@@ -159,6 +193,165 @@ class TestReportHistoryDB:
         assert stats['total_analysis_time'] == 6.0  # 1.0 + 2.0 + 3.0
         assert stats['avg_analysis_time'] == 2.0
 
+    def test_statistics_after_delete(self, temp_db):
+        """삭제한 레코드는 통계 카운터에서 빠짐"""
+        success_id = temp_db.add_report(ReportRecord(filename="A.cs", report_name="A", analysis_time=1.0))
+        failed_id = temp_db.add_report(
+            ReportRecord(filename="B.cs", report_name="B", success=False, analysis_time=3.0)
+        )
+
+        assert temp_db.delete_report(failed_id) is True
+        stats = temp_db.get_statistics()
+        assert (stats['total'], stats['success'], stats['failed']) == (1, 1, 0)
+        assert stats['total_analysis_time'] == 1.0
+
+        temp_db.delete_report(success_id)
+        assert temp_db.get_statistics()['avg_analysis_time'] == 0.0
+
+    def test_statistics_initialized_from_existing_rows(self, temp_dir):
+        """카운터 테이블이 없던 DB는 기존 레코드로 초기화"""
+        db_path = str(temp_dir / "legacy.db")
+        db = ReportHistoryDB(db_path)
+        db.add_report(ReportRecord(filename="A.cs", report_name="A", analysis_time=2.0))
+        db._conn.execute('DROP TABLE report_stats')
+        db._conn.execute('PRAGMA user_version = 0')
+        db.close()
+
+        db = ReportHistoryDB(db_path)
+        stats = db.get_statistics()
+        db.close()
+
+        assert stats['total'] == 1
+        assert stats['total_analysis_time'] == 2.0
+
+    def test_persistent_wal_connection(self, temp_db):
+        """인스턴스당 하나의 연결을 WAL 모드로 재사용"""
+        conn = temp_db._conn
+        temp_db.add_report(ReportRecord(filename="Test.cs", report_name="Test_review"))
+        temp_db.get_all_reports()
+
+        assert temp_db._conn is conn
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    def test_concurrent_writes(self, temp_db):
+        """여러 스레드의 쓰기는 쓰기 스레드가 모아서 커밋"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(executor.map(
+                lambda i: temp_db.add_report(ReportRecord(filename=f"Test{i}.cs", report_name=f"Test{i}")),
+                range(50)
+            ))
+
+        assert len(set(ids)) == 50
+        assert temp_db.get_statistics()['total'] == 50
+        assert temp_db.get_report_by_id(ids[10]).filename == "Test10.cs"
+
+    def test_read_connection_is_read_only(self, temp_db):
+        """읽기 연결로는 쓸 수 없음"""
+        import sqlite3
+
+        with pytest.raises(sqlite3.OperationalError):
+            temp_db._read_conn.execute("DELETE FROM report_history")
+
+    def test_schema_version(self, temp_db):
+        """스키마 생성 후 user_version 기록 (다음 실행부터 DDL 생략)"""
+        assert temp_db._conn.execute('PRAGMA user_version').fetchone()[0] == ReportHistoryDB._SCHEMA_VERSION
+
+    def test_success_check_migration(self, temp_dir):
+        """CHECK 제약이 없던 이전 테이블은 데이터와 ID 시퀀스를 유지한 채 재구성"""
+        import sqlite3
+
+        db_path = str(temp_dir / "legacy.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute('''
+            CREATE TABLE report_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                filename TEXT NOT NULL,
+                report_name TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                markdown_path TEXT NOT NULL,
+                html_path TEXT NOT NULL,
+                success INTEGER NOT NULL DEFAULT 1,
+                error_message TEXT DEFAULT '',
+                analysis_time REAL DEFAULT 0.0
+            )
+        ''')
+        conn.executemany(
+            "INSERT INTO report_history (filename, report_name, timestamp, markdown_path, html_path, success) "
+            "VALUES (?, ?, '', '', '', ?)",
+            [("A.cs", "A", 1), ("B.cs", "B", 0), ("C.cs", "C", 1)]
+        )
+        conn.execute("DELETE FROM report_history WHERE filename = 'C.cs'")
+        conn.commit()
+        conn.close()
+
+        db = ReportHistoryDB(db_path)
+        try:
+            stats = db.get_statistics()
+            assert (stats['total'], stats['success'], stats['failed']) == (2, 1, 1)
+            assert db.get_report_by_id(2).success is False
+
+            # 삭제된 ID는 재사용하지 않음
+            assert db.add_report(ReportRecord(filename="D.cs", report_name="D")) == 4
+
+            with pytest.raises(sqlite3.IntegrityError):
+                db._write(lambda cursor: cursor.execute(
+                    "UPDATE report_history SET success = 2 WHERE id = 1"
+                ))
+        finally:
+            db.close()
+
+    def test_indexes(self, temp_db):
+        """파일별 조회는 복합 인덱스를 사용하고 단일 filename 인덱스는 없음"""
+        indexes = {
+            row[0] for row in temp_db._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        assert {'idx_filename_ts', 'idx_timestamp', 'idx_failed'} <= indexes
+        assert 'idx_filename' not in indexes
+
+        plan = temp_db._conn.execute(
+            'EXPLAIN QUERY PLAN ' + temp_db._SQL['select_by_filename'], ("Test.cs",)
+        ).fetchall()
+        assert any('idx_filename_ts' in row[-1] for row in plan)
+
+    def test_add_reports(self, temp_db):
+        """여러 레코드를 한 번에 추가하면 순서대로 연속된 ID 반환"""
+        first_id = temp_db.add_report(ReportRecord(filename="First.cs", report_name="First_review"))
+        records = [
+            ReportRecord(filename=f"Test{i}.cs", report_name=f"Test{i}_review")
+            for i in range(3)
+        ]
+
+        ids = temp_db.add_reports(records)
+
+        assert ids == [first_id + 1, first_id + 2, first_id + 3]
+        assert temp_db.get_report_by_id(ids[2]).filename == "Test2.cs"
+        assert temp_db.add_reports([]) == []
+
+    def test_write_waits_for_process_lock(self, temp_db):
+        """다른 프로세스가 잠금 파일을 잡고 있으면 쓰기는 해제될 때까지 대기"""
+        fcntl = pytest.importorskip("fcntl")
+        import threading
+
+        with open(f"{temp_db.db_path}.lock", 'a+b') as other:
+            fcntl.flock(other.fileno(), fcntl.LOCK_EX)
+
+            done = threading.Event()
+            writer = threading.Thread(
+                target=lambda: (temp_db.add_report(ReportRecord(filename="Locked.cs")), done.set())
+            )
+            writer.start()
+            assert not done.wait(0.2)
+
+            fcntl.flock(other.fileno(), fcntl.LOCK_UN)
+            writer.join(timeout=5)
+
+        assert done.is_set()
+        assert temp_db.get_reports_by_filename("Locked.cs")[0].filename == "Locked.cs"
+
 
 class TestReportSaver:
     """ReportSaver 테스트 클래스"""
@@ -213,6 +406,72 @@ class TestReportSaver:
             assert "<html" in content
             assert "Code Review" in content
 
+    def test_html_escapes_filename(self, temp_dir):
+        """HTML 리포트의 파일명은 이스케이프"""
+        saver = ReportSaver(
+            reports_dir=str(temp_dir),
+            db_path=str(temp_dir / "reports.db")
+        )
+
+        content = saver._convert_markdown_to_html("# Review", "<script>.cs", "2024-01-01 00:00:00")
+
+        assert "<script>" not in content
+        assert "&lt;script&gt;.cs" in content
+        saver.close()
+
+    def test_external_stylesheet(self, temp_dir):
+        """스타일은 html 디렉토리의 style.css 하나에 저장하고 리포트는 링크만 포함"""
+        saver = ReportSaver(
+            reports_dir=str(temp_dir),
+            db_path=str(temp_dir / "reports.db")
+        )
+
+        content = saver._convert_markdown_to_html("# Review", "A.cs", "2024-01-01 00:00:00")
+
+        assert '<link rel="stylesheet" href="style.css">' in content
+        assert "<style>" not in content
+        assert "box-sizing: border-box;" in (temp_dir / "html" / "style.css").read_text(encoding='utf-8')
+        saver.close()
+
+    def test_markdown_converter_reused(self, temp_dir):
+        """재사용하는 Markdown 변환기는 이전 문서 상태를 남기지 않음"""
+        saver = ReportSaver(
+            reports_dir=str(temp_dir),
+            db_path=str(temp_dir / "reports.db")
+        )
+        report = "# Review\n\n```csharp\nvar x = 1;\n```"
+
+        first = saver._convert_markdown_to_html(report, "A.cs", "2024-01-01 00:00:00")
+        saver._convert_markdown_to_html("# Other", "B.cs", "2024-01-01 00:00:00")
+        second = saver._convert_markdown_to_html(report, "A.cs", "2024-01-01 00:00:00")
+
+        assert first == second
+        saver.close()
+
+    def test_save_reports(self, temp_dir):
+        """배치 저장 테스트"""
+        saver = ReportSaver(
+            reports_dir=str(temp_dir),
+            db_path=str(temp_dir / "reports.db")
+        )
+
+        results = saver.save_reports([
+            {
+                'filename': f"Service{i}.cs",
+                'report_markdown': f"# Code Review {i}",
+                'analysis_time': float(i)
+            }
+            for i in range(3)
+        ])
+
+        assert len(results) == 3
+        for i, (md_path, html_path, record_id) in enumerate(results):
+            assert Path(md_path).exists()
+            assert Path(html_path).exists()
+            assert saver.db.get_report_by_id(record_id).filename == f"Service{i}.cs"
+
+        saver.close()
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,81 @@
+"""
+CSharpSyntaxHighlighter 단위 테스트
+
+C# 구문 강조 규칙과 줄 단위 캐시를 테스트합니다.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from PySide6.QtWidgets import QApplication, QPlainTextEdit
+
+# 프로젝트 루트를 PYTHONPATH에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.syntax_highlighter import CSharpSyntaxHighlighter
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """QApplication fixture"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    yield app
+
+
+@pytest.fixture
+def editor(qapp):
+    """구문 강조가 적용된 QPlainTextEdit"""
+    widget = QPlainTextEdit()
+    widget.highlighter = CSharpSyntaxHighlighter(widget.document())
+    yield widget
+    widget.close()
+
+
+def block_formats(editor):
+    """블록별 (텍스트, 상태, 강조 구간) 목록"""
+    result = []
+    block = editor.document().begin()
+    while block.isValid():
+        ranges = [
+            (r.start, r.length, r.format.foreground().color().name())
+            for r in block.layout().formats()
+        ]
+        result.append((block.text(), block.userState(), ranges))
+        block = block.next()
+    return result
+
+
+class TestCSharpSyntaxHighlighter:
+    """CSharpSyntaxHighlighter 테스트"""
+
+    def test_keyword_highlighted(self, editor):
+        """키워드 강조"""
+        editor.setPlainText("public class Test { }")
+        ranges = block_formats(editor)[0][2]
+        assert (0, 6, "#569cd6") in ranges
+
+    def test_multiline_comment_state(self, editor):
+        """여러 줄 주석은 다음 블록으로 이어짐"""
+        editor.setPlainText("/* start\nmiddle\nend */ int x;")
+        states = [state for _, state, _ in block_formats(editor)]
+        assert states == [1, 1, 0]
+
+    def test_line_cache_reused(self, editor, monkeypatch):
+        """같은 줄은 다시 스캔하지 않고 같은 결과를 적용"""
+        code = "public int Value = 42;\n// comment\npublic int Value = 42;"
+        editor.setPlainText(code)
+        expected = block_formats(editor)
+
+        calls = []
+        original = editor.highlighter._highlight_spans
+        monkeypatch.setattr(
+            editor.highlighter, '_highlight_spans',
+            lambda text, state: calls.append(text) or original(text, state)
+        )
+        editor.setPlainText(code)
+
+        assert calls == []
+        assert block_formats(editor) == expected